@@ -0,0 +1,63 @@
+"""Build the compressed web page served at /.
+
+Run on a computer after editing webtemplate.py, then copy webasset.py to
+the Pico (or freeze it into the firmware so the bytes stay in flash):
+
+    python build_assets.py
+
+The page is minified (indentation, blank lines and whole-line comments
+removed), gzipped and written to webasset.py as PAGE_GZ together with a
+strong ETag derived from the compressed bytes.
+"""
+
+import sys
+import gzip
+import hashlib
+from webtemplate import HTML_PAGE
+
+ASSET_MODULE = 'webasset.py'
+LINE_BYTES = 64
+
+
+def minify(html):
+    """Strip indentation, blank lines and comment-only lines.
+
+    Line breaks are kept so JavaScript that relies on automatic semicolon
+    insertion keeps working.
+    """
+    lines = []
+    in_comment = False
+    for line in html.splitlines():
+        line = line.strip()
+        if in_comment:
+            in_comment = not line.endswith('*/')
+            continue
+        if not line or line.startswith('//'):
+            continue
+        if line.startswith('/*'):
+            in_comment = not line.endswith('*/')
+            continue
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def build(output=ASSET_MODULE):
+    raw = HTML_PAGE.encode()
+    minified = minify(HTML_PAGE).encode()
+    compressed = gzip.compress(minified, compresslevel=9, mtime=0)
+    etag = hashlib.sha256(compressed).hexdigest()[:16]
+    with open(output, 'w') as f:
+        f.write('# Generated by build_assets.py from webtemplate.py, do not edit\n\n')
+        f.write(f"PAGE_ETAG = '\"{etag}\"'\n")
+        f.write(f'PAGE_SIZE = {len(minified)}\n')
+        f.write('PAGE_GZ = (\n')
+        for i in range(0, len(compressed), LINE_BYTES):
+            f.write(f'    {compressed[i:i + LINE_BYTES]!r}\n')
+        f.write(')\n')
+    print(f'Page: {len(raw)} bytes, minified {len(minified)}, gzipped {len(compressed)} '
+          f'({len(compressed) * 100 // len(raw)}%)')
+    print(f'Wrote {output} (ETag "{etag}")')
+
+
+if __name__ == '__main__':
+    build(*sys.argv[1:])
@@ -1,8 +1,169 @@
-from machine import Pin, SPI
-from time import sleep_ms
-import utime
+from time import sleep_ms, sleep_us, ticks_ms, ticks_us, ticks_diff
 import uos
 
+_SOI = b'\xff\xd8'
+_EOI = b'\xff\xd9'
+_BYTEARRAY_FIND = hasattr(bytearray, 'find')
+
+def _find(buf, mv, pattern, start, end):
+    """Find pattern in buf[start:end], copying the slice only if bytearray lacks find()"""
+    if _BYTEARRAY_FIND:
+        return buf.find(pattern, start, end)
+    pos = bytes(mv[start:end]).find(pattern)
+    return pos + start if pos >= 0 else -1
+
+def _find_blocks(buf, mv, pattern, start, end, block):
+    """_find over windows of at most block bytes, overlapping so a split pattern is found"""
+    if _BYTEARRAY_FIND:
+        return buf.find(pattern, start, end)
+    while True:
+        stop = min(start + block, end)
+        pos = _find(buf, mv, pattern, start, stop)
+        if pos >= 0 or stop >= end:
+            return pos
+        start = stop - len(pattern) + 1
+
+class JpegFramer:
+    """Chunked SOI/EOI framing for JPEG data read out of the FIFO.
+
+    Chunks are searched with find() and forwarded to writer as whole slices.
+    A trailing 0xFF is carried across chunk boundaries so split markers are
+    still found. leading and trailing count the bytes dropped before SOI and
+    after EOI.
+    """
+
+    def __init__(self, writer, on_start=None):
+        self.writer = writer
+        self.on_start = on_start
+        self.started = False
+        self.done = False
+        self.leading = 0
+        self.trailing = 0
+        self.written = 0
+        self.expected = 0
+        self._carry = False
+
+    def feed(self, buf, count, remaining=0):
+        """Frame buf[:count]; remaining is the number of FIFO bytes after this chunk.
+
+        Returns True once EOI has been written.
+        """
+        if self.done:
+            self.trailing += count
+            return True
+        mv = memoryview(buf)
+        start = 0
+        scan_from = 0
+        
+        if not self.started:
+            if self._carry and count and buf[0] == 0xd8:
+                pos = -1
+            else:
+                pos = _find(buf, mv, _SOI, 0, count)
+                if pos < 0:
+                    self.leading += count
+                    self._carry = count > 0 and buf[count - 1] == 0xff
+                    return False
+            self.started = True
+            self.leading += pos
+            self.expected = remaining + count - pos
+            if self.on_start:
+                self.on_start(self.expected)
+            if pos == -1:
+                self.writer.write(_SOI[:1])
+                self.written += 1
+            else:
+                start = pos
+            scan_from = pos + 2
+        
+        if scan_from == 0 and self._carry and count and buf[0] == 0xd9:
+            end = 1
+        else:
+            end = _find(buf, mv, _EOI, scan_from, count)
+            if end >= 0:
+                end += 2
+        
+        if end >= 0:
+            self.done = True
+            self.trailing = count - end + remaining
+        else:
+            end = count
+        if end > start:
+            self.writer.write(mv[start:end])
+            self.written += end - start
+        self._carry = count > 0 and buf[count - 1] == 0xff
+        return self.done
+
+class SPITransport:
+    """Chip-select framed access to an SPI bus.
+
+    Camera sends all bus traffic through these three calls, so anything
+    implementing them (such as camera_sim.SimulatedArducamMega) can stand
+    in for the hardware.
+    """
+
+    def __init__(self, spi_bus, cs):
+        self.spi_bus = spi_bus
+        self.cs = cs
+
+    def write(self, buf):
+        """Send buf in one CS frame"""
+        self.cs.off()
+        self.spi_bus.write(buf)
+        self.cs.on()
+
+    def write_readinto(self, tx, rx):
+        """Exchange tx for rx (same length) in one CS frame"""
+        self.cs.off()
+        self.spi_bus.write_readinto(tx, rx)
+        self.cs.on()
+
+    def read_into(self, cmd, buf, skip=None):
+        """Send cmd then read into buf in one CS frame, first clocking into skip if given"""
+        self.cs.off()
+        self.spi_bus.write(cmd)
+        if skip is not None:
+            self.spi_bus.readinto(skip)
+        self.spi_bus.readinto(buf)
+        self.cs.on()
+
+class CaptureTimeoutError(Exception):
+    """The capture-done flag did not set within the capture timeout"""
+    pass
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in milliseconds"""
+    BOUNDS_MS = (25, 50, 100, 200, 400, 800, 1600)
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0
+        self.min_ms = None
+        self.max_ms = 0
+
+    def add(self, ms):
+        index = 0
+        while index < len(self.BOUNDS_MS) and ms > self.BOUNDS_MS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        if self.min_ms is None or ms < self.min_ms:
+            self.min_ms = ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def to_dict(self):
+        labels = [f'<={b}' for b in self.BOUNDS_MS] + [f'>{self.BOUNDS_MS[-1]}']
+        return {
+            'count': self.count,
+            'avg_ms': self.total_ms // self.count if self.count else 0,
+            'min_ms': self.min_ms or 0,
+            'max_ms': self.max_ms,
+            'buckets': dict(zip(labels, self.buckets))
+        }
+
 class Camera:
     # Required imports and register definitions
     CAM_REG_SENSOR_RESET = 0x07
@@ -13,6 +174,7 @@ class Camera:
     SENSOR_3MP_1 = 0x82
     SENSOR_5MP_2 = 0x83
     SENSOR_3MP_2 = 0x84
+    SENSOR_IDS = (SENSOR_5MP_1, SENSOR_3MP_1, SENSOR_5MP_2, SENSOR_3MP_2)
     
     # Camera registers
     CAM_REG_COLOR_EFFECT_CONTROL = 0x27
@@ -24,6 +186,10 @@ class Camera:
     CAM_REG_FORMAT = 0x20
     CAM_REG_CAPTURE_RESOLUTION = 0x21
     CAM_REG_DEBUG_DEVICE_ADDRESS = 0x0A
+    CAM_REG_FOCUS_HIGH = 0x30
+    CAM_REG_FOCUS_LOW = 0x31
+    CAM_REG_GAIN = 0x45
+    CAM_REG_EXPOSURE = 0x55
     deviceAddress = 0x78
 
     # Resolution settings
@@ -51,6 +217,22 @@ class Camera:
     WB_MODE_OFFICE = 2
     WB_MODE_CLOUDY = 3
     WB_MODE_HOME = 4
+    WB_MODES = {
+        'auto': WB_MODE_AUTO,
+        'sunny': WB_MODE_SUNNY,
+        'office': WB_MODE_OFFICE,
+        'cloudy': WB_MODE_CLOUDY,
+        'home': WB_MODE_HOME
+    }
+    
+    # Single-byte setting registers accepted by name in write_settings()
+    SETTING_REGS = {
+        'brightness': CAM_REG_BRIGHTNESS_CONTROL,
+        'contrast': CAM_REG_CONTRAST_CONTROL,
+        'saturation': CAM_REG_SATURATION_CONTROL,
+        'gain': CAM_REG_GAIN,
+        'exposure': CAM_REG_EXPOSURE
+    }
     
     # Brightness levels
     BRIGHTNESS_MINUS_4 = 8
@@ -100,29 +282,97 @@ class Camera:
     FIFO_SIZE1 = 0x45
     FIFO_SIZE2 = 0x46
     FIFO_SIZE3 = 0x47
+    FIFO_SIZE_REGS = (FIFO_SIZE1, FIFO_SIZE2, FIFO_SIZE3)
+    FIFO_MAX_LENGTH = 0x800000  # 8 MB frame buffer on the Arducam Mega
     SINGLE_FIFO_READ = 0x3D
+    BURST_FIFO_READ = 0x3C
 
-    # For Waiting
+    # Bytes per burst transaction (the reference Arducam driver uses a uint8 length)
+    BURST_BLOCK_SIZE = 255
+
+    # Capture-done wait: sleep CAPTURE_SLEEP_PERCENT of the expected
+    # trigger-to-done time, then poll every CAPTURE_POLL_MS until
+    # CAPTURE_TIMEOUT_MS. Expected times start from this table and
+    # follow the observed latency per resolution.
+    CAPTURE_EXPECTED_MS = {
+        RESOLUTION_320X240: 80,
+        RESOLUTION_640X480: 120,
+        RESOLUTION_1280X720: 200,
+        RESOLUTION_1600X1200: 300,
+        RESOLUTION_1920X1080: 300,
+        RESOLUTION_2048X1536: 400,
+        RESOLUTION_2592X1944: 500
+    }
+    CAPTURE_SLEEP_PERCENT = 75
+    CAPTURE_POLL_MS = 2
+    CAPTURE_TIMEOUT_MS = 3000
+
+    # Waits around focus commands, and for a 5MP sensor after reset
+    FOCUS_MODE_MS = 50
+    FOCUS_SETTLE_MS = 1000
+    INIT_SETTLE_MS = 500
+
+    # For Waiting: bit 1 of the state register is set while the sensor is
+    # idle (Arducam Mega SDK: CAM_REG_SENSOR_STATE_IDLE = 1 << 1)
     CAM_REG_SENSOR_STATE = 0x44
-    CAM_REG_SENSOR_STATE_IDLE = 0x01
+    CAM_REG_SENSOR_STATE_MASK = 0x03
+    CAM_REG_SENSOR_STATE_IDLE = 0x02
     
-    def __init__(self, spi_bus, cs, skip_sleep=False):
+    # Register settling: poll the state register up to SETTLE_TIMEOUT_US,
+    # backing off from SETTLE_POLL_MIN_US to SETTLE_POLL_MAX_US between reads.
+    # After SETTLE_MAX_TIMEOUTS consecutive timeouts polling is treated as
+    # unsupported and every settle becomes a fixed SETTLE_FALLBACK_MS delay.
+    SETTLE_TIMEOUT_US = 20000
+    SETTLE_POLL_MIN_US = 20
+    SETTLE_POLL_MAX_US = 500
+    SETTLE_FALLBACK_MS = 2
+    SETTLE_MAX_TIMEOUTS = 3
+    
+    def __init__(self, spi_bus, cs=None, skip_sleep=False, use_burst=True, burst_size=BURST_BLOCK_SIZE):
+        # With cs=None, spi_bus is already a transport (see SPITransport)
         self.spi_bus = spi_bus
         self.cs = cs
+        self.transport = SPITransport(spi_bus, cs) if cs is not None else spi_bus
         self.camera_idx = 'NOT DETECTED'
         
+        # FIFO read path: burst blocks into a reusable buffer, or one byte per transaction
+        self.use_burst = use_burst
+        self.burst_size = burst_size
+        self.burst_first = True
+        self._burst_cmd = bytes([self.BURST_FIFO_READ])
+        self._burst_dummy = bytearray(1)
+        self._fifo_buf = bytearray(burst_size)
+        
+        # Preallocated register transfer buffers
+        self._write_buf = bytearray(2)
+        self._read_tx = bytearray(3)
+        self._read_rx = bytearray(3)
+        self._fifo_read_tx = bytearray([self.SINGLE_FIFO_READ, 0, 0])
+        self._fifo_size = [0, 0, 0]
+        
+        # Shadow copy of setting registers, used to skip writes that change nothing
+        self._shadow = {}
+        self.reg_writes = 0
+        self.reg_writes_elided = 0
+        
+        # Adaptive settling and per-register settle times: addr -> [count, total_us, max_us]
+        self.poll_idle = True
+        self.settle_timeouts = 0
+        self.settle_stats = {}
+        
         # Initialize camera
         print("Initializing camera...")
         self._write_reg(self.CAM_REG_SENSOR_RESET, self.CAM_SENSOR_RESET_ENABLE)
-        self._wait_idle()
+        self._wait_idle(self.CAM_REG_SENSOR_RESET)
+        self.invalidate()
         
         # Detect camera type
         self._get_sensor_config()
-        self._wait_idle()
+        self._wait_idle(self.CAM_REG_SENSOR_ID)
         
         # Set device address
         self._write_reg(self.CAM_REG_DEBUG_DEVICE_ADDRESS, self.deviceAddress)
-        self._wait_idle()
+        self._wait_idle(self.CAM_REG_DEBUG_DEVICE_ADDRESS)
         
         # Set initial format and resolution
         self.current_pixel_format = self.CAM_IMAGE_PIX_FMT_JPG
@@ -131,17 +381,23 @@ class Camera:
         # Initialize other variables
         self.received_length = 0
         self.total_length = 0
+        self.last_framer = None
+        
+        # Capture-done latency per resolution name, and learned expected times
+        self.capture_expected_ms = dict(self.CAPTURE_EXPECTED_MS)
+        self.capture_latency = {}
+        self._capture_start = 0
         
         if not skip_sleep and self.camera_idx == '5MP':
-            sleep_ms(500)  # Wait for camera to stabilize
+            sleep_ms(self.INIT_SETTLE_MS)  # Wait for camera to stabilize
     
     def _get_sensor_config(self):
         """Detect camera type"""
-        camera_id = self._read_reg(self.CAM_REG_SENSOR_ID)
-        if (int.from_bytes(camera_id, 1) == self.SENSOR_5MP_1) or (int.from_bytes(camera_id, 1) == self.SENSOR_5MP_2):
+        camera_id = self._read_reg_value(self.CAM_REG_SENSOR_ID)
+        if camera_id == self.SENSOR_5MP_1 or camera_id == self.SENSOR_5MP_2:
             self.camera_idx = '5MP'
             print("5MP camera detected")
-        elif (int.from_bytes(camera_id, 1) == self.SENSOR_3MP_1) or (int.from_bytes(camera_id, 1) == self.SENSOR_3MP_2):
+        elif camera_id == self.SENSOR_3MP_1 or camera_id == self.SENSOR_3MP_2:
             self.camera_idx = '3MP'
             print("3MP camera detected")
 
@@ -157,8 +413,7 @@ class Camera:
             if input_string_lower in self.valid_5mp_resolutions:
                 print(f"Setting resolution to {new_resolution}")
                 self.current_resolution_setting = self.valid_5mp_resolutions[input_string_lower]
-                self._write_reg(self.CAM_REG_CAPTURE_RESOLUTION, self.current_resolution_setting)
-                self._wait_idle()
+                self._set_reg(self.CAM_REG_CAPTURE_RESOLUTION, self.current_resolution_setting)
             else:
                 raise ValueError(f"Invalid resolution: {new_resolution}")
         except Exception as e:
@@ -168,19 +423,10 @@ class Camera:
     def set_white_balance(self, mode):
         """Set white balance mode"""
         try:
-            wb_modes = {
-                'auto': self.WB_MODE_AUTO,
-                'sunny': self.WB_MODE_SUNNY,
-                'office': self.WB_MODE_OFFICE,
-                'cloudy': self.WB_MODE_CLOUDY,
-                'home': self.WB_MODE_HOME
-            }
-            
             mode = mode.lower()
-            if mode in wb_modes:
+            if mode in self.WB_MODES:
                 print(f"Setting white balance to {mode}")
-                self._write_reg(self.CAM_REG_WB_MODE_CONTROL, wb_modes[mode])
-                self._wait_idle()
+                self._set_reg(self.CAM_REG_WB_MODE_CONTROL, self.WB_MODES[mode])
             else:
                 raise ValueError(f"Invalid white balance mode: {mode}")
         except Exception as e:
@@ -192,8 +438,7 @@ class Camera:
         try:
             level = int(level)
             print(f"Setting brightness to level {level}")
-            self._write_reg(self.CAM_REG_BRIGHTNESS_CONTROL, level)
-            self._wait_idle()
+            self._set_reg(self.CAM_REG_BRIGHTNESS_CONTROL, level)
         except Exception as e:
             print(f"Brightness error: {e}")
             raise
@@ -203,8 +448,7 @@ class Camera:
         try:
             level = int(level)
             print(f"Setting contrast to level {level}")
-            self._write_reg(self.CAM_REG_CONTRAST_CONTROL, level)
-            self._wait_idle()
+            self._set_reg(self.CAM_REG_CONTRAST_CONTROL, level)
         except Exception as e:
             print(f"Contrast error: {e}")
             raise
@@ -214,30 +458,118 @@ class Camera:
         try:
             level = int(level)
             print(f"Setting saturation to level {level}")
-            self._write_reg(self.CAM_REG_SATURATION_CONTROL, level)
-            self._wait_idle()
+            self._set_reg(self.CAM_REG_SATURATION_CONTROL, level)
         except Exception as e:
             print(f"Saturation error: {e}")
             raise
 
+    def set_gain(self, value):
+        """Set manual gain register"""
+        try:
+            value = int(value) & 0xFF
+            print(f"Setting gain to 0x{value:02X}")
+            self._set_reg(self.CAM_REG_GAIN, value)
+        except Exception as e:
+            print(f"Gain error: {e}")
+            raise
+
+    def set_exposure(self, value):
+        """Set manual exposure register"""
+        try:
+            value = int(value) & 0xFF
+            print(f"Setting exposure to 0x{value:02X}")
+            self._set_reg(self.CAM_REG_EXPOSURE, value)
+        except Exception as e:
+            print(f"Exposure error: {e}")
+            raise
+
+    def set_focus_position(self, value):
+        """Set fixed (manual) focus position, a 16-bit value"""
+        try:
+            value = int(value) & 0xFFFF
+            print(f"Setting fixed focus to 0x{value:04X}")
+            self._set_reg(self.CAM_REG_FOCUS_HIGH, (value >> 8) & 0xFF)
+            self._set_reg(self.CAM_REG_FOCUS_LOW, value & 0xFF)
+        except Exception as e:
+            print(f"Focus position error: {e}")
+            raise
+
+    def setting_regs(self, name, value):
+        """Register (addr, value) pairs for one named setting.
+
+        Raises ValueError for unknown settings and out-of-range values, so a
+        batch can be checked completely before anything is written.
+        """
+        if name == 'resolution':
+            code = self.valid_5mp_resolutions.get(str(value).lower())
+            if code is None:
+                raise ValueError(f"Invalid resolution: {value}")
+            return [(self.CAM_REG_CAPTURE_RESOLUTION, code)]
+        if name == 'white_balance':
+            mode = self.WB_MODES.get(str(value).lower())
+            if mode is None:
+                raise ValueError(f"Invalid white balance mode: {value}")
+            return [(self.CAM_REG_WB_MODE_CONTROL, mode)]
+        if name == 'focus':
+            value = int(value)
+            if not 0 <= value <= 0xFFFF:
+                raise ValueError(f"Invalid focus position: {value}")
+            return [(self.CAM_REG_FOCUS_HIGH, value >> 8), (self.CAM_REG_FOCUS_LOW, value & 0xFF)]
+        addr = self.SETTING_REGS.get(name)
+        if addr is None:
+            raise ValueError(f"Unknown setting: {name}")
+        value = int(value)
+        if not 0 <= value <= 0xFF:
+            raise ValueError(f"Invalid {name} value: {value}")
+        return [(addr, value)]
+
+    def write_settings(self, settings):
+        """Write a list of (name, value) settings as one ordered register batch.
+
+        Every value is validated before the first write, and the sensor is
+        only waited on once at the end. Returns how many registers changed.
+        """
+        pairs = []
+        for name, value in settings:
+            pairs.extend(self.setting_regs(name, value))
+        for addr, val in pairs:
+            if addr == self.CAM_REG_CAPTURE_RESOLUTION:
+                self.current_resolution_setting = val
+        return self.write_regs(pairs)
+
+    def focus_steps(self, enable=True, single=False):
+        """Auto focus control writes, each with the wait after it; None without auto focus.
+
+        auto_focus() and single_focus() run them with sleep_ms. Callers that
+        wait on their own, e.g. an event loop, write each value with
+        write_focus_step() and wait between them themselves.
+        """
+        if self.camera_idx != '5MP':
+            return None
+        if single:
+            return ((self.FOCUS_AUTO, self.FOCUS_MODE_MS), (self.SINGLE_FOCUS, self.FOCUS_SETTLE_MS))
+        if enable:
+            return ((self.FOCUS_AUTO, self.FOCUS_MODE_MS), (self.AF_ENABLE, self.FOCUS_SETTLE_MS))
+        return ((self.AF_DISABLE, self.FOCUS_SETTLE_MS),)
+
+    def write_focus_step(self, value):
+        self._write_reg(self.CAM_REG_AUTO_FOCUS_CONTROL, value)
+
+    def _run_focus_steps(self, steps):
+        for value, wait_ms in steps:
+            self.write_focus_step(value)
+            sleep_ms(wait_ms)
+
     def auto_focus(self, enable=True):
         """Enable or disable auto focus"""
-        if self.camera_idx != '5MP':
+        steps = self.focus_steps(enable)
+        if steps is None:
             print("Auto focus is only supported on 5MP cameras")
             return False
             
         try:
             print(f"{'Enabling' if enable else 'Disabling'} auto focus...")
-            if enable:
-                # First ensure we're in auto focus mode
-                self._write_reg(self.CAM_REG_AUTO_FOCUS_CONTROL, self.FOCUS_AUTO)
-                sleep_ms(50)
-                # Then enable auto focus
-                self._write_reg(self.CAM_REG_AUTO_FOCUS_CONTROL, self.AF_ENABLE)
-            else:
-                # Disable auto focus
-                self._write_reg(self.CAM_REG_AUTO_FOCUS_CONTROL, self.AF_DISABLE)
-            sleep_ms(1000)  # Give time for focus to adjust
+            self._run_focus_steps(steps)
             print("Auto focus operation completed")
             return True
         except Exception as e:
@@ -246,74 +578,189 @@ class Camera:
 
     def single_focus(self):
         """Perform single auto focus"""
-        if self.camera_idx != '5MP':
+        steps = self.focus_steps(single=True)
+        if steps is None:
             print("Auto focus is only supported on 5MP cameras")
             return False
             
         try:
             print("Performing single focus...")
-            # First set to auto focus mode
-            self._write_reg(self.CAM_REG_AUTO_FOCUS_CONTROL, self.FOCUS_AUTO)
-            sleep_ms(50)
-            # Then trigger single focus
-            self._write_reg(self.CAM_REG_AUTO_FOCUS_CONTROL, self.SINGLE_FOCUS)
-            sleep_ms(1000)  # Give time for focus operation
+            self._run_focus_steps(steps)
             print("Single focus completed")
             return True
         except Exception as e:
             print(f"Single focus error: {e}")
             return False
     
+    def probe(self):
+        """Cheap liveness check: sensor ID, state register and FIFO length sanity"""
+        if self._read_reg_value(self.CAM_REG_SENSOR_ID) not in self.SENSOR_IDS:
+            return False
+        # A disconnected bus reads back all ones
+        if self._read_reg_value(self.CAM_REG_SENSOR_STATE) == 0xFF:
+            return False
+        return self._read_fifo_length() <= self.FIFO_MAX_LENGTH
+    
     def capture_jpg(self):
         """Capture image"""
-        self._write_reg(self.CAM_REG_FORMAT, self.current_pixel_format)
-        self._wait_idle()
-        self._write_reg(self.CAM_REG_CAPTURE_RESOLUTION, self.current_resolution_setting)
-        self._wait_idle()
-        self._set_capture()
+        self.begin_capture()
+        self._wait_capture_done()
+        self._finish_capture()
+    
+    def begin_capture(self):
+        """Trigger a capture and return at once.
+
+        For callers that wait on their own, e.g. an event loop: sleep for
+        capture_wait_ms(), poll capture_done() until it is true or
+        capture_timed_out(), then call end_capture().
+        """
+        self._set_reg(self.CAM_REG_FORMAT, self.current_pixel_format)
+        self._set_reg(self.CAM_REG_CAPTURE_RESOLUTION, self.current_resolution_setting)
+        self._begin_capture()
+    
+    def capture_timed_out(self):
+        return ticks_diff(ticks_ms(), self._capture_start) >= self.CAPTURE_TIMEOUT_MS
+    
+    def end_capture(self):
+        """Finish a capture started with begin_capture once capture_done() is true"""
+        self._finish_capture()
     
     def saveJPG(self, filename):
         """Save captured image"""
         print('Saving image...')
-        headflag = 0
-        image_data = 0x00
-        image_data_next = 0x00
+        with open(filename, 'wb') as jpg_to_write:
+            written = self.stream_jpg(jpg_to_write)
+        if not written:
+            uos.remove(filename)
+            raise ValueError('No JPEG data in FIFO')
+    
+    def stream_jpg(self, writer, on_start=None):
+        """Forward the captured image from the FIFO to any object with write().
+
+        Bytes before the SOI marker are dropped and reading stops at EOI.
+        on_start(length) is called before the first write with the number of
+        bytes that will be written (the FIFO length counted from SOI), so a
+        caller can send Content-Length first; in that case the bytes after
+        EOI are zero-filled instead of clocked out of the FIFO.
+        Returns the number of bytes written.
+        """
+        for written in self.stream_jpg_steps(writer, on_start):
+            pass
+        return written
+    
+    def stream_jpg_steps(self, writer, on_start=None):
+        """stream_jpg as a generator, yielding the bytes written so far after each block.
+
+        An event loop can wait for a slow writer between blocks; the last
+        value yielded is the total.
+        """
+        buf = self._fifo_buf
+        framer = JpegFramer(writer, on_start)
+        self.last_framer = framer
         
-        image_data_int = 0x00
-        image_data_next_int = 0x00
+        while self.received_length:
+            count = self._read_fifo(buf)
+            if framer.feed(buf, count, self.received_length):
+                self.received_length = 0
+            yield framer.written
         
-        while(self.received_length):
-            image_data = image_data_next
-            image_data_int = image_data_next_int
-            
-            image_data_next = self._read_byte()
-            image_data_next_int = int.from_bytes(image_data_next, 1)
-            
-            if headflag == 1:
-                jpg_to_write.write(image_data_next)
-            
-            if (image_data_int == 0xff) and (image_data_next_int == 0xd8):
-                headflag = 1
-                jpg_to_write = open(filename, 'wb')
-                jpg_to_write.write(image_data)
-                jpg_to_write.write(image_data_next)
-                
-            if (image_data_int == 0xff) and (image_data_next_int == 0xd9):
-                headflag = 0
-                jpg_to_write.write(image_data_next)
-                jpg_to_write.close()
+        written = framer.written
+        if on_start and written < framer.expected:
+            mv = memoryview(buf)
+            for i in range(len(buf)):
+                buf[i] = 0
+            while written < framer.expected:
+                count = min(len(buf), framer.expected - written)
+                writer.write(mv[:count])
+                written += count
+                yield written
+        yield written
+    
+    def read_jpg_into(self, buf):
+        """Read the captured frame into buf with burst reads.
+
+        Returns (start, end) of the JPEG inside buf, or None without touching
+        the FIFO when the frame does not fit, so it can still be streamed.
+        Markers are searched a burst block at a time, so without
+        bytearray.find() no more than a block is ever copied: SOI from the
+        start, EOI first in the last block, where it sits before the FIFO's
+        padding, then from SOI if it isn't there.
+        """
+        total = self.received_length
+        if total > len(buf):
+            return None
+        mv = memoryview(buf)
+        pos = 0
+        while self.received_length:
+            pos += self._read_fifo(mv[pos:pos + self.burst_size])
+        block = self.burst_size
+        start = _find_blocks(buf, mv, _SOI, 0, pos, block)
+        if start < 0:
+            raise ValueError('No JPEG data in FIFO')
+        end = _find(buf, mv, _EOI, max(start + 2, pos - block), pos)
+        if end < 0 and pos - block > start + 2:
+            end = _find_blocks(buf, mv, _EOI, start + 2, pos, block)
+        end = pos if end < 0 else end + 2
+        return start, end
     
     def _set_capture(self):
+        self._begin_capture()
+        self._wait_capture_done()
+        self._finish_capture()
+    
+    def _begin_capture(self):
+        """Clear the FIFO flag and trigger a capture"""
+        self.burst_first = True
         self._clear_fifo_flag()
-        self._wait_idle()
+        self._wait_idle(self.ARDUCHIP_FIFO)
         self._start_capture()
+        self._capture_start = ticks_ms()
+    
+    def capture_done(self):
+        return bool(self._get_bit(self.ARDUCHIP_TRIG, self.CAP_DONE_MASK))
+    
+    def capture_wait_ms(self):
+        """How long to sleep after triggering before polling for capture done"""
+        expected = self.capture_expected_ms.get(self.current_resolution_setting, 100)
+        return expected * self.CAPTURE_SLEEP_PERCENT // 100
+    
+    def _wait_capture_done(self):
+        sleep_ms(self.capture_wait_ms())
+        while not self.capture_done():
+            if self.capture_timed_out():
+                raise CaptureTimeoutError(f"Capture not done after {self.CAPTURE_TIMEOUT_MS} ms")
+            sleep_ms(self.CAPTURE_POLL_MS)
+    
+    def _finish_capture(self):
+        """Record capture latency and latch the FIFO length"""
+        elapsed = ticks_diff(ticks_ms(), self._capture_start)
+        resolution = self.current_resolution_setting
+        name = self.resolution_name()
+        histogram = self.capture_latency.get(name)
+        if histogram is None:
+            histogram = self.capture_latency[name] = LatencyHistogram()
+        histogram.add(elapsed)
+        expected = self.capture_expected_ms.get(resolution, elapsed)
+        self.capture_expected_ms[resolution] = (expected * 3 + elapsed) // 4
         
-        while (int(self._get_bit(self.ARDUCHIP_TRIG, self.CAP_DONE_MASK)) == 0):
-            sleep_ms(200)
-            
         self.received_length = self._read_fifo_length()
         self.total_length = self.received_length
     
+    def resolution_name(self):
+        for name, value in self.valid_5mp_resolutions.items():
+            if value == self.current_resolution_setting:
+                return name
+        return f'0x{self.current_resolution_setting:02X}'
+    
+    def capture_stats(self):
+        """Capture-done latency histograms and expected wait per resolution"""
+        stats = {}
+        for name, histogram in self.capture_latency.items():
+            entry = histogram.to_dict()
+            entry['expected_ms'] = self.capture_expected_ms.get(self.valid_5mp_resolutions.get(name), 0)
+            stats[name] = entry
+        return stats
+    
     def _clear_fifo_flag(self):
         self._write_reg(self.ARDUCHIP_FIFO, self.FIFO_CLEAR_ID_MASK)
 
@@ -321,37 +768,147 @@ class Camera:
         self._write_reg(self.ARDUCHIP_FIFO, self.FIFO_START_MASK)
     
     def _read_fifo_length(self):
-        len1 = int.from_bytes(self._read_reg(self.FIFO_SIZE1), 1)
-        len2 = int.from_bytes(self._read_reg(self.FIFO_SIZE2), 1)
-        len3 = int.from_bytes(self._read_reg(self.FIFO_SIZE3), 1)
+        len1, len2, len3 = self.read_regs(self.FIFO_SIZE_REGS, self._fifo_size)
         return ((len3 << 16) | (len2 << 8) | len1) & 0xffffff
     
+    def invalidate(self):
+        """Forget all shadowed register values, e.g. after a sensor reset"""
+        self._shadow = {}
+    
+    def register_stats(self):
+        return {'writes': self.reg_writes, 'elided': self.reg_writes_elided}
+    
+    def _set_reg(self, addr, val):
+        """Write a setting register and wait for idle, unless it already holds val"""
+        if self._shadow.get(addr) == val:
+            self.reg_writes_elided += 1
+            return False
+        self._write_reg(addr, val)
+        self._wait_idle(addr)
+        self._shadow[addr] = val
+        return True
+    
+    def write_regs(self, pairs):
+        """Write a list of (addr, value) setting registers with one settle wait.
+
+        Registers already holding the value are skipped. Returns how many
+        registers were actually written.
+        """
+        written = 0
+        last = None
+        for addr, val in pairs:
+            if self._shadow.get(addr) == val:
+                self.reg_writes_elided += 1
+                continue
+            self._write_reg(addr, val)
+            self._shadow[addr] = val
+            last = addr
+            written += 1
+        if written:
+            self._wait_idle(last)
+        return written
+    
+    def read_regs(self, addrs, out=None):
+        """Read a list of registers, reusing the transfer buffers.
+
+        Each register still needs its own CS frame on the ArduChip bus. Pass
+        a list as out to fill it in place instead of allocating a new one.
+        """
+        if out is None:
+            out = [0] * len(addrs)
+        for i in range(len(addrs)):
+            out[i] = self._read_reg_value(addrs[i])
+        return out
+    
     def _write_reg(self, addr, val):
-        self.cs.off()
-        self.spi_bus.write(bytes([addr | 0x80, val]))
-        self.cs.on()
-        sleep_ms(1)
+        """Write a register as is; _set_reg and write_regs shadow it again afterwards"""
+        self.reg_writes += 1
+        # A raw write, e.g. a focus step or a test script, makes the shadow stale
+        self._shadow.pop(addr, None)
+        cmd = self._write_buf
+        cmd[0] = addr | 0x80
+        cmd[1] = val
+        self.transport.write(cmd)
+    
+    def _read_reg_value(self, addr):
+        """Read a register as an int: command byte, dummy byte, then data"""
+        tx = self._read_tx
+        tx[0] = addr & 0x7F
+        self.transport.write_readinto(tx, self._read_rx)
+        return self._read_rx[2]
     
     def _read_reg(self, addr):
-        self.cs.off()
-        self.spi_bus.write(bytes([addr & 0x7F]))
-        data = self.spi_bus.read(1)
-        data = self.spi_bus.read(1)
-        self.cs.on()
-        return data
+        return bytes((self._read_reg_value(addr),))
     
     def _read_byte(self):
-        self.cs.off()
-        self.spi_bus.write(bytes([self.SINGLE_FIFO_READ]))
-        data = self.spi_bus.read(1)
-        data = self.spi_bus.read(1)
-        self.cs.on()
+        self.transport.write_readinto(self._fifo_read_tx, self._read_rx)
         self.received_length -= 1
-        return data
+        return self._read_rx[2]
+    
+    def _read_fifo_burst(self, buf):
+        """Drain up to len(buf) FIFO bytes in a single burst transaction"""
+        length = min(len(buf), self.received_length)
+        if length == 0:
+            return 0
+        # First burst after a capture clocks out one dummy byte
+        skip = self._burst_dummy if self.burst_first else None
+        self.burst_first = False
+        if length == len(buf):
+            self.transport.read_into(self._burst_cmd, buf, skip)
+        else:
+            self.transport.read_into(self._burst_cmd, memoryview(buf)[:length], skip)
+        self.received_length -= length
+        return length
+    
+    def _read_fifo(self, buf):
+        """Fill buf from the FIFO, returns the number of bytes read"""
+        if self.use_burst:
+            return self._read_fifo_burst(buf)
+        length = min(len(buf), self.received_length)
+        for i in range(length):
+            buf[i] = self._read_byte()
+        return length
+    
+    def _wait_idle(self, addr=None):
+        """Wait until the sensor reports idle after a register access to addr"""
+        start = ticks_us()
+        if self.poll_idle:
+            delay = self.SETTLE_POLL_MIN_US
+            while True:
+                state = self._read_reg_value(self.CAM_REG_SENSOR_STATE)
+                if (state & self.CAM_REG_SENSOR_STATE_MASK) == self.CAM_REG_SENSOR_STATE_IDLE:
+                    self.settle_timeouts = 0
+                    break
+                if ticks_diff(ticks_us(), start) >= self.SETTLE_TIMEOUT_US:
+                    self.settle_timeouts += 1
+                    if self.settle_timeouts >= self.SETTLE_MAX_TIMEOUTS:
+                        print("Sensor state polling unsupported, using fixed settle delay")
+                        self.poll_idle = False
+                    sleep_ms(self.SETTLE_FALLBACK_MS)
+                    break
+                sleep_us(delay)
+                delay = min(delay * 2, self.SETTLE_POLL_MAX_US)
+        else:
+            sleep_ms(self.SETTLE_FALLBACK_MS)
+        self._record_settle(addr, ticks_diff(ticks_us(), start))
+    
+    def _record_settle(self, addr, elapsed_us):
+        stats = self.settle_stats.get(addr)
+        if stats is None:
+            self.settle_stats[addr] = [1, elapsed_us, elapsed_us]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed_us
+            if elapsed_us > stats[2]:
+                stats[2] = elapsed_us
     
-    def _wait_idle(self):
-        sleep_ms(2)
+    def settle_report(self):
+        """Per-register settle times keyed by register address in hex"""
+        report = {}
+        for addr, (count, total_us, max_us) in self.settle_stats.items():
+            key = 'none' if addr is None else f'0x{addr:02X}'
+            report[key] = {'count': count, 'avg_us': total_us // count, 'max_us': max_us, 'total_us': total_us}
+        return report
     
     def _get_bit(self, addr, bit):
-        data = self._read_reg(addr)
-        return int.from_bytes(data, 1) & bit
+        return self._read_reg_value(addr) & bit
@@ -0,0 +1,419 @@
+"""Camera driver benchmarks.
+
+Runs on the Pico against the real camera, or on a computer against the
+simulated Arducam Mega:
+
+    python camera_bench.py --sim --json bench.json
+    python camera_bench.py --compare old.json new.json
+
+run_suite reports register writes/reads per second, FIFO bytes per second,
+trigger-to-done capture latency and capture-to-file time for every
+resolution, and can save the results as JSON to compare runs.
+compare_file_senders measures the web server's file download path.
+"""
+
+import sys
+import json
+import gc
+import camera_sim
+import uos
+from time import ticks_us, ticks_diff
+from camera import Camera, JpegFramer
+from camera_sim import make_camera, make_jpeg, SimulatedArducamMega
+
+FIFO_BENCH_SIZE = 64 * 1024
+FRAMER_CHUNK_SIZE = 255
+REGISTER_BENCH_COUNT = 500
+CAPTURE_BENCH_COUNT = 3
+BENCH_FILE = 'bench.jpg'
+SEND_BENCH_SIZE = 200 * 1024
+SEND_BENCH_SEGMENT = 2920  # bytes the fake socket takes per write, two TCP segments
+
+
+class NullWriter:
+    """Counts written bytes and discards them"""
+
+    def __init__(self):
+        self.count = 0
+        self.calls = 0
+
+    def write(self, data):
+        self.count += len(data)
+        self.calls += 1
+
+
+def print_section(message):
+    print(f"\n{'='*20} {message} {'='*20}")
+
+
+def bench_fifo_read(size=FIFO_BENCH_SIZE, use_burst=True, burst_size=None):
+    """Time draining a captured frame of the given size, returns bytes/second"""
+    kwargs = {'use_burst': use_burst}
+    if burst_size:
+        kwargs['burst_size'] = burst_size
+    cam, bus = make_camera(make_jpeg(size), **kwargs)
+    cam.capture_jpg()
+    buf = cam._fifo_buf
+    start = ticks_us()
+    total = 0
+    while cam.received_length:
+        total += cam._read_fifo(buf)
+    elapsed = max(ticks_diff(ticks_us(), start), 1)
+    return {
+        'path': 'burst' if use_burst else 'single',
+        'bytes': total,
+        'transactions': bus.transactions,
+        'us': elapsed,
+        'bytes_per_sec': total * 1000000 // elapsed,
+    }
+
+
+def compare_fifo_paths(size=FIFO_BENCH_SIZE):
+    """Compare single-byte and burst FIFO reads against the simulated device"""
+    print_section("FIFO READ")
+    results = [bench_fifo_read(size, use_burst=False), bench_fifo_read(size, use_burst=True)]
+    for r in results:
+        print(f"{r['path']:>6}: {r['bytes']} bytes in {r['us']} us, "
+              f"{r['bytes_per_sec']} B/s, {r['transactions']} transactions")
+    speedup = results[1]['bytes_per_sec'] / max(results[0]['bytes_per_sec'], 1)
+    print(f"Burst speedup: {speedup:.1f}x")
+    return results
+
+
+def record_fifo_dump(cam, filename):
+    """Capture a frame and write the raw, unframed FIFO contents to filename"""
+    cam.capture_jpg()
+    buf = cam._fifo_buf
+    total = 0
+    with open(filename, 'wb') as f:
+        while cam.received_length:
+            count = cam._read_fifo(buf)
+            f.write(memoryview(buf)[:count])
+            total += count
+    print(f"Recorded {total} FIFO bytes to {filename}")
+    return total
+
+
+def _bytewise_frame(data, chunk_size, writer):
+    """The original per-byte SOI/EOI state machine, kept as a baseline"""
+    buf = bytearray(chunk_size)
+    prev = 0x00
+    writing = False
+    for offset in range(0, len(data), chunk_size):
+        count = min(chunk_size, len(data) - offset)
+        buf[:count] = data[offset:offset + count]
+        for i in range(count):
+            cur = buf[i]
+            if writing:
+                writer.write(buf[i:i + 1])
+            if prev == 0xff and cur == 0xd8 and not writing:
+                writing = True
+                writer.write(b'\xff')
+                writer.write(buf[i:i + 1])
+            elif prev == 0xff and cur == 0xd9 and writing:
+                return
+            prev = cur
+
+
+def _chunked_frame(data, chunk_size, writer):
+    buf = bytearray(chunk_size)
+    framer = JpegFramer(writer)
+    for offset in range(0, len(data), chunk_size):
+        count = min(chunk_size, len(data) - offset)
+        buf[:count] = data[offset:offset + count]
+        if framer.feed(buf, count, len(data) - offset - count):
+            break
+    return framer
+
+
+def bench_framer(dumps=None, chunk_size=FRAMER_CHUNK_SIZE):
+    """Compare per-byte and chunked marker scanning over recorded FIFO dumps.
+
+    dumps is a list of files written by record_fifo_dump; without it a
+    synthetic frame with leading garbage and trailing padding is used.
+    """
+    print_section("JPEG FRAMING")
+    samples = []
+    for name in dumps or []:
+        with open(name, 'rb') as f:
+            samples.append((name, f.read()))
+    if not samples:
+        samples.append(('synthetic', b'\x00' * 8 + make_jpeg(FIFO_BENCH_SIZE) + b'\x00' * 64))
+
+    results = []
+    for name, data in samples:
+        row = {'dump': name, 'bytes': len(data)}
+        for label, frame in (('bytewise', _bytewise_frame), ('chunked', _chunked_frame)):
+            writer = NullWriter()
+            start = ticks_us()
+            framer = frame(data, chunk_size, writer)
+            elapsed = max(ticks_diff(ticks_us(), start), 1)
+            row[label] = {'us': elapsed, 'writes': writer.calls, 'bytes_per_sec': len(data) * 1000000 // elapsed}
+            if framer:
+                row['leading'] = framer.leading
+                row['trailing'] = framer.trailing
+        print(f"{name}: {len(data)} bytes, bytewise {row['bytewise']['us']} us "
+              f"({row['bytewise']['writes']} writes), chunked {row['chunked']['us']} us "
+              f"({row['chunked']['writes']} writes), leading {row['leading']} / trailing {row['trailing']}")
+        results.append(row)
+    return results
+
+
+class PartialSocket:
+    """Non-blocking socket stand-in that accepts at most segment bytes per write"""
+
+    def __init__(self, segment=SEND_BENCH_SEGMENT):
+        self.segment = segment
+        self.count = 0
+        self.calls = 0
+
+    def write(self, data):
+        self.calls += 1
+        count = min(len(data), self.segment)
+        self.count += count
+        return count
+
+
+class BenchStream:
+    """Just enough of an asyncio stream for webserver.write_file"""
+
+    def __init__(self, sock):
+        self.s = sock
+
+    def write(self, data):
+        self.s.write(data)
+
+    async def drain(self):
+        pass
+
+
+def _legacy_send_file(sock, filename, chunk_size=1024):
+    """The original sender: a new chunk per read and a collection per chunk"""
+    with open(filename, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            sent = 0
+            while sent < len(chunk):
+                sent += sock.write(chunk[sent:])
+            gc.collect()
+
+
+def _mem_alloc():
+    return gc.mem_alloc() if hasattr(gc, 'mem_alloc') else 0
+
+
+def compare_file_senders(size=SEND_BENCH_SIZE):
+    """Throughput of the old per-chunk sender against webserver.write_file"""
+    try:
+        import asyncio
+    except ImportError:
+        import uasyncio as asyncio
+    import webserver
+
+    print_section("FILE SEND")
+    with open(BENCH_FILE, 'wb') as f:
+        f.write(make_jpeg(size))
+    results = []
+    for name in ('legacy', 'readinto'):
+        sock = PartialSocket()
+        gc.collect()
+        gc.disable()
+        before = _mem_alloc()
+        start = ticks_us()
+        if name == 'legacy':
+            _legacy_send_file(sock, BENCH_FILE)
+        else:
+            asyncio.run(webserver.write_file(BenchStream(sock), BENCH_FILE))
+        elapsed = max(ticks_diff(ticks_us(), start), 1)
+        allocated = _mem_alloc() - before
+        gc.enable()
+        results.append({
+            'path': name,
+            'bytes': sock.count,
+            'us': elapsed,
+            'bytes_per_sec': sock.count * 1000000 // elapsed,
+            'socket_writes': sock.calls,
+            'allocated': allocated
+        })
+    uos.remove(BENCH_FILE)
+    for r in results:
+        print(f"{r['path']:>8}: {r['bytes']} bytes in {r['us']} us, {r['bytes_per_sec']} B/s, "
+              f"{r['socket_writes']} socket writes, {r['allocated']} bytes allocated")
+    speedup = results[1]['bytes_per_sec'] / max(results[0]['bytes_per_sec'], 1)
+    print(f"readinto speedup: {speedup:.1f}x (chunk {webserver.file_chunk_size()} bytes)")
+    return results
+
+
+def make_hardware_camera():
+    """Camera on the SPI pins used by the rest of the project"""
+    from machine import Pin, SPI
+    spi = SPI(1, sck=Pin(10), mosi=Pin(15), miso=Pin(12), baudrate=8000000)
+    cs = Pin(13, Pin.OUT)
+    cs.high()
+    return Camera(spi, cs, skip_sleep=False)
+
+
+def make_sim_camera():
+    """Camera on a simulated device with realistic bus speed and capture delays"""
+    cam, device = make_camera(device=SimulatedArducamMega())
+    return cam
+
+
+def _rate(count, elapsed_us):
+    return count * 1000000 // max(elapsed_us, 1)
+
+
+def bench_register_writes(cam, count=REGISTER_BENCH_COUNT):
+    value = cam.BRIGHTNESS_DEFAULT
+    start = ticks_us()
+    for _ in range(count):
+        cam._write_reg(cam.CAM_REG_BRIGHTNESS_CONTROL, value)
+    elapsed = ticks_diff(ticks_us(), start)
+    cam.invalidate()
+    return {'count': count, 'us': elapsed, 'per_sec': _rate(count, elapsed)}
+
+
+def bench_register_reads(cam, count=REGISTER_BENCH_COUNT):
+    start = ticks_us()
+    for _ in range(count):
+        cam._read_reg_value(cam.CAM_REG_SENSOR_ID)
+    elapsed = ticks_diff(ticks_us(), start)
+    return {'count': count, 'us': elapsed, 'per_sec': _rate(count, elapsed)}
+
+
+def bench_capture(cam, resolution, count=CAPTURE_BENCH_COUNT):
+    """Trigger-to-done latency, FIFO drain rate and capture-to-file time at one resolution"""
+    cam.resolution = resolution
+    latency = []
+    fifo_bytes = 0
+    fifo_us = 0
+    to_file = []
+    size = 0
+    buf = cam._fifo_buf
+    for _ in range(count):
+        cam._begin_capture()
+        start = ticks_us()
+        cam._wait_capture_done()
+        latency.append(ticks_diff(ticks_us(), start) // 1000)
+        cam._finish_capture()
+        start = ticks_us()
+        while cam.received_length:
+            fifo_bytes += cam._read_fifo(buf)
+        fifo_us += ticks_diff(ticks_us(), start)
+
+        gc.collect()
+        start = ticks_us()
+        cam.capture_jpg()
+        cam.saveJPG(BENCH_FILE)
+        to_file.append(ticks_diff(ticks_us(), start) // 1000)
+        size = cam.last_framer.written
+    try:
+        import uos
+        uos.remove(BENCH_FILE)
+    except OSError:
+        pass
+    return {
+        'jpeg_bytes': size,
+        'capture_latency_ms': {'min': min(latency), 'avg': sum(latency) // count, 'max': max(latency)},
+        'fifo_bytes_per_sec': _rate(fifo_bytes, fifo_us),
+        'capture_to_file_ms': {'min': min(to_file), 'avg': sum(to_file) // count, 'max': max(to_file)},
+    }
+
+
+def run_suite(cam, label='device', resolutions=None, output=None):
+    """Run every driver benchmark and optionally write the results to output as JSON"""
+    print_section(f"DRIVER BENCHMARK ({label})")
+    results = {
+        'label': label,
+        'camera': cam.camera_idx,
+        'burst_size': cam.burst_size if cam.use_burst else 1,
+        'register_writes': bench_register_writes(cam),
+        'register_reads': bench_register_reads(cam),
+        'resolutions': {},
+    }
+    print(f"Register writes: {results['register_writes']['per_sec']}/s")
+    print(f"Register reads: {results['register_reads']['per_sec']}/s")
+
+    for resolution in resolutions or cam.valid_5mp_resolutions:
+        try:
+            row = bench_capture(cam, resolution)
+        except Exception as e:
+            print(f"{resolution}: failed ({e})")
+            results['resolutions'][resolution] = {'error': str(e)}
+            continue
+        results['resolutions'][resolution] = row
+        print(f"{resolution}: {row['jpeg_bytes']} bytes, "
+              f"done in {row['capture_latency_ms']['avg']} ms, "
+              f"FIFO {row['fifo_bytes_per_sec']} B/s, "
+              f"to file {row['capture_to_file_ms']['avg']} ms")
+
+    results['registers'] = cam.register_stats()
+    print(f"Register writes issued: {results['registers']['writes']}, "
+          f"skipped as unchanged: {results['registers']['elided']}")
+    results['settle_polling'] = cam.poll_idle
+    results['settle'] = cam.settle_report()
+    print(f"Register settling: {'polled' if cam.poll_idle else 'fixed delay'}")
+    for addr, row in results['settle'].items():
+        print(f"  {addr}: {row['count']} waits, avg {row['avg_us']} us, max {row['max_us']} us")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f)
+        print(f"Results written to {output}")
+    return results
+
+
+def _metrics(results):
+    """Flatten a result set into name -> (value, higher_is_better)"""
+    flat = {
+        'register_writes/s': (results['register_writes']['per_sec'], True),
+        'register_reads/s': (results['register_reads']['per_sec'], True),
+    }
+    for resolution, row in results['resolutions'].items():
+        if 'error' in row:
+            continue
+        flat[f'{resolution} latency ms'] = (row['capture_latency_ms']['avg'], False)
+        flat[f'{resolution} fifo B/s'] = (row['fifo_bytes_per_sec'], True)
+        flat[f'{resolution} to file ms'] = (row['capture_to_file_ms']['avg'], False)
+    return flat
+
+
+def compare_results(old_file, new_file):
+    """Print per-metric changes between two saved runs, flagging regressions"""
+    with open(old_file) as f:
+        old = _metrics(json.load(f))
+    with open(new_file) as f:
+        new = _metrics(json.load(f))
+    print_section("COMPARISON")
+    for name, (value, higher_is_better) in new.items():
+        if name not in old:
+            continue
+        before = old[name][0]
+        change = (value - before) * 100 / before if before else 0
+        worse = change < 0 if higher_is_better else change > 0
+        flag = ' REGRESSION' if worse and abs(change) >= 10 else ''
+        print(f"{name}: {before} -> {value} ({change:+.1f}%){flag}")
+
+
+def main(args):
+    if '--compare' in args:
+        i = args.index('--compare')
+        compare_results(args[i + 1], args[i + 2])
+        return
+    output = args[args.index('--json') + 1] if '--json' in args else None
+    if '--sim' in args or camera_sim.HOST:
+        cam = make_sim_camera()
+        label = 'simulated'
+    else:
+        cam = make_hardware_camera()
+        label = 'device'
+    run_suite(cam, label, output=output)
+    compare_fifo_paths()
+    bench_framer()
+    compare_file_senders()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
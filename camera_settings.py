@@ -0,0 +1,145 @@
+"""Desired camera settings, applied live to the running sensor"""
+
+from time import ticks_ms, ticks_diff
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+# Order used when the whole state has to be written again after a reset
+SETTING_ORDER = ('resolution', 'white_balance', 'brightness', 'contrast', 'saturation',
+                 'gain', 'exposure', 'focus', 'auto_focus')
+
+DEFAULT_SETTINGS = {'resolution': '640x480'}
+
+# Names used by the single-setting endpoints, accepted in batches too
+ALIASES = {'whitebalance': 'white_balance', 'fixedfocus': 'focus', 'autofocus': 'auto_focus'}
+
+# Settings that are plain register writes and can share one batch
+REGISTER_SETTINGS = ('resolution', 'white_balance', 'brightness', 'contrast', 'saturation',
+                     'gain', 'exposure', 'focus')
+
+def parse_value(name, value):
+    """Convert a raw query-string or JSON value to the setting's stored form"""
+    if name in ('resolution', 'white_balance'):
+        return str(value).lower()
+    if name == 'auto_focus':
+        if isinstance(value, str):
+            return value.lower() in ('1', 'true', 'on', 'enable')
+        return bool(value)
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            return int(value[2:], 16) if value.lower().startswith('0x') else int(value)
+        except ValueError:
+            raise ValueError(f"Invalid {name} value: {value}")
+    return int(value)
+
+def _set_resolution(cam, value):
+    cam.resolution = value
+
+async def run_focus_steps(cam, steps):
+    """Write Camera.focus_steps(), letting other tasks run during the waits"""
+    for value, wait_ms in steps:
+        cam.write_focus_step(value)
+        await asyncio.sleep(wait_ms / 1000)
+
+async def _set_auto_focus(cam, value):
+    steps = cam.focus_steps(value)
+    if steps is None:
+        if value:
+            raise ValueError('Auto focus not available')
+        return
+    await run_focus_steps(cam, steps)
+
+SETTERS = {
+    'resolution': _set_resolution,
+    'white_balance': lambda cam, value: cam.set_white_balance(value),
+    'brightness': lambda cam, value: cam.set_brightness_level(value),
+    'contrast': lambda cam, value: cam.set_contrast(value),
+    'saturation': lambda cam, value: cam.set_saturation_control(value),
+    'gain': lambda cam, value: cam.set_gain(value),
+    'exposure': lambda cam, value: cam.set_exposure(value),
+    'focus': lambda cam, value: cam.set_focus_position(value),
+    'auto_focus': _set_auto_focus,  # a coroutine: the focus waits are long
+}
+
+async def _run_setter(cam, name, value):
+    result = SETTERS[name](cam, value)
+    if hasattr(result, 'send'):
+        await result
+
+class SettingsEngine:
+    """Tracks the desired value of every setting and applies changes live.
+
+    apply() writes one change to the running camera and remembers it;
+    apply_many() writes several at once as a single register batch;
+    reapply() writes the full desired state, which is only needed after the
+    camera was reset or re-initialized. All three are coroutines so auto
+    focus can wait without blocking. Apply latency is kept per setting.
+    """
+
+    def __init__(self, defaults=DEFAULT_SETTINGS):
+        self.desired = dict(defaults)
+        self.latency = {}
+        # Bumped on every change so callers can tell if an image predates it
+        self.version = 0
+
+    async def apply(self, cam, name, value):
+        """Apply one setting now; raises ValueError for unknown or invalid values"""
+        if name not in SETTERS:
+            raise ValueError(f"Unknown setting: {name}")
+        start = ticks_ms()
+        await _run_setter(cam, name, value)
+        self.desired[name] = value
+        self.version += 1
+        self.record(name, ticks_diff(ticks_ms(), start))
+
+    async def reapply(self, cam):
+        """Write the whole desired state, e.g. after a camera reset"""
+        start = ticks_ms()
+        for name in SETTING_ORDER:
+            if name in self.desired:
+                await _run_setter(cam, name, self.desired[name])
+        self.record('reapply', ticks_diff(ticks_ms(), start))
+
+    async def apply_many(self, cam, changes):
+        """Validate a dict of changes, then apply them in SETTING_ORDER.
+
+        Register settings go out as one batch with a single settle wait;
+        nothing is written if any name or value is invalid, or if auto focus
+        is asked of a camera without it. Returns the number of registers
+        written.
+        """
+        parsed = {}
+        for name, value in changes.items():
+            name = ALIASES.get(name, name)
+            if name not in SETTERS:
+                raise ValueError(f"Unknown setting: {name}")
+            parsed[name] = parse_value(name, value)
+        if parsed.get('auto_focus') and cam.camera_idx != '5MP':
+            raise ValueError('Auto focus not available')
+        batch = [(name, parsed[name]) for name in REGISTER_SETTINGS if name in parsed]
+        start = ticks_ms()
+        written = cam.write_settings(batch)
+        if 'auto_focus' in parsed:
+            await _set_auto_focus(cam, parsed['auto_focus'])
+        if parsed:
+            self.desired.update(parsed)
+            self.version += 1
+        self.record('batch', ticks_diff(ticks_ms(), start))
+        return written
+
+    def record(self, name, elapsed_ms):
+        stats = self.latency.get(name)
+        if stats is None:
+            self.latency[name] = [1, elapsed_ms, elapsed_ms]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed_ms
+            stats[2] = elapsed_ms
+
+    def stats(self):
+        return {name: {'count': count, 'avg_ms': total // count, 'last_ms': last}
+                for name, (count, total, last) in self.latency.items()}
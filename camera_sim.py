@@ -0,0 +1,410 @@
+"""Simulated Arducam Mega for running the camera driver and web server without hardware.
+
+On CPython, importing this module installs stand-ins for the MicroPython
+modules the project uses (machine, network, uos, utime and the ticks/sleep_ms
+helpers in time), so camera.py and webserver.CameraManager run unchanged:
+
+    import camera_sim
+    import webserver
+    manager = webserver.CameraManager()
+
+machine.SPI returns a bus wired to camera_sim.device and the CS pin
+(SIM_CS_PIN) frames its transactions. On MicroPython the real modules are
+left alone and the simulated device is only used when passed in explicitly.
+"""
+
+import sys
+import time
+
+SIM_CS_PIN = 13
+# Free heap reported by gc.mem_free on the host, close to a Pico W after WiFi is up
+SIM_HEAP_FREE = 160 * 1024
+
+
+def _install_host_modules():
+    """Provide the MicroPython-only modules and time helpers under CPython"""
+    import gc
+    import os
+    import types
+
+    if not hasattr(time, 'sleep_ms'):
+        time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+        time.sleep_us = lambda us: time.sleep(us / 1000000)
+        time.ticks_ms = lambda: int(time.monotonic() * 1000)
+        time.ticks_us = lambda: int(time.monotonic() * 1000000)
+        time.ticks_diff = lambda new, old: new - old
+        time.ticks_add = lambda ticks, delta: ticks + delta
+    sys.modules.setdefault('utime', time)
+    sys.modules.setdefault('uos', os)
+    if not hasattr(gc, 'mem_free'):
+        gc.mem_free = lambda: SIM_HEAP_FREE
+
+    machine = types.ModuleType('machine')
+    machine.Pin = SimulatedPin
+    machine.SPI = SimulatedSPI
+    machine.RTC = SimulatedRTC
+    machine.freq = lambda *args: 125000000
+    sys.modules['machine'] = machine
+
+    network = types.ModuleType('network')
+    network.STA_IF = 0
+    network.AP_IF = 1
+    network.WLAN = SimulatedWLAN
+    sys.modules['network'] = network
+
+
+class SimulatedArducamMega:
+    """Register file, sensor and FIFO model of an Arducam Mega.
+
+    Implements the transport interface (write, write_readinto, read_into)
+    so it can be handed to Camera directly, and also serves SimulatedSPI
+    for byte-level access through machine.SPI.
+
+    sensor          '5MP' or '3MP', selects the sensor ID register value
+    samples         dict of resolution name -> JPEG bytes used to fill the FIFO
+    samples_dir     directory holding <resolution>.jpg sample files
+    capture_delay_ms  trigger-to-done time, an int or dict of resolution code -> ms
+    baudrate        simulated bus bit rate, None for an unthrottled bus
+    fifo_padding    zero bytes appended after the JPEG, like the real FIFO
+    settle_us       how long the sensor reports busy after a register write
+    """
+
+    SENSOR_IDS = {'5MP': 0x81, '3MP': 0x82}
+    # State register bits as documented by Arducam's Mega SDK, kept apart
+    # from camera.py so a wrong encoding there shows up in host runs
+    STATE_IDLE = 1 << 1
+    STATE_CAPTURE_DONE = 1 << 2
+
+    def __init__(self, sensor='5MP', samples=None, samples_dir=None,
+                 capture_delay_ms=None, baudrate=8000000, fifo_padding=8, settle_us=300):
+        from camera import Camera
+        self.Camera = Camera
+        self.regs = bytearray(256)
+        self.regs[Camera.CAM_REG_SENSOR_ID] = self.SENSOR_IDS[sensor]
+        self.samples = dict(samples or {})
+        self.samples_dir = samples_dir
+        if capture_delay_ms is None:
+            capture_delay_ms = Camera.CAPTURE_EXPECTED_MS
+        self.capture_delay_ms = capture_delay_ms
+        self.baudrate = baudrate
+        self.fifo_padding = fifo_padding
+        self.settle_us = settle_us
+        self.busy_until = None
+        self.fixed_fifo = None
+        self.fifo = b''
+        self.fifo_pos = 0
+        self.burst_first = True
+        self.capture_started = None
+        self.capture_ready_at = None
+        self.transactions = 0
+        self.bytes_clocked = 0
+        self._bus_debt_us = 0
+        self._index = 0
+        self._cmd = 0
+
+    # Sensor and FIFO model
+
+    def resolution_name(self, code):
+        for name, value in self.Camera.valid_5mp_resolutions.items():
+            if value == code:
+                return name
+        return '640x480'
+
+    def sample_jpeg(self, code):
+        """JPEG bytes for a resolution code: a sample file or a synthetic frame"""
+        name = self.resolution_name(code)
+        data = self.samples.get(name)
+        if data is None and self.samples_dir:
+            try:
+                with open(f'{self.samples_dir}/{name}.jpg', 'rb') as f:
+                    data = f.read()
+            except OSError:
+                data = None
+        if data is None:
+            width, height = name.split('x')
+            data = make_jpeg(int(width) * int(height) // 10)
+        self.samples[name] = data
+        return data
+
+    def load_fifo(self, data):
+        """Fill the FIFO with fixed contents for every following capture"""
+        self.fixed_fifo = bytes(data)
+        self.fifo = self.fixed_fifo
+        self.fifo_pos = 0
+
+    def _capture_delay(self, code):
+        delay = self.capture_delay_ms
+        if isinstance(delay, dict):
+            return delay.get(code, 100)
+        return delay
+
+    def _start_capture(self):
+        code = self.regs[self.Camera.CAM_REG_CAPTURE_RESOLUTION] or self.Camera.RESOLUTION_640X480
+        if self.fixed_fifo is not None:
+            self.fifo = self.fixed_fifo
+        else:
+            self.fifo = self.sample_jpeg(code) + bytes(self.fifo_padding)
+        self.fifo_pos = 0
+        self.burst_first = True
+        self.capture_started = time.ticks_ms()
+        self.capture_ready_at = time.ticks_add(self.capture_started, self._capture_delay(code))
+
+    def _capture_done(self):
+        return self.capture_ready_at is not None and time.ticks_diff(time.ticks_ms(), self.capture_ready_at) >= 0
+
+    def _read_register(self, addr):
+        Camera = self.Camera
+        if addr == Camera.CAM_REG_SENSOR_STATE:
+            state = 0
+            if self.busy_until is None or time.ticks_diff(time.ticks_us(), self.busy_until) >= 0:
+                self.busy_until = None
+                state |= self.STATE_IDLE
+            if self._capture_done():
+                state |= self.STATE_CAPTURE_DONE
+            return state
+        length = len(self.fifo) if self._capture_done() else 0
+        if addr == Camera.FIFO_SIZE1:
+            return length & 0xff
+        if addr == Camera.FIFO_SIZE2:
+            return (length >> 8) & 0xff
+        if addr == Camera.FIFO_SIZE3:
+            return (length >> 16) & 0xff
+        return self.regs[addr]
+
+    def _write_register(self, addr, val):
+        Camera = self.Camera
+        if self.settle_us:
+            self.busy_until = time.ticks_add(time.ticks_us(), self.settle_us)
+        if addr == Camera.ARDUCHIP_FIFO:
+            if val & Camera.FIFO_CLEAR_ID_MASK:
+                self.capture_ready_at = None
+            if val & Camera.FIFO_START_MASK:
+                self._start_capture()
+            return
+        if addr == Camera.CAM_REG_SENSOR_RESET and val & Camera.CAM_SENSOR_RESET_ENABLE:
+            self.capture_ready_at = None
+            return
+        self.regs[addr] = val
+
+    def _fifo_byte(self):
+        if self.fifo_pos < len(self.fifo):
+            val = self.fifo[self.fifo_pos]
+            self.fifo_pos += 1
+            return val
+        return 0x00
+
+    # Bus protocol
+
+    def _throttle(self, nbytes):
+        """Account for bus time and sleep once a millisecond of it has built up"""
+        self.bytes_clocked += nbytes
+        if not self.baudrate:
+            return
+        self._bus_debt_us += nbytes * 8 * 1000000 / self.baudrate
+        if self._bus_debt_us >= 1000:
+            time.sleep_us(int(self._bus_debt_us))
+            self._bus_debt_us = 0
+
+    def begin_frame(self):
+        self._index = 0
+        self.transactions += 1
+
+    def clock(self, out):
+        """Exchange one byte in the current CS frame"""
+        index = self._index
+        self._index += 1
+        if index == 0:
+            self._cmd = out
+            return 0x00
+        cmd = self._cmd
+        if cmd & 0x80:
+            if index == 1:
+                self._write_register(cmd & 0x7F, out)
+            return 0x00
+        if cmd == self.Camera.BURST_FIFO_READ:
+            if index == 1 and self.burst_first:
+                self.burst_first = False
+                return 0x00
+            return self._fifo_byte()
+        if index == 1:
+            return 0x00
+        if cmd == self.Camera.SINGLE_FIFO_READ:
+            return self._fifo_byte()
+        return self._read_register(cmd)
+
+    def in_burst_data(self):
+        return self._cmd == self.Camera.BURST_FIFO_READ and self._index > 0 and not (self._index == 1 and self.burst_first)
+
+    def burst_copy(self, buf):
+        """Fast path for the data phase of a burst read"""
+        n = len(buf)
+        end = min(self.fifo_pos + n, len(self.fifo))
+        chunk = self.fifo[self.fifo_pos:end]
+        buf[:len(chunk)] = chunk
+        for i in range(len(chunk), n):
+            buf[i] = 0x00
+        self.fifo_pos = end
+        self._index += n
+
+    # Transport interface
+
+    def write(self, buf):
+        self.begin_frame()
+        for b in buf:
+            self.clock(b)
+        self._throttle(len(buf))
+
+    def write_readinto(self, tx, rx):
+        self.begin_frame()
+        for i in range(len(tx)):
+            rx[i] = self.clock(tx[i])
+        self._throttle(len(tx))
+
+    def read_into(self, cmd, buf, skip=None):
+        self.begin_frame()
+        for b in cmd:
+            self.clock(b)
+        if skip is not None:
+            for i in range(len(skip)):
+                skip[i] = self.clock(0x00)
+        if self.in_burst_data():
+            self.burst_copy(buf)
+        else:
+            for i in range(len(buf)):
+                buf[i] = self.clock(0x00)
+        self._throttle(len(cmd) + len(buf) + (len(skip) if skip is not None else 0))
+
+
+device = None
+
+
+def get_device():
+    """The shared device behind machine.SPI on the host, created on first use"""
+    global device
+    if device is None:
+        device = SimulatedArducamMega()
+    return device
+
+
+class SimulatedSPI:
+    """machine.SPI stand-in that clocks bytes into the simulated device"""
+
+    MSB = 0
+    LSB = 1
+
+    def __init__(self, bus_id=1, *args, device=None, **kwargs):
+        self.device = device or get_device()
+
+    def write(self, buf):
+        for b in buf:
+            self.device.clock(b)
+        self.device._throttle(len(buf))
+
+    def read(self, nbytes, write=0x00):
+        data = bytes([self.device.clock(write) for _ in range(nbytes)])
+        self.device._throttle(nbytes)
+        return data
+
+    def readinto(self, buf, write=0x00):
+        if self.device.in_burst_data():
+            self.device.burst_copy(buf)
+        else:
+            for i in range(len(buf)):
+                buf[i] = self.device.clock(write)
+        self.device._throttle(len(buf))
+
+    def write_readinto(self, write_buf, read_buf):
+        for i in range(len(write_buf)):
+            read_buf[i] = self.device.clock(write_buf[i])
+        self.device._throttle(len(write_buf))
+
+    def deinit(self):
+        pass
+
+
+class SimulatedPin:
+    """machine.Pin stand-in; the CS pin starts a new device frame when driven low"""
+
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+
+    def __init__(self, pin_id, mode=None, *args, device=None, **kwargs):
+        self.pin_id = pin_id
+        self.device = device
+        self._value = 1
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        v = 1 if v else 0
+        if not v and self._value and (self.device or self.pin_id == SIM_CS_PIN):
+            (self.device or get_device()).begin_frame()
+        self._value = v
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    high = on
+    low = off
+
+
+class SimulatedRTC:
+    def datetime(self, *args):
+        t = time.localtime()
+        return (t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0)
+
+
+class SimulatedWLAN:
+    def __init__(self, interface=0):
+        self._active = False
+
+    def active(self, state=None):
+        if state is not None:
+            self._active = state
+        return self._active
+
+    def connect(self, ssid, password):
+        pass
+
+    def isconnected(self):
+        return True
+
+    def ifconfig(self):
+        return ('127.0.0.1', '255.0.0.0', '127.0.0.1', '127.0.0.1')
+
+
+def make_jpeg(size):
+    """Build a JPEG-framed payload of roughly size bytes"""
+    body = bytes((i * 7 + 3) & 0x7f for i in range(max(size - 4, 0)))
+    return b'\xff\xd8' + body + b'\xff\xd9'
+
+
+def make_camera(fifo=None, device=None, byte_level=True, **kwargs):
+    """Create a Camera wired to a simulated device, returns (camera, device).
+
+    fifo fixes the FIFO contents for every capture. With byte_level the
+    driver goes through SimulatedSPI and a CS pin like on hardware,
+    otherwise the device is used as the transport directly.
+    """
+    from camera import Camera
+    if device is None:
+        device = SimulatedArducamMega(capture_delay_ms=0, baudrate=None)
+    if fifo is not None:
+        device.load_fifo(fifo)
+    if byte_level:
+        cam = Camera(SimulatedSPI(device=device), SimulatedPin(SIM_CS_PIN, device=device), skip_sleep=True, **kwargs)
+    else:
+        cam = Camera(device, None, skip_sleep=True, **kwargs)
+    return cam, device
+
+
+try:
+    import machine
+    HOST = False
+except ImportError:
+    HOST = True
+    _install_host_modules()
@@ -0,0 +1,104 @@
+"""In-memory catalog of saved images, persisted to one small JSON file"""
+
+import json
+import uos
+from time import time
+
+class ImageCatalog:
+    """Saved images in capture order, kept in memory between requests.
+
+    The catalog is reconciled with the filesystem once at boot, then
+    updated by add() and remove() only. Every change bumps a generation
+    counter that is saved with the catalog and used as the ETag, and the
+    JSON listing is encoded once per generation.
+    """
+
+    def __init__(self, path, exclude=('temp.jpg',)):
+        self.path = path
+        self.exclude = exclude
+        self.entries = []  # [name, size, timestamp, resolution], oldest first
+        self.generation = 0
+        self.total_bytes = 0
+        self._json = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self.entries = data['images']
+            self.generation = data['gen']
+        except (OSError, ValueError, KeyError):
+            self.entries = []
+        if self._reconcile():
+            self._changed()
+        self.total_bytes = sum(entry[1] for entry in self.entries)
+        print(f"Image catalog: {len(self.entries)} images, {self.total_bytes} bytes")
+
+    def _reconcile(self):
+        """Drop entries whose file is gone and pick up files saved outside the catalog"""
+        files = [name for name in uos.listdir('/')
+                 if name.lower().endswith('.jpg') and name not in self.exclude]
+        known = set(entry[0] for entry in self.entries)
+        entries = [entry for entry in self.entries if entry[0] in files]
+        found = []
+        for name in files:
+            if name not in known:
+                try:
+                    stat = uos.stat(name)
+                except OSError:
+                    continue
+                found.append([name, stat[6], stat[8], None])
+        found.sort(key=lambda entry: (entry[2], entry[0]))
+        changed = bool(found) or len(entries) != len(self.entries)
+        self.entries = entries + found
+        return changed
+
+    def add(self, name, size, resolution=None, timestamp=None):
+        self.remove(name, save=False)
+        self.entries.append([name, size, timestamp or int(time()), resolution])
+        self.total_bytes += size
+        self._changed()
+
+    def remove(self, name, save=True):
+        for i, entry in enumerate(self.entries):
+            if entry[0] == name:
+                self.entries.pop(i)
+                self.total_bytes -= entry[1]
+                if save:
+                    self._changed()
+                return True
+        return False
+
+    def remove_many(self, names):
+        """Remove several images with a single catalog write"""
+        removed = [name for name in names if self.remove(name, save=False)]
+        if removed:
+            self._changed()
+        return removed
+
+    def names(self):
+        return [entry[0] for entry in self.entries]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def etag(self):
+        return f'"img-{self.generation}"'
+
+    def to_json(self):
+        """The /saved_images listing, encoded once per catalog generation"""
+        if self._json is None:
+            self._json = json.dumps([
+                {'name': name, 'size': size, 'time': timestamp, 'resolution': resolution}
+                for name, size, timestamp, resolution in self.entries])
+        return self._json
+
+    def _changed(self):
+        self.generation += 1
+        self._json = None
+        try:
+            with open(self.path, 'w') as f:
+                json.dump({'gen': self.generation, 'images': self.entries}, f)
+        except OSError as e:
+            print(f"Catalog save error: {e}")
@@ -2,5 +2,43 @@
 WIFI_SSID = "SSID"
 WIFI_PASSWORD = "Password"
 
+# Web server
+SERVER_PORT = 80
+TCP_SEND_BUFFER = 8 * 1460  # lwIP TCP_SND_BUF on the Pico W; caps the file send chunk
+REQUEST_TIMEOUT_MS = 10000  # Wait this long for the first request on a new connection
+REQUEST_HEADER_TIMEOUT_MS = 5000  # A started request must arrive completely within this
+RECV_TIMEOUT_MS = 2000  # Longest gap between reads while a request is arriving
+SEND_TIMEOUT_MS = 5000  # Drop a client that takes no response bytes for this long
+MIN_SEND_RATE = 4096  # Bytes/s a client must take a download at, once past the grace time
+SEND_RATE_GRACE_MS = 3000  # Time spent sending a response before MIN_SEND_RATE applies
+KEEPALIVE_IDLE_MS = 5000  # Close a kept-alive connection after this long without a request
+KEEPALIVE_MAX_REQUESTS = 100  # Requests served on one connection before closing it
+
+# MJPEG live stream (/stream?fps=5&resolution=320x240 overrides these)
+STREAM_FPS = 5  # Target frames per second
+STREAM_MAX_FPS = 15
+STREAM_RESOLUTION = None  # None streams at the current capture resolution
+
 # Image Management Settings
 MAX_SAVED_IMAGES = 3  # Number of images to keep in storage
+MAX_IMAGE_FS_PERCENT = 50  # Share of the filesystem saved images may use
+MIN_FREE_BYTES = 64 * 1024  # Free space always left for spilled captures, presets and the catalog
+SPILL_DIR = 'spill'  # Captures being saved that don't fit a frame buffer, one file each
+MAX_IMAGE_AGE_S = 7 * 24 * 3600  # Delete saved images older than this (0 keeps them); needs a set clock
+RETENTION_INTERVAL_MS = 1000  # How often the server checks for images to delete
+CATALOG_FILE = 'images.json'  # Saved image index, rebuilt from the files if missing
+
+# Frame buffer pool for in-RAM captures, allocated once at boot
+FRAME_POOL_SIZE = 2  # Number of frame buffers
+FRAME_POOL_MAX_RESOLUTION = '640x480'  # Largest resolution the buffers are sized for
+FRAME_POOL_HEAP_PERCENT = 60  # Share of free heap the pool may use
+
+# Camera health checks before a capture
+VERIFY_WINDOW_MS = 5000  # Trust the last successful check for this long
+VERIFY_IDLE_MS = 300000  # Take a full test capture after this long idle
+
+# Saving keeps the last captured image if it is younger than this and no setting changed
+SAVE_MAX_FRAME_AGE_MS = 30000
+
+# Setting presets, all kept in one file
+PRESETS_FILE = 'presets.json'
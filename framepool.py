@@ -0,0 +1,154 @@
+"""Preallocated frame buffers for holding captured JPEGs in RAM"""
+
+import gc
+import uos
+
+# Buffers smaller than this are not worth keeping; captures then stream from the FIFO
+MIN_FRAME_BYTES = 16 * 1024
+
+def estimate_jpeg_size(resolution):
+    """Generous upper bound on the FIFO length of a JPEG at 'WxH' resolution"""
+    width, height = resolution.lower().split('x')
+    return int(width) * int(height) // 5
+
+class Frame:
+    """One pooled buffer; buf[start:end] holds the JPEG after a capture.
+
+    A borrowed frame starts with one reference. hold() adds one for each
+    extra user, e.g. a response still sending it, and the frame only goes
+    back to the pool when every holder has called release().
+    """
+
+    def __init__(self, pool, size):
+        self.pool = pool
+        self.buf = bytearray(size)
+        self.start = 0
+        self.end = 0
+        self.captured_ms = 0
+        self.resolution = None
+        self.refs = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    def data(self):
+        return memoryview(self.buf)[self.start:self.end]
+
+    def hold(self):
+        self.refs += 1
+        return self
+
+    def release(self):
+        self.pool.release(self)
+
+class SpillFile:
+    """A capture that got no frame buffer, written to a file of its own.
+
+    Held and released like a Frame, so a response can keep sending it while
+    newer captures spill to other files. The file is removed when the last
+    holder releases it, unless keep() turned it into a saved image.
+    """
+
+    def __init__(self, name, resolution=None):
+        self.name = name
+        self.size = uos.stat(name)[6]
+        self.resolution = resolution
+        self.temporary = True
+        self.refs = 1
+
+    def __len__(self):
+        return self.size
+
+    def hold(self):
+        self.refs += 1
+        return self
+
+    def release(self):
+        self.refs -= 1
+        if self.refs <= 0 and self.temporary:
+            try:
+                uos.remove(self.name)
+            except OSError:
+                pass
+
+    def keep(self, filename):
+        """Save the image as filename: renamed, or copied while a send still reads it"""
+        if self.refs > 1:
+            buf = bytearray(1024)
+            with open(self.name, 'rb') as src, open(filename, 'wb') as dst:
+                while True:
+                    count = src.readinto(buf)
+                    if not count:
+                        break
+                    dst.write(memoryview(buf)[:count])
+            return
+        uos.rename(self.name, filename)
+        self.name = filename
+        self.temporary = False
+
+def prepare_spill_dir(path):
+    """Create the directory for SpillFiles, removing any left from before a reboot"""
+    try:
+        names = uos.listdir(path)
+    except OSError:
+        uos.mkdir(path)
+        return
+    for name in names:
+        try:
+            uos.remove(f'{path}/{name}')
+        except OSError:
+            pass
+
+class FramePool:
+    """Fixed set of frame buffers allocated once at boot.
+
+    borrow() hands out a free frame or None when all are in use, and
+    release() drops a reference to it; nothing is allocated after
+    construction.
+    """
+
+    def __init__(self, count, size):
+        self.size = size
+        self.frames = [Frame(self, size) for _ in range(count)]
+        self._free = list(self.frames)
+        self.borrows = 0
+        self.misses = 0
+
+    @classmethod
+    def for_resolution(cls, max_resolution, count, heap_percent):
+        """Size the pool from the largest expected frame and the free heap"""
+        gc.collect()
+        budget = gc.mem_free() * heap_percent // 100
+        size = min(estimate_jpeg_size(max_resolution), budget // max(count, 1))
+        if size < MIN_FRAME_BYTES:
+            print(f"Not enough heap for frame buffers ({budget} bytes available)")
+            count = 0
+        pool = cls(count, size)
+        print(f"Frame pool: {count} x {size} bytes")
+        return pool
+
+    def borrow(self):
+        if not self._free:
+            self.misses += 1
+            return None
+        self.borrows += 1
+        frame = self._free.pop()
+        frame.refs = 1
+        return frame
+
+    def release(self, frame):
+        if frame.pool is not self or frame in self._free:
+            return
+        frame.refs -= 1
+        if frame.refs <= 0:
+            frame.start = frame.end = 0
+            self._free.append(frame)
+
+    def stats(self):
+        return {
+            'buffers': len(self.frames),
+            'buffer_size': self.size,
+            'free': len(self._free),
+            'borrows': self.borrows,
+            'misses': self.misses
+        }
@@ -0,0 +1,174 @@
+"""Incremental HTTP/1.x request parser"""
+
+MAX_LINE = 512  # longest request line or kept header line
+MAX_BODY = 512
+
+# Headers the server looks at; any other header is dropped as it is parsed,
+# so cookies and long user agents never have to fit in memory
+KEPT_HEADERS = ('connection', 'content-length', 'transfer-encoding',
+                'accept-encoding', 'if-none-match')
+
+_REQUEST_LINE = 0
+_HEADERS = 1
+_SKIP = 2  # inside an unused header line longer than MAX_LINE
+_BODY = 3
+
+class Request:
+    """A parsed request: method, path, decoded query dict, kept headers and body"""
+
+    def __init__(self, method, path, query_string, version):
+        self.method = method
+        self.path = path
+        self.query_string = query_string
+        self.query = parse_query(query_string)
+        self.version = version
+        self.headers = {}
+        self.body = b''
+
+    def header(self, name, default=None):
+        """Value of a kept header; name must be lower case"""
+        return self.headers.get(name, default)
+
+    def arg(self):
+        """The whole decoded query string, for /gain?20 style endpoints"""
+        return url_decode(self.query_string)
+
+    def keep_alive(self):
+        """HTTP/1.1 keeps the connection unless asked not to, HTTP/1.0 only when asked"""
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+class RequestParser:
+    """Turns received bytes into Requests, however the reads are split.
+
+    feed() takes whatever the socket returned and gives back a Request once
+    one is complete. Only the current line is buffered, not the whole head,
+    and bytes after a complete request are kept for the next one, so
+    pipelined requests come out in order.
+    """
+
+    def __init__(self, max_line=MAX_LINE, max_body=MAX_BODY):
+        self.max_line = max_line
+        self.max_body = max_body
+        self.buf = b''
+        self.reset()
+
+    def reset(self):
+        self.request = None
+        self.state = _REQUEST_LINE
+        self.length = 0
+
+    def started(self):
+        """True once part of the next request has been received"""
+        return bool(self.buf) or self.state != _REQUEST_LINE
+
+    def feed(self, data=b''):
+        """Add received bytes; returns a complete Request, or None until there is one.
+
+        Raises ValueError for a malformed or oversized request.
+        """
+        if data:
+            self.buf += data
+        while True:
+            if self.state == _BODY:
+                if len(self.buf) < self.length:
+                    return None
+                request = self.request
+                request.body = self.buf[:self.length]
+                self.buf = self.buf[self.length:]
+                self.reset()
+                return request
+            end = self.buf.find(b'\n')
+            if end < 0:
+                self._check_partial_line()
+                return None
+            line = self.buf[:end]
+            self.buf = self.buf[end + 1:]
+            if self.state == _SKIP:
+                self.state = _HEADERS
+                continue
+            if len(line) > self.max_line:
+                if not self._unused_header(line):
+                    raise ValueError('Request line too long')
+                continue
+            line = line.decode().rstrip('\r')
+            if self.state == _REQUEST_LINE:
+                # Blank lines before the request line are allowed
+                if line:
+                    self.request = self._parse_request_line(line)
+                    self.state = _HEADERS
+            elif line:
+                self._parse_header(line)
+            else:
+                self.length = self._body_length()
+                self.state = _BODY
+
+    def _check_partial_line(self):
+        """Drop an unused header that is still arriving; reject other long lines"""
+        if self.state == _SKIP:
+            self.buf = b''
+        elif len(self.buf) > self.max_line:
+            if not self._unused_header(self.buf):
+                raise ValueError('Request line too long')
+            self.buf = b''
+            self.state = _SKIP
+
+    def _unused_header(self, data):
+        """True if data starts a header line the server does not keep"""
+        name, sep, _ = data.partition(b':')
+        return (self.state == _HEADERS and sep
+                and name.decode().strip().lower() not in KEPT_HEADERS)
+
+    def _parse_request_line(self, line):
+        parts = line.split(' ')
+        if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+            raise ValueError('Malformed request line')
+        method, target, version = parts
+        path, _, query_string = target.partition('?')
+        return Request(method, path, query_string, version)
+
+    def _parse_header(self, line):
+        name, sep, value = line.partition(':')
+        if not sep:
+            raise ValueError('Malformed header line')
+        name = name.strip().lower()
+        if name in KEPT_HEADERS:
+            self.request.headers[name] = value.strip()
+
+    def _body_length(self):
+        headers = self.request.headers
+        if 'transfer-encoding' in headers:
+            raise ValueError('Chunked request bodies are not supported')
+        length = int(headers.get('content-length', 0))
+        if length < 0 or length > self.max_body:
+            raise ValueError('Request body too large')
+        return length
+
+def parse_query(param):
+    """Split 'a=1&b=2' into a dict; keys without a value map to ''"""
+    query = {}
+    for pair in param.split('&'):
+        if pair:
+            key, _, value = pair.partition('=')
+            query[url_decode(key)] = url_decode(value)
+    return query
+
+def url_decode(value):
+    """Undo the %XX and '+' escaping of a query-string value"""
+    if '%' not in value and '+' not in value:
+        return value
+    parts = value.replace('+', ' ').split('%')
+    out = bytearray(parts[0].encode())
+    for part in parts[1:]:
+        try:
+            code = int(part[:2], 16) if len(part) >= 2 else None
+        except ValueError:
+            code = None
+        if code is None:
+            out.extend(b'%' + part.encode())
+        else:
+            out.append(code)
+            out.extend(part[2:].encode())
+    return out.decode()
@@ -0,0 +1,220 @@
+"""Mixed-traffic load test for the web server, run from a computer.
+
+Against a Pico on the network, or a simulated camera server started in
+this process:
+
+    python loadtest.py --host 192.168.1.50
+    python loadtest.py --sim --clients 8 --duration 20 --json load.json
+    python loadtest.py --sim --keep-alive --path /storage_info
+
+Each client repeatedly requests a path picked from TRAFFIC by weight, so
+captures, JSON polls, downloads and page loads overlap like several open
+browser tabs. By default every request opens a new connection; with
+--keep-alive each client reuses one connection until the server closes
+it. --path sends only that path instead of the mix. Latency is measured from sending the request (including any connect)
+to the end of the response and reported per path as p50/p99/max.
+"""
+
+import sys
+import json
+import random
+import asyncio
+import threading
+import time
+
+SIM_PORT = 8080
+
+# (path, weight): roughly what a couple of browser tabs send
+TRAFFIC = (
+    ('/capture', 2),
+    ('/saved_images', 4),
+    ('/storage_info', 3),
+    ('/list_presets', 3),
+    ('/health', 1),
+    ('/', 1),
+)
+
+
+def percentile(values, percent):
+    if not values:
+        return 0
+    values = sorted(values)
+    index = min(len(values) - 1, int(len(values) * percent / 100))
+    return values[index]
+
+
+async def fetch(host, port, path, timeout):
+    """GET path on a fresh connection; returns (status, body bytes)"""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    status = response.split(b' ', 2)[1] if response.startswith(b'HTTP/') else b'000'
+    return int(status), len(response)
+
+
+class KeepAliveClient:
+    """One reused connection, reopened whenever the server closes it"""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+        self.connections = 0
+
+    async def fetch(self, path):
+        """GET path on the open connection; returns (status, response size)"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout)
+            self.connections += 1
+        try:
+            self.writer.write(f'GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n'.encode())
+            await self.writer.drain()
+            head = await asyncio.wait_for(self.reader.readuntil(b'\r\n\r\n'), self.timeout)
+            headers = head.decode().lower()
+            length = None
+            for line in headers.split('\r\n'):
+                name, _, value = line.partition(':')
+                if name == 'content-length':
+                    length = int(value)
+            if length is None:
+                body = await asyncio.wait_for(self.reader.read(), self.timeout)
+            else:
+                body = await asyncio.wait_for(self.reader.readexactly(length), self.timeout)
+            if length is None or 'connection: close' in headers:
+                self.close()
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            self.close()
+            raise OSError('connection lost')
+        return int(head.split(b' ', 2)[1]), len(head) + len(body)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def client(host, port, deadline, rng, results, timeout, keep_alive=False, traffic=TRAFFIC):
+    paths = [path for path, weight in traffic for _ in range(weight)]
+    conn = KeepAliveClient(host, port, timeout) if keep_alive else None
+    while time.monotonic() < deadline:
+        path = rng.choice(paths)
+        start = time.monotonic()
+        try:
+            if conn:
+                status, size = await conn.fetch(path)
+            else:
+                status, size = await fetch(host, port, path, timeout)
+            error = status >= 400
+        except (OSError, asyncio.TimeoutError):
+            error, size = True, 0
+        entry = results.setdefault(path, {'ms': [], 'errors': 0, 'bytes': 0})
+        entry['ms'].append((time.monotonic() - start) * 1000)
+        entry['errors'] += error
+        entry['bytes'] += size
+    if conn:
+        conn.close()
+
+
+async def run_load(host, port, clients, duration, timeout=30, seed=1, keep_alive=False,
+                   traffic=TRAFFIC):
+    results = {}
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(client(host, port, deadline, random.Random(seed + i), results,
+                                  timeout, keep_alive, traffic)
+                           for i in range(clients)))
+    return results
+
+
+def summarize(results, duration):
+    summary = {}
+    every = []
+    for path, entry in sorted(results.items()):
+        ms = entry['ms']
+        every.extend(ms)
+        summary[path] = {
+            'requests': len(ms),
+            'errors': entry['errors'],
+            'p50_ms': round(percentile(ms, 50), 1),
+            'p99_ms': round(percentile(ms, 99), 1),
+            'max_ms': round(max(ms), 1),
+        }
+    summary['all'] = {
+        'requests': len(every),
+        'errors': sum(entry['errors'] for entry in results.values()),
+        'p50_ms': round(percentile(every, 50), 1),
+        'p99_ms': round(percentile(every, 99), 1),
+        'max_ms': round(max(every), 1) if every else 0,
+        'requests_per_s': round(len(every) / duration, 1),
+    }
+    return summary
+
+
+def print_summary(summary, label):
+    print(f'\n=== Load test ({label}) ===')
+    print(f"{'path':<16}{'requests':>9}{'errors':>8}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for path, row in summary.items():
+        print(f"{path:<16}{row['requests']:>9}{row['errors']:>8}"
+              f"{row['p50_ms']:>9}{row['p99_ms']:>9}{row['max_ms']:>9}")
+    print(f"{summary['all']['requests_per_s']} requests/s")
+
+
+def start_sim_server(port):
+    """Run the web server on a simulated camera in a background thread"""
+    import camera_sim
+    import webserver
+    ready = threading.Event()
+
+    def run():
+        webserver.camera_manager = webserver.CameraManager()
+
+        async def main():
+            task = asyncio.create_task(webserver.serve(port))
+            await asyncio.sleep(0.2)
+            # The camera starts on the owner task; measure from once it is up
+            await webserver.camera_manager.owner.call(lambda: None)
+            ready.set()
+            await task
+
+        asyncio.run(main())
+
+    threading.Thread(target=run, daemon=True).start()
+    if not ready.wait(30):
+        raise RuntimeError('Simulated server did not start')
+
+
+def main(args):
+    def option(name, default):
+        return type(default)(args[args.index(name) + 1]) if name in args else default
+
+    clients = option('--clients', 4)
+    duration = option('--duration', 10.0)
+    output = option('--json', '')
+    keep_alive = '--keep-alive' in args
+    path = option('--path', '')
+    traffic = ((path, 1),) if path else TRAFFIC
+    if '--sim' in args:
+        host, port, label = '127.0.0.1', option('--port', SIM_PORT), 'simulated'
+        start_sim_server(port)
+    else:
+        host, port = option('--host', '192.168.4.1'), option('--port', 80)
+        label = host
+    results = asyncio.run(run_load(host, port, clients, duration, keep_alive=keep_alive,
+                                   traffic=traffic))
+    summary = summarize(results, duration)
+    mode = 'keep-alive' if keep_alive else 'new connection per request'
+    print_summary(summary, f'{label}, {clients} clients, {duration:g} s, {mode}')
+    if output:
+        with open(output, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f'Saved results to {output}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
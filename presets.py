@@ -0,0 +1,93 @@
+"""Named setting presets kept in one JSON file with an in-memory index"""
+
+import json
+import uos
+
+MAX_NAME_LENGTH = 32
+
+class PresetStore:
+    """All presets live in a single file that is read once at boot.
+
+    names() and get() are served from memory; save() and delete() rewrite
+    the file through a temporary copy so a power cut cannot truncate it.
+    """
+
+    def __init__(self, path, legacy_dir=None):
+        self.path = path
+        self.presets = {}
+        self.load()
+        if legacy_dir:
+            self._import_legacy(legacy_dir)
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                self.presets = json.load(f)
+        except OSError:
+            self.presets = {}
+        except ValueError as e:
+            print(f"Preset file unreadable, starting empty: {e}")
+            self.presets = {}
+        print(f"Loaded {len(self.presets)} presets")
+
+    def names(self):
+        return sorted(self.presets)
+
+    def get(self, name):
+        return self.presets.get(name)
+
+    def save(self, name, settings):
+        if not name or len(name) > MAX_NAME_LENGTH or '/' in name:
+            raise ValueError(f"Invalid preset name: {name}")
+        self.presets[name] = dict(settings)
+        self._write()
+
+    def delete(self, name):
+        if self.presets.pop(name, None) is None:
+            return False
+        self._write()
+        return True
+
+    def _write(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.presets, f)
+        try:
+            uos.remove(self.path)
+        except OSError:
+            pass
+        uos.rename(tmp, self.path)
+
+    def _import_legacy(self, dirname):
+        """Move presets/<name>.txt files from older versions into the store.
+
+        Only gain and exposure were saved from the registers they are set
+        through, and the old loader read them as hex, so only those are
+        kept. A file that adds no preset is left where it is.
+        """
+        try:
+            files = uos.listdir(dirname)
+        except OSError:
+            return
+        imported = 0
+        for filename in files:
+            if not filename.endswith('.txt'):
+                continue
+            path = f'{dirname}/{filename}'
+            settings = {}
+            try:
+                with open(path) as f:
+                    for line in f:
+                        key, _, value = line.strip().partition('=')
+                        if key in ('gain', 'exposure'):
+                            settings[key] = int(value, 16)
+                if not settings or filename[:-4] in self.presets:
+                    continue
+                self.presets[filename[:-4]] = settings
+                imported += 1
+                uos.remove(path)
+            except (OSError, ValueError) as e:
+                print(f"Skipping legacy preset {filename}: {e}")
+        if imported:
+            self._write()
+            print(f"Imported {imported} legacy presets")
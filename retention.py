@@ -0,0 +1,131 @@
+"""Retention policy for saved images: count, byte budget and age"""
+
+import uos
+from time import localtime, time, ticks_ms, ticks_diff
+
+# Nothing here sets the clock, and without NTP or a host setting it the Pico
+# W's RTC starts again at 2021-01-01 on every boot. Times before this year are
+# taken to come from such a clock and are not used for the age limit.
+MIN_SYNCED_YEAR = 2024
+
+def clock_synced(timestamp):
+    """True if a time() reading looks like it came from a set clock"""
+    return localtime(timestamp)[0] >= MIN_SYNCED_YEAR
+
+class RetentionManager:
+    """Deletes the oldest saved images once they exceed the policy.
+
+    Images may number at most max_count, use at most max_fs_percent of
+    the filesystem while leaving min_free_bytes free, and be no older than
+    max_age_s (0 disables the age limit). Ages are only checked while the
+    clock is set, and only for images saved while it was. The newest image
+    is always kept.
+    schedule() only marks a sweep as due; sweep_pending() does the
+    deleting and is called by the server between requests.
+    """
+
+    def __init__(self, catalog, max_count, max_fs_percent=50, min_free_bytes=0,
+                 max_age_s=0, batch=4, root='/'):
+        self.catalog = catalog
+        self.max_count = max_count
+        self.max_fs_percent = max_fs_percent
+        self.min_free_bytes = min_free_bytes
+        self.max_age_s = max_age_s
+        self.batch = batch
+        self.root = root
+        self.pending = True  # check once after boot
+        self.sweeps = 0
+        self.deleted = 0
+        self.reclaimed = 0
+        self.last_sweep = None
+
+    def schedule(self):
+        self.pending = True
+
+    def byte_budget(self):
+        """Bytes the saved images may use, from the filesystem's current size and free space"""
+        fs_info = uos.statvfs(self.root)
+        total = fs_info[0] * fs_info[2]
+        free = fs_info[0] * fs_info[3]
+        return min(total * self.max_fs_percent // 100,
+                   self.catalog.total_bytes + free - self.min_free_bytes)
+
+    def select(self, now=None):
+        """(name, size) of images to delete, oldest first, to bring the catalog within the policy"""
+        entries = self.catalog.entries
+        if len(entries) < 2:
+            return []
+        if now is None:
+            now = time()
+        budget = self.byte_budget()
+        count = len(entries)
+        used = self.catalog.total_bytes
+        check_age = self.max_age_s and clock_synced(now)
+        victims = []
+        for name, size, timestamp, _ in entries[:-1]:
+            expired = (check_age and clock_synced(timestamp)
+                       and now - timestamp > self.max_age_s)
+            if not (expired or count > self.max_count or used > budget):
+                break
+            victims.append((name, size))
+            count -= 1
+            used -= size
+        return victims
+
+    def sweep(self, limit=None):
+        """Delete up to limit images over the policy; returns bytes reclaimed"""
+        start = ticks_ms()
+        victims = self.select()
+        if limit is not None:
+            del victims[limit:]
+        reclaimed = 0
+        deleted = 0
+        for name, size in victims:
+            try:
+                uos.remove(name)
+                reclaimed += size
+                deleted += 1
+            except OSError as e:
+                print(f'Failed to remove {name}: {e}')
+        # A file that could not be removed is most likely gone already
+        self.catalog.remove_many([name for name, _ in victims])
+        self.sweeps += 1
+        self.deleted += deleted
+        self.reclaimed += reclaimed
+        self.last_sweep = {
+            'deleted': deleted,
+            'reclaimed_bytes': reclaimed,
+            'ms': ticks_diff(ticks_ms(), start)
+        }
+        if deleted:
+            print(f'Retention sweep removed {deleted} images, reclaimed {reclaimed} bytes')
+        return reclaimed
+
+    def sweep_pending(self):
+        """Run a bounded sweep if one is due; True if images were deleted"""
+        if not self.pending:
+            return False
+        try:
+            reclaimed = self.sweep(self.batch)
+        except Exception as e:
+            print(f'Retention sweep error: {e}')
+            self.pending = False
+            return False
+        # Keep going on later calls while there is more over the limit
+        self.pending = self.last_sweep['deleted'] == self.batch
+        return reclaimed > 0
+
+    def stats(self):
+        return {
+            'images': len(self.catalog),
+            'image_bytes': self.catalog.total_bytes,
+            'max_count': self.max_count,
+            'byte_budget': self.byte_budget(),
+            'max_age_s': self.max_age_s,
+            'clock_synced': clock_synced(time()),
+            'pending': self.pending,
+            'sweeps': self.sweeps,
+            'deleted': self.deleted,
+            'reclaimed_bytes': self.reclaimed,
+            'last_sweep': self.last_sweep
+        }
@@ -0,0 +1,613 @@
+"""Tests that run on a computer, with camera_sim standing in for the Pico
+
+python -m unittest test_host   (or: python -m pytest test_host.py)
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import camera_sim  # provides machine/uos/time shims before camera is imported
+import camera
+import webserver
+from camera import Camera, JpegFramer
+from camera_settings import SettingsEngine
+from presets import PresetStore
+from retention import RetentionManager
+from httprequest import RequestParser, MAX_LINE, parse_query, url_decode
+
+GET = b'GET /capture?res=640x480&x=%41 HTTP/1.1\r\nHost: pico\r\nConnection: keep-alive\r\n\r\n'
+POST = b'POST /apply_settings HTTP/1.1\r\nContent-Length: 13\r\n\r\n{"gain": 10}\n'
+
+def feed_all(parser, pieces):
+    """Feed pieces in order, returning every request that came out"""
+    requests = []
+    for piece in pieces:
+        request = parser.feed(piece)
+        while request is not None:
+            requests.append(request)
+            request = parser.feed()
+    return requests
+
+class Collector:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+
+class FakeReader:
+    def __init__(self, data):
+        self.data = data
+
+    async def read(self, count=-1):
+        if count < 0:
+            count = len(self.data)
+        data, self.data = self.data[:count], self.data[count:]
+        return data
+
+class FakeWriter(Collector):
+    """Stream writer that can drop the connection after a number of drains"""
+
+    def __init__(self, drains=None):
+        super().__init__()
+        self.drains = drains
+        self.closed = False
+
+    async def drain(self):
+        if self.drains is not None:
+            self.drains -= 1
+            if self.drains < 0:
+                raise OSError('client went away')
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+def parse_responses(data):
+    """Split bytes holding several HTTP responses, following each one's framing"""
+    responses = []
+    while data:
+        head, _, data = data.partition(b'\r\n\r\n')
+        lines = head.decode().split('\r\n')
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        status = int(lines[0].split(' ')[1])
+        if status == 304:
+            body = b''
+        elif 'content-length' in headers:
+            length = int(headers['content-length'])
+            body, data = data[:length], data[length:]
+        elif headers.get('transfer-encoding') == 'chunked':
+            body = b''
+            while True:
+                size, _, data = data.partition(b'\r\n')
+                size = int(size, 16)
+                if not size:
+                    data = data[2:]
+                    break
+                body += data[:size]
+                data = data[size + 2:]
+        else:
+            body, data = data, b''
+        responses.append((status, headers, body))
+    return responses
+
+class ServerTestCase(unittest.TestCase):
+    """A CameraManager on the simulated camera, working in a scratch directory"""
+
+    def setUp(self):
+        cwd = os.getcwd()
+        scratch = tempfile.TemporaryDirectory()
+        os.chdir(scratch.name)
+        self.addCleanup(scratch.cleanup)
+        self.addCleanup(os.chdir, cwd)
+        for patcher in (mock.patch.object(webserver, 'CAMERA_SETTLE_MS', 0),
+                        mock.patch.object(Camera, 'INIT_SETTLE_MS', 0),
+                        mock.patch.object(camera_sim.get_device(), 'capture_delay_ms', 20)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+        self.manager = webserver.camera_manager = webserver.CameraManager()
+
+    def run_server(self, test):
+        """Run the coroutine function test with the owner task running"""
+        async def main():
+            self.manager.owner = webserver.CameraOwner()
+            owner = asyncio.create_task(self.manager.owner.run())
+            try:
+                return await test()
+            finally:
+                owner.cancel()
+        return asyncio.run(main())
+
+    async def exchange(self, data):
+        """Serve one connection that sends data; returns the parsed responses"""
+        writer = FakeWriter()
+        await webserver.handle_client(FakeReader(data), writer)
+        return parse_responses(bytes(writer.data))
+
+class NotModifiedTest(ServerTestCase):
+
+    def check_not_modified(self, path, headers, version='HTTP/1.1', connection=''):
+        request = f'GET {path} {version}\r\n{connection}'.encode()
+        data = (request + headers + b'\r\n'
+                + request + b'Connection: close\r\n\r\n')
+        responses = self.run_server(lambda: self.exchange(data))
+        self.assertEqual([r[0] for r in responses], [304, 200])
+        status, head, body = responses[0]
+        self.assertNotIn('content-length', head)
+        self.assertNotIn('transfer-encoding', head)
+        self.assertEqual(head['connection'], 'keep-alive')
+        return responses[1]
+
+    def test_saved_images(self):
+        etag = self.manager.catalog.etag()
+        headers = f'If-None-Match: {etag}\r\n'.encode()
+        _, head, body = self.check_not_modified('/saved_images', headers)
+        self.assertEqual(head['etag'], etag)
+        json.loads(body)
+        self.check_not_modified('/saved_images', headers, 'HTTP/1.0', 'Connection: keep-alive\r\n')
+
+    def test_page(self):
+        if webserver.PAGE_GZ is None:
+            self.skipTest('webasset.py not built')
+        headers = f'Accept-Encoding: gzip\r\nIf-None-Match: {webserver.PAGE_ETAG}\r\n'.encode()
+        _, head, body = self.check_not_modified('/', headers)
+        self.assertIn(b'<html', body.lower())  # no Accept-Encoding: the plain page
+
+class StreamTest(ServerTestCase):
+
+    async def stream(self, query, drains, delay=0):
+        """A /stream client that goes away after drains writes"""
+        await asyncio.sleep(delay)
+        writer = FakeWriter(drains)
+        request = f'GET /stream?{query} HTTP/1.1\r\n\r\n'.encode()
+        await webserver.handle_client(FakeReader(request), writer)
+        return bytes(writer.data)
+
+    def resolution(self):
+        return self.manager.settings.desired.get('resolution')
+
+    def test_overlapping_streams_restore_once(self):
+        async def test():
+            await self.manager.owner.call(self.manager.initialize_camera)
+            first = asyncio.create_task(self.stream('fps=50&resolution=320x240', 6))
+            second = asyncio.create_task(self.stream('fps=50&resolution=1280x720', 3000, 0.05))
+            await first
+            during = (self.resolution(), self.manager.stream_stats['active'])
+            await second
+            return during
+        self.assertEqual(self.run_server(test), ('1280x720', 1))
+        self.assertEqual(self.resolution(), '640x480')
+        self.assertIsNone(self.manager.stream_restore)
+        self.assertEqual(self.manager.stream_stats['active'], 0)
+
+    def test_resolution_changed_during_stream_is_kept(self):
+        async def test():
+            stream = asyncio.create_task(self.stream('fps=50&resolution=320x240', 20))
+            await asyncio.sleep(0.1)
+            await self.manager.owner.call(self.manager.set_resolution, '1600x1200')
+            await stream
+        self.run_server(test)
+        self.assertEqual(self.resolution(), '1600x1200')
+
+    def test_bad_parameters_rejected(self):
+        async def test():
+            for query in ('fps=nan', 'fps=inf', 'fps=-inf', 'fps=abc', 'resolution=1x1'):
+                request = f'GET /stream?{query} HTTP/1.1\r\n\r\n'.encode()
+                self.assertEqual([r[0] for r in await self.exchange(request)], [400], query)
+                self.assertEqual(self.manager.stream_stats['active'], 0, query)
+            # Accounting is intact: the next override is restored again
+            await self.stream('fps=50&resolution=320x240', 4)
+        self.run_server(test)
+        self.assertEqual(self.resolution(), '640x480')
+        self.assertEqual(self.manager.stream_stats['active'], 0)
+
+def reference_frame(data):
+    """What a per-byte scan keeps: SOI through the first EOI after it"""
+    start = data.find(b'\xff\xd8')
+    if start < 0:
+        return b'', len(data), 0
+    end = data.find(b'\xff\xd9', start + 2)
+    if end < 0:
+        return data[start:], start, 0
+    return data[start:end + 2], start, len(data) - end - 2
+
+def frame_chunks(data, sizes):
+    """Run data through a JpegFramer in chunks of the given sizes, reusing one buffer.
+
+    Like Camera.stream_jpg, reading stops once the framer reports EOI.
+    """
+    out = Collector()
+    framer = JpegFramer(out)
+    buf = bytearray(max(sizes))
+    offset = 0
+    for size in sizes:
+        chunk = data[offset:offset + size]
+        buf[:len(chunk)] = chunk
+        offset += len(chunk)
+        if framer.feed(buf, len(chunk), len(data) - offset):
+            break
+    return bytes(out.data), framer
+
+class SettingsEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.device = camera_sim.SimulatedArducamMega(settle_us=0)
+        self.cam = Camera(self.device, skip_sleep=True)
+        self.engine = SettingsEngine()
+
+    def apply_many(self, changes):
+        return asyncio.run(self.engine.apply_many(self.cam, changes))
+
+    def assert_rejected(self, changes):
+        writes = self.cam.reg_writes
+        desired = dict(self.engine.desired)
+        version = self.engine.version
+        with self.assertRaises(ValueError):
+            self.apply_many(changes)
+        self.assertEqual(self.cam.reg_writes, writes, changes)
+        self.assertEqual(self.engine.desired, desired)
+        self.assertEqual(self.engine.version, version)
+
+    def test_batch(self):
+        written = self.apply_many({'brightness': '3', 'whitebalance': 'Sunny', 'gain': '0x10'})
+        self.assertEqual(written, 3)
+        self.assertEqual(self.engine.desired['white_balance'], 'sunny')
+        self.assertEqual(self.engine.desired['gain'], 16)
+        self.assertEqual(self.device.regs[self.cam.CAM_REG_BRIGHTNESS_CONTROL], 3)
+        self.assertEqual(self.engine.version, 1)
+        # Unchanged values are not written again
+        self.assertEqual(self.apply_many({'brightness': 3}), 0)
+
+    def test_invalid_batch_writes_nothing(self):
+        self.assert_rejected({'brightness': 3, 'sharpness': 1})
+        self.assert_rejected({'brightness': 3, 'gain': 'abc'})
+        self.assert_rejected({'brightness': 3, 'gain': 256})
+        self.assert_rejected({'brightness': 3, 'resolution': '999x1'})
+        self.assert_rejected({'brightness': 3, 'white_balance': 'moonlight'})
+        self.assert_rejected({'brightness': 3, 'focus': 0x10000})
+
+    def test_auto_focus_rejected_before_writing(self):
+        self.cam.camera_idx = '3MP'
+        self.assert_rejected({'brightness': 3, 'autofocus': 'on'})
+        self.assertEqual(self.apply_many({'brightness': 3, 'autofocus': 'off'}), 1)
+        self.assertIs(self.engine.desired['auto_focus'], False)
+
+class RequestParserTest(unittest.TestCase):
+
+    def check_get(self, request):
+        self.assertEqual(request.method, 'GET')
+        self.assertEqual(request.path, '/capture')
+        self.assertEqual(request.query, {'res': '640x480', 'x': 'A'})
+        self.assertEqual(request.header('connection'), 'keep-alive')
+        self.assertIsNone(request.header('host'))  # not a kept header
+        self.assertTrue(request.keep_alive())
+
+    def test_split_at_every_byte(self):
+        for data in (GET, POST):
+            for split in range(len(data) + 1):
+                parser = RequestParser()
+                requests = feed_all(parser, (data[:split], data[split:]))
+                self.assertEqual(len(requests), 1, split)
+                self.assertFalse(parser.started())
+                if data is GET:
+                    self.check_get(requests[0])
+                else:
+                    self.assertEqual(requests[0].body, b'{"gain": 10}\n')
+
+    def test_one_byte_at_a_time(self):
+        parser = RequestParser()
+        data = GET + POST
+        requests = feed_all(parser, [data[i:i + 1] for i in range(len(data))])
+        self.assertEqual([r.method for r in requests], ['GET', 'POST'])
+        self.check_get(requests[0])
+
+    def test_pipelined(self):
+        parser = RequestParser()
+        request = parser.feed(GET + POST + GET[:10])
+        self.check_get(request)
+        request = parser.feed()
+        self.assertEqual(request.body, b'{"gain": 10}\n')
+        self.assertIsNone(parser.feed())
+        self.assertTrue(parser.started())
+        self.check_get(parser.feed(GET[10:]))
+
+    def test_blank_lines_before_request(self):
+        self.check_get(RequestParser().feed(b'\r\n\r\n' + GET))
+
+    def test_overlong_unused_header_is_dropped(self):
+        cookie = b'Cookie: ' + b'a' * (4 * MAX_LINE) + b'\r\n'
+        data = GET[:-2] + cookie + b'If-None-Match: "img-3"\r\n\r\n'
+        for size in (1, 7, MAX_LINE, len(data)):
+            parser = RequestParser()
+            requests = feed_all(parser, [data[i:i + size] for i in range(0, len(data), size)])
+            self.assertEqual(len(requests), 1, size)
+            self.check_get(requests[0])
+            self.assertEqual(requests[0].header('if-none-match'), '"img-3"')
+            self.assertNotIn('cookie', requests[0].headers)
+
+    def test_overlong_kept_header_is_rejected(self):
+        data = GET[:-2] + b'If-None-Match: ' + b'a' * (2 * MAX_LINE) + b'\r\n\r\n'
+        for size in (1, len(data)):
+            parser = RequestParser()
+            with self.assertRaises(ValueError):
+                feed_all(parser, [data[i:i + size] for i in range(0, len(data), size)])
+
+    def test_overlong_request_line_is_rejected(self):
+        with self.assertRaises(ValueError):
+            RequestParser().feed(b'GET /' + b'a' * (2 * MAX_LINE))
+
+    def test_malformed(self):
+        for data in (b'GET /\r\n\r\n', b'GET / SPDY/3\r\n\r\n',
+                     b'GET / HTTP/1.1\r\nno colon\r\n\r\n',
+                     b'POST / HTTP/1.1\r\nContent-Length: 100000\r\n\r\n',
+                     b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n'):
+            with self.assertRaises(ValueError):
+                RequestParser().feed(data)
+
+    def test_keep_alive(self):
+        def keep_alive(data):
+            return RequestParser().feed(data).keep_alive()
+        self.assertTrue(keep_alive(b'GET / HTTP/1.1\r\n\r\n'))
+        self.assertFalse(keep_alive(b'GET / HTTP/1.1\r\nConnection: close\r\n\r\n'))
+        self.assertFalse(keep_alive(b'GET / HTTP/1.0\r\n\r\n'))
+        self.assertTrue(keep_alive(b'GET / HTTP/1.0\r\nConnection: Keep-Alive\r\n\r\n'))
+
+class UrlDecodeTest(unittest.TestCase):
+
+    def test_url_decode(self):
+        cases = {
+            '': '',
+            'plain': 'plain',
+            'a+b': 'a b',
+            'a%20b': 'a b',
+            '%2B': '+',
+            '%2b%2f': '+/',
+            '100%': '100%',
+            '%4': '%4',
+            '%zz1': '%zz1',
+            '%%41': '%A',
+            '%C3%A9t%C3%A9': 'été',
+            'my+preset%21': 'my preset!',
+        }
+        for value, expected in cases.items():
+            self.assertEqual(url_decode(value), expected, value)
+
+    def test_parse_query(self):
+        self.assertEqual(parse_query(''), {})
+        self.assertEqual(parse_query('a=1&&b&c=x%3Dy&d=a+b'),
+                         {'a': '1', 'b': '', 'c': 'x=y', 'd': 'a b'})
+
+    def test_arg(self):
+        request = RequestParser().feed(b'GET /save_preset?my%20day+1 HTTP/1.1\r\n\r\n')
+        self.assertEqual(request.arg(), 'my day 1')
+
+class JpegFramerTest(unittest.TestCase):
+    # 0xFF bytes all around the markers, so every split of them gets tried
+    FIFO = (b'\x00\xff\x12\xff\xff\xd8\xff\xe0\x00\x10JFIF\xff\x00\xff\xd8'
+            + bytes(range(256)) + b'\xff\xff\xd9\x00\xff\xd9\xff\x00\x00')
+
+    def check(self, data, sizes):
+        expected, leading, trailing = reference_frame(data)
+        out, framer = frame_chunks(data, sizes)
+        self.assertEqual(out, expected, sizes)
+        self.assertEqual(framer.written, len(expected))
+        self.assertEqual(framer.leading, leading)
+        if expected.endswith(b'\xff\xd9'):
+            self.assertTrue(framer.done)
+            self.assertEqual(framer.trailing, trailing)
+
+    def test_every_two_way_split(self):
+        data = self.FIFO
+        for split in range(1, len(data)):
+            self.check(data, (split, len(data) - split))
+
+    def test_every_chunk_size(self):
+        data = self.FIFO
+        for size in range(1, len(data) + 1):
+            self.check(data, [size] * (len(data) // size) + [len(data) % size or size])
+
+    def test_markers_at_chunk_edges(self):
+        # SOI and EOI each split between two chunks, with a carried 0xFF
+        data = b'\x00\xff' + b'\xd8\x01\x02\xff' + b'\xd9\x00'
+        self.check(data, (2, 4, 2))
+        out, framer = frame_chunks(data, (2, 4, 2))
+        self.assertEqual(out, b'\xff\xd8\x01\x02\xff\xd9')
+        self.assertEqual((framer.leading, framer.trailing), (1, 1))
+
+    def test_no_eoi(self):
+        data = b'\x00\xff\xd8\x01\x02\x03'
+        out, framer = frame_chunks(data, (3, 3))
+        self.assertEqual(out, data[1:])
+        self.assertFalse(framer.done)
+
+    def test_no_soi(self):
+        out, framer = frame_chunks(b'\x00\xff\x00\xff', (1, 1, 1, 1))
+        self.assertEqual(out, b'')
+        self.assertFalse(framer.started)
+        self.assertEqual(framer.leading, 4)
+
+    def test_simulated_capture(self):
+        """The driver, reading a simulated FIFO in burst blocks, keeps what the reference does"""
+        device = camera_sim.get_device()
+        cam = Camera(device, skip_sleep=True)
+        block = len(cam._fifo_buf)
+        # SOI split across the first two reads, EOI across two later ones
+        body = bytes(range(256)) * (3 * block // 256)
+        data = (b'\x00' * (block - 1) + b'\xff\xd8' + body[:block - 3] + b'\xff\x00'
+                + body[:block - 3] + b'\xff\xd9' + b'\x00' * 40)
+        expected = reference_frame(data)[0]
+        out = Collector()
+        device.load_fifo(data)
+        try:
+            cam.capture_jpg()
+            self.assertEqual(cam.stream_jpg(out), len(expected))
+        finally:
+            device.fixed_fifo = None
+        self.assertEqual(bytes(out.data), expected)
+
+class ReadJpgIntoTest(unittest.TestCase):
+    """Camera.read_jpg_into as on MicroPython, where bytearray has no find()"""
+
+    def setUp(self):
+        self.copies = []
+        def tracking_bytes(data):
+            self.copies.append(len(data))
+            return bytes(data)
+        camera._BYTEARRAY_FIND = False
+        camera.bytes = tracking_bytes
+        self.device = camera_sim.get_device()
+        self.cam = Camera(self.device, skip_sleep=True)
+        self.block = self.cam.burst_size
+
+    def tearDown(self):
+        camera._BYTEARRAY_FIND = hasattr(bytearray, 'find')
+        del camera.bytes
+        self.device.fixed_fifo = None
+
+    def read(self, data):
+        self.device.load_fifo(data)
+        self.cam.capture_jpg()
+        buf = bytearray(len(data) + 16)
+        self.copies.clear()
+        span = self.cam.read_jpg_into(buf)
+        self.assertTrue(max(self.copies, default=0) <= self.block, self.copies)
+        return bytes(buf[span[0]:span[1]])
+
+    def test_matches_reference(self):
+        block = self.block
+        # 0xFF is always followed by 0x00 in this body, as in JPEG entropy data
+        body = bytes(range(256)) * 40
+        for leading, padding in ((0, 0), (7, 8), (block - 1, 8), (2 * block, block - 1),
+                                 (3, 3 * block), (block + 5, 5 * block + 1)):
+            data = b'\x00' * leading + b'\xff\xd8' + body + b'\xff\xd9' + b'\x00' * padding
+            self.assertEqual(self.read(data), reference_frame(data)[0], (leading, padding))
+
+    def test_no_eoi_keeps_everything_after_soi(self):
+        data = b'\x00' * 9 + b'\xff\xd8' + bytes(range(256)) * 8
+        self.assertEqual(self.read(data), data[9:])
+
+    def test_no_soi(self):
+        with self.assertRaises(ValueError):
+            self.read(b'\x00' * 3 * self.block)
+
+class LegacyPresetTest(unittest.TestCase):
+
+    def setUp(self):
+        cwd = os.getcwd()
+        scratch = tempfile.TemporaryDirectory()
+        os.chdir(scratch.name)
+        self.addCleanup(scratch.cleanup)
+        self.addCleanup(os.chdir, cwd)
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+        os.mkdir('presets')
+
+    def legacy(self, name, text):
+        with open(f'presets/{name}.txt', 'w') as f:
+            f.write(text)
+
+    def test_only_gain_and_exposure_imported_as_hex(self):
+        self.legacy('night', 'brightness=4\ngain=1f\nexposure=100\nsaturation=2\n')
+        self.legacy('empty', 'brightness=4\n')
+        self.legacy('bad', 'gain=zz\n')
+        self.legacy('day', 'gain=2\n')
+        with open('presets.json', 'w') as f:
+            json.dump({'day': {'gain': 9}}, f)
+        store = PresetStore('presets.json', 'presets')
+        self.assertEqual(store.get('night'), {'gain': 0x1f, 'exposure': 0x100})
+        self.assertEqual(store.get('day'), {'gain': 9})
+        self.assertEqual(store.names(), ['day', 'night'])
+        self.assertEqual(sorted(os.listdir('presets')), ['bad.txt', 'day.txt', 'empty.txt'])
+        with open('presets.json') as f:
+            self.assertEqual(json.load(f), store.presets)
+
+class StubCatalog:
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.total_bytes = sum(entry[1] for entry in entries)
+
+class RetentionSelectTest(unittest.TestCase):
+    NOW = 1767225600  # 2026-01-01
+    UNSYNCED = 1609459200  # 2021-01-01, where the Pico W's RTC starts at boot
+
+    def select(self, entries, budget=10 ** 9, now=NOW, **policy):
+        policy.setdefault('max_count', 10)
+        manager = RetentionManager(StubCatalog(entries), **policy)
+        with mock.patch.object(manager, 'byte_budget', return_value=budget):
+            return [name for name, _ in manager.select(now)]
+
+    def images(self, *ages, size=100, now=NOW, first=0):
+        return [[f'{i}.jpg', size, now - age, None] for i, age in enumerate(ages, first)]
+
+    def test_count(self):
+        self.assertEqual(self.select(self.images(40, 30, 20, 10), max_count=2), ['0.jpg', '1.jpg'])
+
+    def test_byte_budget(self):
+        self.assertEqual(self.select(self.images(40, 30, 20, 10), budget=250), ['0.jpg', '1.jpg'])
+
+    def test_age_stops_at_first_recent_image(self):
+        self.assertEqual(self.select(self.images(90, 80, 10, 95), max_age_s=60),
+                         ['0.jpg', '1.jpg'])
+
+    def test_newest_always_kept(self):
+        entries = self.images(90, 80)
+        self.assertEqual(self.select(entries, max_count=0, max_age_s=60), ['0.jpg'])
+        self.assertEqual(self.select(entries[1:], max_count=0, budget=0), [])
+
+    def test_age_skipped_while_clock_unset(self):
+        entries = self.images(90, 80, 70, now=self.UNSYNCED)
+        self.assertEqual(self.select(entries, now=self.UNSYNCED + 3600, max_age_s=60), [])
+        self.assertEqual(self.select(entries, max_count=2, now=self.UNSYNCED, max_age_s=60),
+                         ['0.jpg'])
+
+    def test_images_saved_before_clock_set_not_aged(self):
+        entries = self.images(90, 80, now=self.UNSYNCED) + self.images(90, 10, first=2)
+        self.assertEqual(self.select(entries, max_age_s=60), [])
+
+class SettleTest(unittest.TestCase):
+    """Register settling against the simulator's own model of the state register"""
+
+    def test_idle_poll_waits_for_the_sensor(self):
+        device = camera_sim.SimulatedArducamMega(settle_us=2000)
+        cam = Camera(device, skip_sleep=True)
+        cam._set_reg(cam.CAM_REG_BRIGHTNESS_CONTROL, cam.BRIGHTNESS_DEFAULT + 1)
+        self.assertTrue(cam.poll_idle)
+        self.assertEqual(cam.settle_timeouts, 0)
+        report = cam.settle_report()[f'0x{cam.CAM_REG_BRIGHTNESS_CONTROL:02X}']
+        self.assertGreaterEqual(report['max_us'], 2000)
+        self.assertLess(report['max_us'], cam.SETTLE_TIMEOUT_US)
+
+class ShadowTest(unittest.TestCase):
+
+    def test_raw_write_invalidates_shadow(self):
+        device = camera_sim.SimulatedArducamMega(settle_us=0)
+        cam = Camera(device, skip_sleep=True)
+        addr = cam.CAM_REG_BRIGHTNESS_CONTROL
+        self.assertTrue(cam._set_reg(addr, 3))
+        self.assertFalse(cam._set_reg(addr, 3))
+        cam._write_reg(addr, 5)
+        self.assertTrue(cam._set_reg(addr, 3))
+        self.assertEqual(device.regs[addr], 3)
+        cam._write_reg(addr, 5)
+        self.assertEqual(cam.write_regs([(addr, 3)]), 1)
+        self.assertEqual(device.regs[addr], 3)
+        self.assertEqual(cam.register_stats()['elided'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
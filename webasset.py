@@ -0,0 +1,85 @@
+# Generated by build_assets.py from webtemplate.py, do not edit
+
+PAGE_ETAG = '"c0a02b0d5eb35af8"'
+PAGE_SIZE = 20413
+PAGE_GZ = (
+    b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x02\x03\xed<kw\xdb8v\xdf\xfd+\x10%\x1dI]\xeb-9\x8el)\x9b\xd8I'm\xb2I\xe3\xccv\xf7\xf4\xf4$\x14\tJ\x9cP\x84JR\x96\xb5Y\xef\xe7\xfd\x15\xfdq\xfd%"
+    b'\xbd\xf7\x02$\x01>\xf4H2\x9d\xe99\x1d\x9f\xb1%\x02\xb8\xb8\xef\x17\xc0\\>\xb8~{\xf5\xe1\xcf\xef^\xb0E\xbc\xf4\xa7\x97\xf4\xfb\xe4r\xc1-\x07\xfe\xc4^\xec\xf3\xe9\x95\xb5\xe4\xa1\xc5\xae\xacU\xbc\x0e9\xbb\xed'
+    b'\xb5\xbb\x97\x1d9tr\xb9\xe4\xb1\xc5\x02\x981\xa9\xddz|\xb3\x12a\\c\xb6\x08b\x1e\xc4\x93\xda\xc6s\xe2\xc5\xc4\xe1\xb7\x9e\xcd[\xf4\xe5\x94y\x81\x17{\x96\xdf\x8al\xcb\xe7\x93^\r\x80\xf8^\xf0\x99-B\xee'
+    b"Nj\x8b8^E\xe3N\xc7\x05\x10Q{.\xc4\xdc\xe7\xd6\xca\x8b\xda\xb6Xv\xec(\xea?u\xad\xa5\xe7o'\xef\xc5L\xc4b\xbc\x99/\xe2\xdf\x0f\xba\xdd\x8b!\xfc?\xeav\x7fp\xbch\xe5[\xdbI\xb4\xb1V"
+    b'5\x16r\x7fR\x8b\xe2\xad\xcf\xa3\x05\xe71nF\xdf\xa6\'\xe3P\x88\x98}9i\xb5V\xa1\xb7\xb4\xc2m\xcb\x16\xbe\x08\xc7\xeca\xbf\xf7\xe4\xec\xe5\xe0\x02F"\x0e\x948\xfaX\xef\xc9\xe3\xb3\xeb>\x8d\xadm\x9bG'
+    b'Q:2\xbcz\xf6r\xd4\xc5\x11\x1e\x86"L\x9f\xbb\xc3\xe1`p\x86\xcf7V\x18x\xc1<\x1bq\x9f\x9cwi\xc5\xcc\xb2?\xcfC\xb1\x0e\x9clp\x84?8h[\xa1\xa3\xcd\xa0\x85\xf8\x1f\x8e\xc5\xfc.N\x97\x0c'
+    b"\xe8?\x82'B\x87\x87\xad\xd0r\xbcu4f\xe7\xab;\xc2xa9b3f]\xd6_\xdd\xb1!\xfc\x1f\xcegV\xa3{J?\xed^\x93 \x86V\x10\x81\x80D0f\x96\xef\xb3n{\x101nE\xfc\xe2\xe4\xfe"
+    b"\xe4\x1f\x81_3q\xd7\x8a\xbc\xbf\x00!c\xa6\xf6\x81G\x17'\xc0\xc2\xb9\x07\x8b\x80\xa0\x95\xe584\xde\xc5E3\xe1la\x1d\n\xb4%e7fu)\xbd\xfa)\x8b`;\xe0s\xe8\x01=\xa0\x06\xbc\xb5\xe0\x1e\x88"
+    b't\xcczm`\x9aN\xf6\xad\x156\x8a\xac\x02\xa4\x15\xfdr<\xe3HSC\xa4\xdfE\x16\xdc\x9f\xb4\x97\x96\x17\xb4P=\xe1/\x0f\x01\xad\xa5u\'\x15\x13v\xecviZJ\t\xb3\xd6\xb1(C"\'\x12}\xa7\x01'
+    b'\x81\xc8\t@\xa1\xae?l^HN*\x99\xc8\x19\xf2[\x930E\x13$\x0c\x89"\xcb\xf7\xe6\x80\x92\rV\xc5\xc3\x04E\x80\x18\xc7b\x99l\xaapH\x9f\xf6uT\xd2\x87 \xf6H\xf8\x9e\xc3\x1er\xce\xf5\x9d\x16='
+    b'\xd8\xcc\xe0\xa5a\x18\x80\x15\x89\x10d\xcf\x01L{\xc4\x97\x05<z\xb4#M\xdb(1\x8e\xba]}\x93U\xb6\xc7\xc3\xb3\xb33\x03f\xaf\xddC\x980\x19\x05\x14\n?Bu3\x14\xff\xdc}\xe2Z\xba\\G\xba\xc0'
+    b'\x90`\xd4\xb9\x03\xb9\x8f\xdfaW\x8d!O\xb8\xcd]\x1d\x83\x16n\xbd\xca\xa1\xb1Yx1\xd7\x90\xe8\x19H\xe0\xb7#\x90\xa8T\x01\xdd\x10\x95j\xa7O\x9aE\x1c\xc7\x0bq+\xd5\x05g\xb9"\x04q\xd0G\xdf\x8a\xf9'
+    b'\x9f\x1b-\x90{n\xbf.\xb9\x80\xf327\x00\xc0]a\xaf\xa3V\x95 \xf8\xc0\xed\xbbN\xc1\xc0\xbe\x92\x07\x05A\xccf\x0ewg\x88\x87o\xcd\xb8\x0f\xbb+\xaf>\x86\xe8A^b\xe6\x0b\xfb\xf3\xc5Ib\xb9\xfd\n'
+    b'\xc5KTm4\x1a!\xb4\x88\xfb\xdcF\xa7\x9f\xc9\xce\xc0\x9b\x04\xa9`\xf6\xbb\xc7Xr\x81\x04\xc7q.\xca\xb4F\xd7\xf7!n\xb0W\xce\x12\xe91\t\x04P\x17\xeb\x1890f\x81\x08x\x8a\xdfN\xbb5\xa5\xdeU'
+    b"\x01\x80\xa4>\x18\x9c\x82\xb4\xba\xa7\xac?\x84O\x89\xf4gk\xb0\xe7 '\xf4r\xd8j\xe3\x82M\xe0\x0e\xfda\xc6\xc1\x1c\xbe\xbb\xf9i\xaf\xc3\x08\xa1\xae\x84'\xfd\x9d\xce\xb53C\xd3\xba\x07\xf0\xb0\xa8\x17\xe4S5K"
+    b"Y\xafV<\xb4)\xca\xf9<\x86-[\xd1\xca\xb2e\x0ck\x8fd\xec\x90LI\xed\xac\xc8\x9a\\\xb6\x90\xd8p\xd1\x16{\xc7\xd9\xa2\xda\x18L\xc0\x9a\xf9\xdc\xc9\xdb\xa2m\xdb\x19\xc7\x02\x81\xb1\xc2\x17\x1b\xee\x18\xdb'\xcc"
+    b'\xcf\xb6\x94O\x12\xe8\xca\xdew\x08\xde\xc8^\x9a\x15+K\xb9\x03\xb9\xccc[\x86\x81\x87Ql\xc5\xa4\xc6\xfb\xbc\xa7\xe1m\xce\xdd\x11\x7fr\xa0\xee\x94\x85\xcb\x12\x05\xd8gu\n\xd36%s\x05\x82\\>\xc3\xe0iX'
+    b'\x9d\x96\xf6\x19\x10T\xa2Xp\xa1\x8a(\x03\x86\x91T\x1aP\x14\xfb\x8b\x98\xb8\x03\xde\xcdA)\x8a\xca[\xce\x0b\xb9\xce?\x94\xfb-\xce\xfb\xfc\xec@^\xab\xf0\x1f\x8bU\x96m\xec\xcai\xa2\x8d\x17\xdb\x0b\x94\xbeH\x98'
+    b"\x0f\t\xba\x15{\xb7\xc0\xcc\xdd.\xfe\x8c\xc0'\xc9\xe1`\x98)M\xcb\xe7n\x9cx\x82l\x13/X\xad\xd1\xd5\x0b4\xe4xK\xc9\xa8\x82\xd5\xcd\x00\xc9\xe4$\x02\xd2Im3\xbc\xac\x190d\x8d>\xad\xe0\x8c\x88\xdc"
+    b'.z\nWB\x08SXI"dhp\x9a\xa0\x93\xa5\xee\xd1\xbc\x1c\xdf%\xa1)\x8a\xe3\x19\x07{\xe6U\x98\xca\xb2k\xccj\xb5\x8c\xc2\xfe\x99\x1e\xd4\xe8\x8bD\\9g\x89\xb0\xfcR@Y\xb9\xf5\xe3p\x1e\xa1j'
+    b'\x81\xce\xa1\x00\xc6\xf6\x82\xdb\x9f\xc1i\xfd\x8ee\\.\xeeS\x1e[*adl(\xf3\xb0\x7fj \x99J\xe3\xac[\xee\xb4\x00\xec\x9cGd\x01f\xa6\x98\xcb_J\x93\xcd\xef\x90\xcb\x1bX,\x06\xfb\xf2\xec|V='
+    b'\xaa\xcc\xaa5\xc0\x1au\xbd<u\x12BI6r\x10m\xa9a\xba>\x070?\xaf\xa3\xd8s\xb7\xadT\xdb0T\x82\xb9\xf2x\xc3ypqB\xbe\xb7\x05\xe0\x97Q\xe6\x81\xf7j\x90\x1e\x0b\xd1\x1d\r*\xf2R\x8d\xe2'
+    b'\x9d)\xef\x9f\x1a\xa3\x92(\x8bY\xc9\xa8\x00yT\x00\x8d4\x05I\xd1\xaagkF\xed\x92[\x93\x06\xcf\x94\xef\x18\xd0e\xbeR\x00\xa4\x95\xcb\x00F.M\xab\x8d}\x1cO\xb8:\xb7V\xf9\xd4;\xd1\xec<\xd0\x149'
+    b'\x04\tH\\\xe8\xd1@\xe5\xba\xb0\xc6\xe1\xb3\xf5\xbc\xe5\x8b\xf9/k,\xbbJ\xaf\x0c\x85\xe3-E\x91\xf1P\xc2XB(U\x86ot\x1f\x96"\x10\xa4\xb49"\xfa3\xfc\xc9\x84\x0cD\xc1O\xd1\x8e\x0e\x0b\x8dwi'
+    b'+C\xb1\x17\xb5\xd5\x85\xd4\xac\x05(\xc8\xceBJ\xad\xc2Tc\xfa(\xc7\xf3QI-\xaf\xf1o\xe0\xe0O\x11\xe2\xd8\xb7\xa2\xb8e/<\x9f\xf2Fs}\x92\x02\xb6#\xc8ya\x97\xa8\x05ZO\xe5V>\xc7\xa8\xac'
+    b'\xf4\x8e,\xb9w:I\x13\x89\xef\xe9&W!\x07\xe8*G\x8d\x8a\x06Fv\xa4\x9a\x17\xf0\xa0\xb5\t\xf1\x01\xfe.[^bJ\x80\x86Y\x8a"=\xb1\x08A\x02-/p\xc5\xaf\xc5R\x1d\x85\xef\x1awt\xc0\xab]'
+    b'\xa1\xe7\xfc\xdb\\\x05\xd8\xb2\xe2>\xf6\x98\xf7T\xee\xdfT\xab\xe7]\xe1\xef\x97\xdc\xf1,\xd6\xd0\xdc\xe4\xe33\xa0\xa6\tH\x14\xdb\x889\x17a\xf6\xb0\n\x83i\x1f\xc2\xc8\xc6s\xa6_\x0c\x0b\xa4\x9b\x8e\x17\xc2Z\n\xa4'
+    b' \xb7\xf52\x1fq\xa38\xe4\x90\xff\xee\x88\x00\x1aE\xa9\x07(XH\xd5^;\xcc\xc1 \xa6 \xb8\xdc\xe8\xfd\xc9eGu\xe2/#;\xf4V\xf1\x14Ko\x80\x16m\xd9\x84\xb9\x96\xaf\x8aq\xa8\x10\xe2p\xfb\xc1['
+    b'r\x01\xf9\xfc\x84\x05k\xdf\x97\x03>\x94\r\xe6Tw\x15\xe1\xc40\x9d\xe6\xae\x03\xc2\x9f\xd9>\xb7\xc2\xf7\x1a\xa4\x06\xca\xd1sYC\x07\x8f\xcfhf2\xc9\x18\x84D\xbf\x0c\x15\xa4%\xddg\xbdr \xf9\xb8\xa1\x9a\xad'
+    b'\xa1|\xf0)\x8b\xb7+\xc4\xb4\x8e\xe6R\xa7M\x80q1S\xc5\xf0\x849PB/!\xa6\xb7\xe7<~\xe1s\xfc\xf8|\xfb\xcai\xd4\xe5\x8c:l\xad\xca@\xacn\xafd\x1a\x00\xeb\xd4\x06\xe9\xa8\r\xde>\xfa\x03\xf2'
+    b'{B{\x82j8\xce5\xc6\x837rf\xe3\xd3\xa3/8\xd0\x8e\xc5O\xd8\xf2\xb8\xb2"\xdeh\xde\x8f\xd9\xa3/\n\xd6\xfd\'\xb2\xba\x02Ad\xef\xaf\x00\xff\x06$Z6\x7f\xcf]\x90\xee"a\x7fF\x13\x0f\x1c*'
+    b'\x94pD\x9f\xf8\x94\xd5;\xcak|D6<\r\xe5\xc0$\x0e\xd7\xbc\xce\xc6\xb9\xe1:\xc8\x0e\xd5\xb8\x91\xc0k\x9e\xb4\xe3\x05\x0f@"\xd1\n6\x02\n\xa7,\xf9\xdc\xfe9\x12A\xa3\x99L\x01\x84-\x1c\xce\xd8Lp'
+    b'\xaf9X\xab\xbf\x87\xdd\xd2\xad9r\xaa\xe4\xbb\xbe\xb8\xed\x05`\xef?~x\xf3\x1a\xc0|:\xb9\\M?\x88\xd8\xf2\xd9\rf\x13\xc8E\xdc\x1b\x98\x0b\xcf\xee/;\xab)\xce\xf8)\x82\xd2\xc5\x9c\xb0\x86G\xe9\xf8\xcb'
+    b'\x90\xf3\xdc8p\x86\xa7\xe37\x98b\xb2WT<\xa43d-!\xe7|*\x8a\xb9\xae\x04\xc6\xc8AK\x19:Lu\x17\\P\xdb-\xd2v\x0f\x1c\xb3-\xe22u9\x88g\x873\xc7`F\xfd\x05\x81\xf0\x85\x85\xae'
+    b'.\xe19\xed\x1f.-T\xa5z\t\x9ar\x11\xe1\x97_\x05\x1a\x01\x05\x1f!\xd6V\xbaI(\x1b\xda\xc9\x03l\x89=\x97\x9e\xa8!\xbf\xa1\xee\x83N5uZ\xfes\xcd\xc3\xed\ry]\x11>\xf3\xfdF]z- '
+    b'\x02\xf0{a\x01\x0b\x94\x1b#\x1e\xa8\xceV\xdaq\x9b\xb0\x07\x12v\x01\x010\xbc0\xbe\x01\x97k-\x1b\x99\x11`\xbbe\x87\x9a\xad\x16x\xf6\xd5\xc4\x03\xaf\xdb\x04\xdd\x0b\xec\xd1\xb4E\x80\x0cL]\x8b|\xa4\x84\xc3`'
+    b'\x03\xc2\x0e\xb8\xb4J\xb6\xbc81<N\xfd5B\x04\xc7\x8bg\xb1\xc8N0r\xa7~\xca\xea\x04\x83d.\xa1F\xa1\x8dB\xebD\x04\xe7)\xb2\xfa\x1a\xc0\xb4\x03\xb1A\xa0\x95\xa8#\xc6\xad\x94w\xa67B\xa5[1'
+    b'\xc4\xa0\xbe\x0b-DGi""\xa4\xf9l\x88\x16\xaf\xb0\xb0\xb9\xb5\xfcFB\xac\xf4\x02\t\xa2\x1f\xd1\xd1\xc1\xb2\xc3\x9d\x01-\xc0\xf1j\x84\xa4\xa6\xd1\xc46`\x03\x9f\xeb\x18I\x0c<SKQx\x91\x1a\x9cb\xb6\xd0'
+    b'\xcd+D&\x1c@\xdf\x8cQ\x14[R\x12\x13\xcaM&H\xc9\x1f\xa7G\xa6\x9ed\xba\x13\xf2%\x14\x1d\xcf\xe28\xf4@f`o \xf6\xfaW\x8bWIV#6\x16\xf3\xb9\xcf5r1\xa0"\x8c\xe6W\xaa\xa9\x0c'
+    b'\x90\xb0\x07\xe3\xc00\x02\xa2\xd9W.\xd6\xaa\x08\xf2N\x82)\xecof\x12\xa6\xa7 \x07A\xf1|\x1dRRc\xcb\xcb\r\xc9\x80\xb6K2\xa2\xa2\x19$\x00z\xd0\xf3\xdc\x06\xed\xf3\xc3\x0f\xecA6\xa3\xc9\x12\xc8%y'
+    b'\xc7\x85\x86\xa5\xc9#\x85\xb1t\x07&\xc2r\xc3<\x1b\xe5\x95\x0c\xf0\x9c\xedv\x1b\xd9\xa7\x1a\xbf\xf5\xe6\xb1\n\x94X\x99"6\xe7\x0fN\xd1\xb1\x81\x8f\x84\x00U\x0fD\x0b\xbd4\xafS\xf4(X!q\xe4Aj\x8b\xe2'
+    b's\x93\xc5\x8bPlX\x00\x82&o\x9f`\xcd\x81\x89\x1e8\xd7z*\x87\xcc\x84g\xbe\x985T\x80\xa2-\xf0\x81\x1e\xd2\xd7\xa1\x0ft\xfd\xf4\xfeu\xdb\x06\xe6\xc5\xfc\xed\xecgp\xed\xf0\x9df6s\xce4\xf1%8'
+    b'\x1f\x94E|\xd6\xe6+gX\xc1Z\xae\xc5\xcc\x9c\xdf:@\xbd\xee\xab<\xb8\xb9\x15\x85v\x8a\x9c\x8a%\xa72\xe7\xcd\xe4\x9az\xef\\\x02\n\x0e3Q+\t\xdaP\xe3\xcc=\xe9>\x1fXW\x11\xf9M\xacHX%'
+    b"AXG\xe7\x10\x1e\xe4\xdc#'\x8f\x02\x85QC\x15H\xa7P\xa7\xf9k\xdd\x98\xf6X\xcf\xd1Vr#\x1b\x0bD\x8a\xda\x94||,\xe8\x11m\x8f\x0f\x8aF\x94\x98En\xe5\xd3t\xd9\xd7\x9a\xc0K\x923b\x00\x0c"
+    b'\xd1\x11\xcb#\xaf\xe3\x8bSu\x9cM}Lm\xc8t\x8a\xbf\xa2\xacetx\xb6\x8e\xc5K<"l\xe8EB\x92WU\xba&l\x90\xd1\xc9"\xc4!\xd5\xff\x87d<\xd3\x1em\xc2i\x02/\xa7j D\x9fg['
+    b'\xffB\xdaE\x1b\x94\xba\xe04u!D\x141_\xab0t\xfa\x9fy\xcc\x12\x1c\xaa]\x95\xe6&L\xf5\xc8<\xc4\xaf\xa5#\xcaa=\x0b\x1c,s\x8e\x90\xd3\xf7\x8f\xa1\xcc\n\xa0D\xb2nw\xca2\t\x90\xd8\xf7\x97'
+    b'\xa5\xebo)8*\xca\xb0`\x94\xf5b\x96y\xbd\xa3f\xcck/\x8a\xf5l,\xab\xea\xa5xX\xa7\xc3^b\x1a\x93\xf8\x11f\xb9\x90\xad"[\xf8\xa1\xa1\xf7kR\xd7o\x08\xd42z*\xb98\x89\x10e:\xf9\x7f'
+    b'$\\\xa7\xda\xff[\x8c\xd8%:\xa5\x97e\xf8\xfc\xa3\xecF\x1cS\x96\xa9\xb3P-\xa5\xcb\xba\xa9\xbb\x1a4\xdaA\xaa\xcar\xe5"\xb3\x17q\xb9\x18\x98m\x93\xcb\x0e<\xa9#S\xf1kZ\xf3\x93\x92f(8\xde\xad'
+    b'\xbe\xb9\xd4o\xb5\x7f\xa3\x0e\xa3T;y\xb7F\x9fM\xc7\xa9.\x87sM"<K\x9c>\xfa\x82\x02\xc5^\xe8=k<\xfa"\xbb"7\xde_\xb8Tl\xf8\xd0\xbco^vh\xee\xc9\xa5jF\x88\xc0\xf6=\xfb\xb3'
+    b'\xbcZM\xa44\xea\x1a\xa0z\xb36\xfd#\x8c\\v\xe4|j\x05e,\xb1\xa0\xaa\n\x9c+<\xfbi\x00Z\x89h\xcb\x14\t\xe9\x17>\x97\xb7]\x8am\x19b\xa5\xe4\xdd\x18\xc3-\x0e7\x0fh\xe7\xe8\xeb\x0ei\xe7'
+    b'dd\xba`XH\xe3w\r\xdc\xc7y\xa6\\\xc5\x9a4\xb62\x9a\x8aQ\xa2\xd4\x99\x99pP^t\x16\x80\xecH\xa8\xfc\xa5\\U\x96f\x12N\xf2\xd4<\xbf\xf3Q\xbe\xc1\xec\x1e\xa1\xbc\x9e\xea\xe0\x0cij:>\xdb'
+    b'\xc6<J\nt\xfa\xc2.Y\xaf\xdb\x1f&Be\xf2!\xa6\xb9\xcf\xeb\x17\xb9i\xc3\xf3\xd1\xe3\xb3t\xa6\x1a\xe8\xc8\xf5m\xc8.\xbd;\xee4zMZ\xfd/\xb8\xbc8S\x82\xc8O~\xf3\xdc\xecg\xe4\x15:Q\xd4'
+    b"\xccCh\xa3;;\xc9\xe6\x01tV\x90\xab'j\xee~oc\xce7\x1d\x8f\xb1G\xbd0\xd7\xec\xde|z\xf4\x05\xb3\x0c,\xea\x1b\xc8\x87\xd7\x02_\xbf@\xfb\x81\xdc\t\x14\xb2\xd1\xbcg-\xfd\x18\x00\\\x99N,8"
+    b'\xb5\x88\x87\xf1s\xbax\xd30\xb7:5\xf9\xd2v\xbd0\x8a\xc9\xef\x00\x05\x1b\xf8\xcbY\xc3\x9cA\x07\xd2!\x0f\xda\xa06\xf3x\xc1\xa6l\xd4\xa5\x86\xad1K\xb6\xaf\x94\x033F\xf0T;\xd9\xc0\xe8\t\xa1y\xcaT'
+    b'G+7\x02\xc9\xb0j\x93\xcf\x0e\xaa\xa0\xda\xa0\xda\xaa\rLY&y\xe6\x83\xc4\x13\x99\xd6\xf5\xce\xc7\xf7"\x18\xdd\xc5`\x16\x93Ph\xb3|\x12\xa0\x9aLz\xd0\xfc(\xa7\x93\xf5\xf0\xc0\x16\x0e\xff\xe9\xfd\xab+\xb1\x84'
+    b"`\x89\xf2\xa7\x1d\xabrHvDyi\xc9F\x1blU\xf4i\x92Q\xd2\xa5I\xb7PtFe\xd9cI\x0896\x131\xfd>z'%\xb5\xcc\xe9\xa7|O\x18X\xee\x90%q\x06\xfa%y;\xee\xf0\xbf\xc4r"
+    b"r\xb5{X\x8es\xaay\xbe\xa3^\xebU\xd6k\xdf&\x81\xa2\x98\xb5$\xcf\x87\x07\x8ayG%yj\x89q\x16'O\xbe\xf7\x1b\xa3\x9c(\xb9\x81\x9fr\t\x9eX\xc9\x84\x01muR\xabM\xe5\xd9Nj\x85\x10\x9a"
+    b'/;r\x0e\xa6}\n\x914\xefS\xa6\xaa\xe1\xa5\xe0U\xfbc9\x01\xf1\x91\x9f\xa4\x9b\x80\x05\x12V\xfa\xd8\xf4\xba\xc9\xa0\xa2A\xcf\xc8\xe4\xfc\xafO\xca\x14M\xc7\xe4c\xc9\x92CR1@\xd5\xdf*\x9b\xc4\x13\xe3\xcc'
+    b'\x9b\xa6RE\xc3\x08\x1c\x81z\xf6\xe5\x84.\x14~\x9cY\xbe\x15\xe0Af]\xb8\xaeg\x83#<\x99\xd1\xed\xd8\x00\xf6\x81\xa7]x@--\xf0\xdf\xea+\xbf[\x89\x08\x8a \xfcz7\xe8B\xe9|\x8a\xef8T\xc1'
+    b'\x8d\xd6A\xb0\xcd\x83\xed\x9b`{y\xb0}\t\xd6\x17\x1b_\xdec)\xc2]\x88e\x01\xdb\x9e\t\xb6\x9f\x07;B\xfc\xe7\x16\xde\xd9\x80oC\xb9\xc9,\xac\xda\xe2\x10\xd4\x07%\xa8k{\xf4p\x0f\xcc\xc2tQ\xa4z'
+    b'\x16\xfd;J\xea?T\xd0\x92\xcf\xaa\xdc\xe73\x94o\xd2\x15\xa5\xfb\t\x98\x10\xa5\xd6S\xd5\xcaRw\xb4\xa8\xeb\xb1\xe4\xf1B\xa0\x13{\xf7\xf6\xe6\x03`)_\xf1\x02\xa2\xbe\xd4\x95\x05\xb4>\x00\xe0:\xcc@m\xf2l'
+    b":\x06\xee\xa0\x8f\xa8#\xa3\x84\xb3\x1d\xb3\x7f\xbey\xfb\x87vD)\x88\xe7n\x95e6\xcb\xfb'97\x93NX\xfb\xf1\xa1~Z\xceV\xb7\xfa\xff\xfaW\xa6\xf9m\xd2x\xcdqg}\x17X\x81\xf6\xa1\xa1\x94\xeeh"
+    b'05\xc7F\x82\xe8\x01\xf0\x06\xf2X\xed\x1c\xf29xS`\xd3\xc7M\xe8\xc5\xc0$Z\x90>m\xd6\x7f\x99P \xa9\xcb\xc7\xcb]\xa1!u\x84\xe0U^\xdc\xc2\x07\x0c\x0b\x1c|p\xa3~\xfd\xf6\x8d\x12\xf0k\x8ac'
+    b'\x80s\xe27\x1a\xcd\xef\xd5\x86z%_\x13\x96\xe1t\xe3A\x92\xe8\xea\x8d\xa9\xfc\xc9`\xd9\xd91\xa9\x83,\x1d\x8f@\xea\x1e\x0fvG\ts/\xf0\x9e\x92\xba\x9ft\xd9Q\xefE\xa3\xea\xc2\x1f\xec\x17PF>\xa9\x99'
+    b'\x17\xc2j\xe6\xa04\x0c|\xb8\xe8\x95\xbfM\r\xcf\xf1\xaa\xc73\xe7\x16}\x85\xc3\x92I\xaa\xfbO\x94\xb9\x96\xcd\xe5\x9d\x90\x0e\xc06wH.\x9b\xe566_\xe2\xab\x95\xae\x91\xb7\xc3\xe8-l|\xd7n\x8a\xfdzF'
+    b'\r\xe5\xf1eG>RC\xc9B\xf9\x82\x05\xae\x90\xefX\xa0\xda\x038l\xd2\xcf\xc4]\x8dy\xce\xa4\x96v\xe7k\xd8\xc4XX\xc1\x1c\xa6\x14\x0e\x04\xe8ul\xbci\x9d@\xa6\xdb\xfd\xb5i\xda\x07I\x11P\r\x11\x83'
+    b'.\xf9\xac\x96uI\x8c\x8e?\xe4\x04\xf4U\xd2\x92\xb5H\xaa\xb9\x97\xe7\x04\x95\x8a\x05V\xa8\x0c\x06\x89\x94h\xc8\x12F\xa7S?\xa6p\x11HrN\x11/\xbcH&\x0eD\xba\x99\xc4t\xef\xba\xdd^\xb76}c\xd9'
+    b'\xa1`\x8d\xbf\x8d\xece3Mb\xca&\xf7a\xf2\xcdz\x05\xc5\xc7\x95/"\xdeZ\xaf`U\xaf\xbbo\xd9\x00\x96i\x0b\xfa{\x17\x0ca\xc15\x8f>\xe3\xed\x8ek0\x12TQ\xc4o\xef\xc2\x11,|/\xc4R_'
+    b'\xd5\xdb\xb3\xe6\x0c\xd6\xbc\xb4B}\xc9`\xcf\x92\xc7\xb0\xe4\x8f<\xdc2\\\x07x\xed\x99~\x0e\xd3\xc1\xd7\xe0?C\xb0e\x8d\xff\xfe\xfb\x7f\xe9\xd3;R\xbc\x99\x9a\x1c\xac-\xef9\xbd\x86\x83\x97%\x0b\xcaR\xae\x1aa'
+    b'\xbab\x9fj\x9c\r!\xbd@\xbc\xd5\x87J\xfaz\xfd\xf3\xee\xddcT\x0c\xf8\xb5\xaa\x9e\xf6\xa4\x8f\xb9\x04B\xc4\xdf\xd5\x13\xfb\xdd\xe1\xf9]o48\xabM\xd3\x8f\xbb\xb8\xb5\x9fM\xff\x86I\x11{\xae\x92\xa2\x039E'
+    b'\x99\x94J\xa4\xf6\xf1\n=O\x8d\xbcX%U\x94\x88\xa1\xed\xc0\x9f\xcaI\xb6/\xd6\xce\x96L\x05\xfeVN\x93ynm\xfa\x96\xfeVN\xc3\xf4\xb26\xfd\x11~\x7f\x1b\xfb\x9eg\xb9\xe3\x81\xbc\xcb\xb2\xcd\xbd\x0e\x08\xcd'
+    b"\xdc\xb5 K\xa9V\x9c\xda\xf4w\xbd\xca\xd1\x01\x8c\xf6+GG0:\xa8\x1c}\x0c\xa3\xc3j=\xacM[\xd5\xfb\x0ea\xb4z_\xd0\xddV\xf5\xbe\xe70:\xfc6\x99\\%\xe9\xfb\x81\x12I\xd2\xfd\xdf\xb4<\xbe'"
+    b'\xc7\xbf\x82\xa77\x90\xbb\x86\xd61\xde4JW\xfc?_\xab\xf9\xfa"\xa9-\x0f\xe4jR\x8b\xeeO^zI\x14~-6;\xe2/\xc6\xa6\xdd30?y\xc3\x1do\xbd\xdc\x03j\x98N\xdc1i\x94A\xfb\x11\x1c'
+    b'\xe1\x8e\x99\x98y\xec\x99\x92f\x1a\xb9y_!\x88\x7f\xc2\x92\xfe@!`\xf9\x7f\x98\x00\xf6\xf3\xfe \xce\x0e\x0e\xe1\xec\xf0`\xce\x8e\x8a\x9c= \xcf\xd2_^\xa9e%\x00&\xde\xda5U-\xfd7o\xa3\x023`'
+    b'\x96\x96\xf7\xe7\xcfT\x93\xbbr0S\x15c\xfb\'\xa7\'\xf5\xe9\x1a\xf6\x03\xc3\'\xe5\xf5\x05\xe2*_\xcd\x80D\x18\x8a\xc0m\t\x99\xfa\xabTT"\x0e\xa6\xc9\xe5\xfdW\xd9\xe5y:\xc0\xd6\x81\x1aw\xf1a\xdd\xeb\xea'
+    b'\x8b\xf7\xedv{\x07\x9b\xcd\xd7\xee\x14\x06\xff\xba\x06\xaa\x99\xba8\x17i\x9b\xef\xf3\xda\xb7\x9c]\xad\xc3\x10\xbb\x9f\xc9jM\xcb\xf5z\x11\x1b\xa5\xb2V\xd4\x8e_jl\xe5C\x99\xbb\x10>\xd4\x81\x93\xda\xbb\xecH\xa5V'
+    b'"\x14\xfd\xb0\xa76\xad\x16\xc3n\xa4\x91sL\x82)/\xf3\x8c\x8e\xb4^\xe7i\xc7\x16;msg{\xfa [(\x15\x92\xbc\x88"\x11(\x91\x91\xf9\x9aV\x19\xff\xf4\x1eo]\xb6r\xf1J\xc1+\xfa\xb4\xc3\x18\x8c'
+    b'u\xaaW\x8b\x0b\xdf\xca\x8f\x87\xaeL\xda\xb1\xb8\x14\xfc\x11{\x8d_\x0e],\xd3Z\\*Sbvmm\x8b\xd2/r2}\xbbX1\x91\x1a\xe6\xe0\x0e\xe79\x0b3\x0fp\xb1%Q\x80H\x86\xa8]H\xa9\xa5\xd2'
+    b'\xd2\x1f*\x93.\xdcFIA\xe1}\x04R3\xbcxPc\x96\x1fOj\xaa\xff\x03\x0c\x05\x83\xa9i\xf4\xa8\xceS\x87\xfe\x9d\xbe\xff\x01C\x95\x96\x90\xbdO\x00\x00'
+)
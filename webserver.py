@@ -1,39 +1,151 @@
-import socket
 import network
 import machine
 import uos
 import gc
+import json
+import math
 import config
 from time import sleep, ticks_ms, ticks_diff, sleep_ms
-from camera import Camera
+from camera import Camera, CaptureTimeoutError
+from framepool import FramePool, SpillFile, prepare_spill_dir
+from camera_settings import SettingsEngine, run_focus_steps
+from presets import PresetStore
+from catalog import ImageCatalog
+from retention import RetentionManager
+from httprequest import RequestParser
 from machine import Pin, SPI, RTC
-from webtemplate import HTML_PAGE
+
+# The gzipped page from build_assets.py; the plain template is only loaded
+# when it is missing or a client can't take gzip
+try:
+    from webasset import PAGE_GZ, PAGE_ETAG
+except ImportError:
+    PAGE_GZ = PAGE_ETAG = None
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
 
 # WiFi settings
 WIFI_SSID = config.WIFI_SSID 
 WIFI_PASSWORD = config.WIFI_PASSWORD
 
 CHUNK_SIZE = 1024
-MAX_REQUEST_SIZE = 512
-MAX_SAVED_IMAGES = config.MAX_SAVED_IMAGES
+SEND_RETRY_MS = 5  # wait between attempts when the socket send buffer is full
+CAMERA_SETTLE_MS = 2000  # after starting the camera, before writing settings
+CAMERA_RESET_MS = 2000  # between releasing the camera and starting it again
+OUT_BUFFER_SIZE = 1460  # one TCP segment: a response head plus the start of its body
+STREAM_BOUNDARY = b'frame'
+
+# Pre-encoded response head pieces
+STATUS_LINES = {
+    '200 OK': b'HTTP/1.1 200 OK\r\n',
+    '304 Not Modified': b'HTTP/1.1 304 Not Modified\r\n',
+    '400 Bad Request': b'HTTP/1.1 400 Bad Request\r\n',
+    '404 Not Found': b'HTTP/1.1 404 Not Found\r\n',
+    '405 Method Not Allowed': b'HTTP/1.1 405 Method Not Allowed\r\n',
+    '408 Request Timeout': b'HTTP/1.1 408 Request Timeout\r\n',
+    '500 Internal Server Error': b'HTTP/1.1 500 Internal Server Error\r\n',
+}
+# Never carry a body, so send_head adds neither Content-Length nor chunking
+BODYLESS_STATUSES = ('304 Not Modified',)
+CONTENT_LENGTH = b'Content-Length: '
+CHUNKED = b'Transfer-Encoding: chunked\r\n'
+KEEP_ALIVE_END = b'Connection: keep-alive\r\n\r\n'
+CLOSE_END = b'Connection: close\r\n\r\n'
+JSON_HEADERS = b'Content-Type: application/json\r\n'
+JPEG_HEADERS = b'Content-Type: image/jpeg\r\nCache-Control: no-cache\r\n'
+STREAM_PART_HEAD = (b'--' + STREAM_BOUNDARY
+                    + b'\r\nContent-Type: image/jpeg\r\nContent-Length: ')
+
+class CameraOwner:
+    """Runs every camera operation on one task, one job at a time, in order.
+
+    Request handlers await call() instead of touching the camera, so other
+    requests keep being served while a job is queued. Jobs may be plain
+    functions or coroutines. Coroutine jobs yield during every camera wait
+    (exposure, focus, reset and start-up), so one job never stalls the server.
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self.wakeup = asyncio.Event()
+        self.completed = 0
+        self.busy_ms = 0
+
+    async def call(self, fn, *args):
+        """Queue fn(*args) for the owner task and return its result"""
+        job = [fn, args, asyncio.Event(), None, None]
+        self.jobs.append(job)
+        self.wakeup.set()
+        await job[2].wait()
+        if job[4] is not None:
+            raise job[4]
+        return job[3]
+
+    async def run(self):
+        while True:
+            if not self.jobs:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+            job = self.jobs.pop(0)
+            start = ticks_ms()
+            try:
+                result = job[0](*job[1])
+                if hasattr(result, 'send'):
+                    result = await result
+                job[3] = result
+            except Exception as e:
+                job[4] = e
+            self.busy_ms += ticks_diff(ticks_ms(), start)
+            self.completed += 1
+            job[2].set()
+
+    def stats(self):
+        return {'queued': len(self.jobs), 'completed': self.completed, 'busy_ms': self.busy_ms}
 
 class CameraManager:
     def __init__(self):
         self.cam = None
+        self.owner = CameraOwner()
         self.auto_focus_enabled = False
-        self.saved_images = []
+        self.catalog = ImageCatalog(config.CATALOG_FILE)
+        self.retention = RetentionManager(self.catalog, config.MAX_SAVED_IMAGES,
+                                          max_fs_percent=config.MAX_IMAGE_FS_PERCENT,
+                                          min_free_bytes=config.MIN_FREE_BYTES,
+                                          max_age_s=config.MAX_IMAGE_AGE_S)
         self.rtc = RTC()
         self.spi = None
         self.cs = None
         self.last_storage_info = None
-        self.initialize_camera()
+        self.frame_pool = FramePool.for_resolution(config.FRAME_POOL_MAX_RESOLUTION,
+                                                   config.FRAME_POOL_SIZE,
+                                                   config.FRAME_POOL_HEAP_PERCENT)
+        prepare_spill_dir(config.SPILL_DIR)
+        self.spill_count = 0
+        self.last_frame = None  # a Frame, or a SpillFile when no buffer was free
+        self.last_capture_ms = None
+        self.last_capture_version = None
+        self.last_saved_file = None
+        self.settings = SettingsEngine()
+        self.presets = PresetStore(config.PRESETS_FILE, legacy_dir='presets')
+        self.last_verified_ms = None
+        self.camera_error = False
+        self.verify_counts = {'skipped': 0, 'probes': 0, 'full_captures': 0, 'failures': 0}
+        self.stream_stats = {'active': 0, 'streams': 0, 'frames': 0, 'fps': 0}
+        # (resolution before the streams, resolution they set), while streaming
+        self.stream_restore = None
+        # The camera is started by the owner task (serve), or on first use
         
     def get_timestamp(self):
         """Get current timestamp for filename"""
         datetime = self.rtc.datetime()
         return f"{datetime[0]}{datetime[1]:02d}{datetime[2]:02d}_{datetime[4]:02d}{datetime[5]:02d}{datetime[6]:02d}"
 
-    def initialize_camera(self):
+    async def initialize_camera(self):
+        """Start the camera and write the desired settings; runs on the owner task"""
         try:
             print("Initializing camera...")
             if self.cam:
@@ -47,9 +159,12 @@ class CameraManager:
             self.cs = Pin(13, Pin.OUT)
             self.cs.high()
             
-            self.cam = Camera(self.spi, self.cs, skip_sleep=False)
-            sleep(2)
-            self.cam.resolution = '640x480'
+            self.cam = Camera(self.spi, self.cs, skip_sleep=True)
+            settle_ms = CAMERA_SETTLE_MS
+            if self.cam.camera_idx == '5MP':
+                settle_ms += self.cam.INIT_SETTLE_MS
+            await asyncio.sleep(settle_ms / 1000)
+            await self.settings.reapply(self.cam)
             print("Camera initialized successfully")
             return True
         except Exception as e:
@@ -71,105 +186,261 @@ class CameraManager:
         except Exception as e:
             print(f"Cleanup error: {e}")
 
-    def reset_camera(self):
+    async def reset_camera(self):
         print("Resetting camera...")
+        # Resets follow a failure, so the next check takes a full capture
+        self.camera_error = True
         self.cleanup()
-        sleep(2)
-        return self.initialize_camera()
+        await asyncio.sleep(CAMERA_RESET_MS / 1000)
+        return await self.initialize_camera()
+
+    def _mark_verified(self):
+        self.last_verified_ms = ticks_ms()
+        self.camera_error = False
+
+    async def verify_camera(self):
+        """Check the camera is usable as cheaply as the situation allows.
 
-    def verify_camera(self):
+        A check within VERIFY_WINDOW_MS of the last success is skipped. After
+        an error or more than VERIFY_IDLE_MS idle a full test capture is
+        taken; otherwise the register probe is enough.
+        """
         try:
             if not self.cam:
-                return self.initialize_camera()
-            self.cam.capture_jpg()
+                return await self.initialize_camera()
+            since = None
+            if self.last_verified_ms is not None:
+                since = ticks_diff(ticks_ms(), self.last_verified_ms)
+            if not self.camera_error and since is not None and since < config.VERIFY_WINDOW_MS:
+                self.verify_counts['skipped'] += 1
+                return True
+            if self.camera_error or since is None or since >= config.VERIFY_IDLE_MS:
+                self.verify_counts['full_captures'] += 1
+                await self._capture()
+            else:
+                self.verify_counts['probes'] += 1
+                if not self.cam.probe():
+                    raise Exception('Camera probe failed')
+            self._mark_verified()
             return True
-        except:
-            print("Camera verification failed, resetting...")
-            return self.reset_camera()
+        except Exception as e:
+            print(f"Camera verification failed ({e}), resetting...")
+            self.verify_counts['failures'] += 1
+            return await self.reset_camera()
+
+    def get_health(self):
+        health = dict(self.verify_counts)
+        health['camera_error'] = self.camera_error
+        health['last_verified_age_ms'] = (None if self.last_verified_ms is None
+                                          else ticks_diff(ticks_ms(), self.last_verified_ms))
+        return health
 
-    def capture_image(self, save=False):
-        if not self.verify_camera():
+    async def _capture(self):
+        """Take one capture, letting other tasks run while the sensor works"""
+        cam = self.cam
+        cam.begin_capture()
+        await asyncio.sleep(cam.capture_wait_ms() / 1000)
+        while not cam.capture_done():
+            if cam.capture_timed_out():
+                raise CaptureTimeoutError(f"Capture not done after {cam.CAPTURE_TIMEOUT_MS} ms")
+            await asyncio.sleep(cam.CAPTURE_POLL_MS / 1000)
+        cam.end_capture()
+
+    async def _capture_with_retry(self):
+        retry_count = 0
+        while retry_count < 3:
+            try:
+                print(f"Capture attempt {retry_count + 1}")
+                await self._capture()
+                self._mark_verified()
+                return
+            except Exception as e:
+                print(f"Capture attempt failed: {e}")
+                retry_count += 1
+                if retry_count < 3:
+                    print("Resetting camera and retrying...")
+                    await self.reset_camera()
+                else:
+                    raise Exception("Failed to capture after 3 attempts")
+
+    def _retain_frame(self, frame):
+        """Keep frame as the last capture, releasing the previous one"""
+        if self.last_frame is not None and self.last_frame is not frame:
+            self.last_frame.release()
+        self.last_frame = frame
+
+    def _read_frame(self):
+        """Move the captured image from the FIFO into a pooled buffer.
+
+        Returns None, leaving the FIFO untouched, when no buffer is free or
+        the image is larger than the buffers.
+        """
+        frame = self.frame_pool.borrow()
+        if frame is None:
+            return None
+        try:
+            span = self.cam.read_jpg_into(frame.buf)
+        except Exception:
+            frame.release()
+            raise
+        if span is None:
+            frame.release()
+            return None
+        frame.start, frame.end = span
+        frame.captured_ms = ticks_ms()
+        frame.resolution = self.cam.resolution_name()
+        self._retain_frame(frame)
+        return frame
+
+    def _record_capture(self):
+        """Remember when, and with which settings, the retained image was taken"""
+        self.last_capture_ms = ticks_ms()
+        self.last_capture_version = self.settings.version
+        self.last_saved_file = None
+
+    def _forget_capture(self):
+        self._retain_frame(None)
+        self.last_capture_ms = None
+
+    def _last_capture_reusable(self):
+        """True if the retained image is recent and matches the current settings"""
+        if self.last_capture_ms is None:
+            return False
+        if self.last_frame is None:
+            return False
+        if self.last_capture_version != self.settings.version:
+            return False
+        return ticks_diff(ticks_ms(), self.last_capture_ms) <= config.SAVE_MAX_FRAME_AGE_MS
+
+    async def capture_image(self, spill=True):
+        """Capture into a frame buffer, or a spill file when none is free; runs on the owner task.
+
+        With spill=False an image that gets no buffer is left in the FIFO for
+        the caller to stream, and nothing is retained.
+        """
+        if not await self.verify_camera():
             raise Exception('Camera not initialized')
 
         try:
             print('-'*40)
             print('Capturing image...')
             
-            retry_count = 0
-            while retry_count < 3:
-                try:
-                    print(f"Capture attempt {retry_count + 1}")
-                    self.cam.capture_jpg()
-                    print("Image captured, saving to temporary file...")
-                    self.cam.saveJPG('temp.jpg')
-                    break
-                except Exception as e:
-                    print(f"Capture attempt failed: {e}")
-                    retry_count += 1
-                    if retry_count < 3:
-                        print("Resetting camera and retrying...")
-                        self.reset_camera()
-                        sleep(2)
-                    else:
-                        raise Exception("Failed to capture after 3 attempts")
-
-            size = uos.stat('temp.jpg')[6]
-            print(f'Temporary image saved: {size} bytes')
-            
-            if save:
-                timestamp = self.get_timestamp()
-                filename = f"img_{timestamp}.jpg"
-                print(f"Creating permanent save file: {filename}")
-                
-                total_bytes = 0
-                with open('temp.jpg', 'rb') as src, open(filename, 'wb') as dst:
-                    while True:
-                        chunk = src.read(CHUNK_SIZE)
-                        if not chunk:
-                            break
-                        dst.write(chunk)
-                        total_bytes += len(chunk)
-                        progress = (total_bytes / size) * 100
-                        print(f"Save progress: {progress:.1f}% ({total_bytes}/{size} bytes)")
-                
-                print(f"File save completed: {filename}")
-                self.get_saved_images()
-                
-                while len(self.saved_images) > MAX_SAVED_IMAGES:
-                    old_file = self.saved_images.pop(0)
-                    try:
-                        print(f'Removing old image: {old_file}')
-                        uos.remove(old_file)
-                        print(f'Successfully removed: {old_file}')
-                    except:
-                        print(f'Failed to remove: {old_file}')
-                
-                # Update storage info after saving
-                self.last_storage_info = self.get_storage_info()
-                
-                print(f'Save operation completed: {filename}')
-            
+            await self._capture_with_retry()
+            frame = self._read_frame()
+            if frame is None and not spill:
+                self._forget_capture()
+                print('Image captured, left in FIFO for streaming')
+            elif frame is None:
+                self._retain_frame(None)
+                # A file per capture: an earlier one may still be being sent
+                self.spill_count += 1
+                filename = f'{config.SPILL_DIR}/{self.spill_count}.jpg'
+                print("Image captured, saving to temporary file...")
+                self.cam.saveJPG(filename)
+                spill = SpillFile(filename, self.cam.resolution_name())
+                self._retain_frame(spill)
+                print(f'Temporary image saved: {len(spill)} bytes')
+                self._record_capture()
+            else:
+                print(f'Image captured to frame buffer: {len(frame)} bytes')
+                self._record_capture()
             return True
         except Exception as e:
             print(f'Capture error: {e}')
-            self.reset_camera()
+            self._forget_capture()
+            await self.reset_camera()
             return False
 
-    def get_saved_images(self):
+    async def save_last_capture(self):
+        """Persist the last captured image, capturing a new one only if it is stale.
+
+        A frame buffer is written straight to the new file and a spill file is
+        renamed, so saving what the user just previewed takes milliseconds.
+        Returns the saved filename or None.
+        """
         try:
-            images = []
-            for filename in uos.listdir('/'):
-                if filename.lower().endswith('.jpg') and filename != 'temp.jpg':
-                    try:
-                        size = uos.stat(filename)[6]
-                        images.append({'name': filename, 'size': size})
-                    except:
-                        continue
-            self.saved_images = [img['name'] for img in images]
-            return images
+            if self._last_capture_reusable():
+                if self.last_saved_file:
+                    return self.last_saved_file
+                print('Saving last capture')
+            elif not await self.capture_image():
+                return None
+
+            start = ticks_ms()
+            filename = f"img_{self.get_timestamp()}.jpg"
+            frame = self.last_frame
+            size = len(frame)
+            resolution = frame.resolution
+            if isinstance(frame, SpillFile):
+                frame.keep(filename)
+            else:
+                with open(filename, 'wb') as dst:
+                    dst.write(frame.data())
+            self.last_saved_file = filename
+            self.catalog.add(filename, size, resolution)
+            print(f'Saved {filename} in {ticks_diff(ticks_ms(), start)} ms')
+
+            # Old images are removed by the server once this response is out
+            self.retention.schedule()
+            return filename
         except Exception as e:
-            print(f'Error getting saved images: {e}')
-            return []
+            print(f'Save error: {e}')
+            return None
+
+    def hold_last_capture(self):
+        """The last image for sending, held until released, or None"""
+        if self.last_frame is None:
+            return None
+        return self.last_frame.hold()
+
+    async def capture_for_send(self, writer=None, on_start=None):
+        """Capture a new image and return it from hold_last_capture(), or None.
+
+        Given a writer, an image that gets no frame buffer skips the flash:
+        it is sent straight from the FIFO while this job runs, on_start(length)
+        queuing the response head first, and True is returned.
+        """
+        if not await self.capture_image(spill=writer is None):
+            return None
+        if self.last_frame is not None:
+            return self.hold_last_capture()
+        return await self._stream_fifo(writer, on_start)
+
+    async def _stream_fifo(self, writer, on_start):
+        """Send the image left in the FIFO, waiting for the client after each burst block"""
+        start = ticks_ms()
+        sent = 0
+        for sent in self.cam.stream_jpg_steps(writer, on_start):
+            await writer.drain()
+        if not sent:
+            print('Stream error: no image data in FIFO')
+            await self.reset_camera()
+            return None
+        print(f'Streamed image from FIFO: {sent} bytes in {ticks_diff(ticks_ms(), start)} ms')
+        return True
+
+    async def save_for_send(self):
+        """Save the last image (capturing if stale) and return it for sending, or None"""
+        if not await self.save_last_capture():
+            return None
+        return self.hold_last_capture()
+
+    def get_capture_stats(self):
+        if not self.cam:
+            return {}
+        return {
+            'latency': self.cam.capture_stats(),
+            'settle': self.cam.settle_report(),
+            'settle_polling': self.cam.poll_idle,
+            'registers': self.cam.register_stats(),
+            'frame_pool': self.frame_pool.stats(),
+            'camera_queue': self.owner.stats()
+        }
+
+    def run_retention(self):
+        """Delete images over the retention policy; called between requests"""
+        if self.retention.sweep_pending() or self.last_storage_info is None:
+            self.get_storage_info()
 
     def get_storage_info(self):
         try:
@@ -190,14 +461,12 @@ class CameraManager:
                 else:
                     return f"{size/(1024*1024):.1f} MB"
             
-            image_count = sum(1 for filename in uos.listdir('/') 
-                            if filename.lower().endswith('.jpg') and filename != 'temp.jpg')
-            
             self.last_storage_info = {
                 'total': human_size(total_space),
                 'used': human_size(used_space),
                 'free': human_size(free_space),
-                'images': image_count
+                'images': len(self.catalog),
+                'image_bytes': human_size(self.catalog.total_bytes)
             }
             return self.last_storage_info
             
@@ -211,404 +480,780 @@ class CameraManager:
             }
             return self.last_storage_info
             
-    def set_resolution(self, resolution):
+    async def _apply_setting(self, name, value):
+        """Apply one setting to the running camera without resetting it"""
         try:
-            print(f"Setting resolution to {resolution}")
-            if not self.verify_camera():
+            print(f"Setting {name} to {value}")
+            if not self.cam and not await self.initialize_camera():
                 raise Exception("Camera not ready")
-                
-            self.cam.resolution = resolution
-            sleep(2)
-            self.reset_camera()
+            await self.settings.apply(self.cam, name, value)
             return True
+        except ValueError as e:
+            print(f'Invalid {name}: {e}')
+            return False
         except Exception as e:
-            print(f'Resolution error: {e}')
-            self.reset_camera()
+            # A failed write may leave the sensor in an unknown state: reset
+            # and write the whole desired state again
+            print(f'{name} error: {e}')
+            await self.reset_camera()
             return False
-            
-    def set_white_balance(self, mode):
+
+    async def apply_settings(self, changes):
+        """Apply several settings as one register batch and return the new state.
+
+        Raises ValueError if any setting is invalid, in which case nothing is
+        written. Returns None if the camera failed while applying.
+        """
         try:
-            print(f"Setting white balance to {mode}")
-            if not self.verify_camera():
+            print(f"Applying settings: {changes}")
+            if not self.cam and not await self.initialize_camera():
                 raise Exception("Camera not ready")
-                
-            self.cam.set_white_balance(mode)
-            sleep(2)
-            self.reset_camera()
-            return True
+            written = await self.settings.apply_many(self.cam, changes)
+            self.auto_focus_enabled = self.settings.desired.get('auto_focus', self.auto_focus_enabled)
+            return {
+                'settings': self.settings.desired,
+                'registers_written': written,
+                'apply_ms': self.settings.latency['batch'][2]
+            }
+        except ValueError:
+            raise
         except Exception as e:
-            print(f'White balance error: {e}')
-            self.reset_camera()
-            return False
+            print(f'Settings error: {e}')
+            await self.reset_camera()
+            return None
+
+    async def set_resolution(self, resolution):
+        return await self._apply_setting('resolution', resolution.lower())
+            
+    async def set_white_balance(self, mode):
+        return await self._apply_setting('white_balance', mode.lower())
             
-    def set_brightness(self, level):
+    async def set_brightness(self, level):
         try:
-            print(f"Setting brightness to {level}")
-            if not self.verify_camera():
-                raise Exception("Camera not ready")
-                
-            self.cam.set_brightness_level(int(level))
-            sleep(1)
-            self.reset_camera()
-            return True
-        except Exception as e:
-            print(f'Brightness error: {e}')
-            self.reset_camera()
+            level = int(level)
+        except ValueError:
             return False
+        return await self._apply_setting('brightness', level)
             
-    def set_contrast(self, level):
+    async def set_contrast(self, level):
         try:
-            print(f"Setting contrast to {level}")
-            if not self.verify_camera():
-                raise Exception("Camera not ready")
-                
-            self.cam.set_contrast(int(level))
-            sleep(1)
-            self.reset_camera()
-            return True
-        except Exception as e:
-            print(f'Contrast error: {e}')
-            self.reset_camera()
+            level = int(level)
+        except ValueError:
             return False
+        return await self._apply_setting('contrast', level)
             
-    def set_saturation(self, level):
+    async def set_saturation(self, level):
         try:
-            print(f"Setting saturation to {level}")
-            if not self.verify_camera():
-                raise Exception("Camera not ready")
-                
-            self.cam.set_saturation_control(int(level))
-            sleep(1)
-            self.reset_camera()
-            return True
-        except Exception as e:
-            print(f'Saturation error: {e}')
-            self.reset_camera()
+            level = int(level)
+        except ValueError:
             return False
+        return await self._apply_setting('saturation', level)
             
-    def set_auto_focus(self, enabled):
-        try:
-            print(f"Setting auto focus to {enabled}")
-            if not self.verify_camera():
-                raise Exception("Camera not ready")
-                
-            if enabled.lower() == 'true':
-                self.auto_focus_enabled = self.cam.auto_focus(True)
-            else:
-                self.auto_focus_enabled = not self.cam.auto_focus(False)
-            sleep(1)
-            self.reset_camera()
-            return True
-        except Exception as e:
-            print(f'Auto focus error: {e}')
-            self.reset_camera()
+    async def set_auto_focus(self, enabled):
+        enabled = enabled.lower() == 'true'
+        if not await self._apply_setting('auto_focus', enabled):
             return False
+        self.auto_focus_enabled = enabled
+        return True
 
-    def trigger_single_focus(self):
+    async def trigger_single_focus(self):
         try:
             print("Triggering single focus")
-            if not self.verify_camera():
+            if not self.cam and not await self.initialize_camera():
                 raise Exception("Camera not ready")
                 
-            result = self.cam.single_focus()
-            sleep(1)
-            self.reset_camera()
-            return result
+            steps = self.cam.focus_steps(single=True)
+            if steps is None:
+                print("Auto focus is only supported on 5MP cameras")
+                return False
+            start = ticks_ms()
+            await run_focus_steps(self.cam, steps)
+            self.settings.record('single_focus', ticks_diff(ticks_ms(), start))
+            return True
         except Exception as e:
             print(f'Single focus error: {e}')
-            self.reset_camera()
+            await self.reset_camera()
             return False
 
-    def set_fixed_focus(self, focus_value):
+    async def set_fixed_focus(self, focus_value):
         try:
-            if not self.verify_camera():
-                raise Exception("Camera not ready")
-                
             focus_value = int(focus_value, 16)
-            print(f"Setting fixed focus to 0x{focus_value:04X}")
-            self.cam._write_reg(0x30, (focus_value >> 8) & 0xFF)
-            self.cam._write_reg(0x31, focus_value & 0xFF)
-            sleep(0.5)
-
-            focus_high = self.cam._read_reg(0x30)
-            focus_low = self.cam._read_reg(0x31)
-            actual_focus = (int.from_bytes(focus_high, 'big') << 8) | int.from_bytes(focus_low, 'big')
-            print(f"Focus register values set to 0x{actual_focus:04X}")
-            
-            return True
-        except Exception as e:
-            print(f'Fixed focus error: {e}')
+        except ValueError:
             return False
+        if not await self._apply_setting('focus', focus_value):
+            return False
+        focus_high, focus_low = self.cam.read_regs((self.cam.CAM_REG_FOCUS_HIGH, self.cam.CAM_REG_FOCUS_LOW))
+        print(f"Focus register values set to 0x{(focus_high << 8) | focus_low:04X}")
+        return True
 
-    def set_gain(self, gain_value):
+    async def set_gain(self, gain_value):
         try:
-            if not self.verify_camera():
-                raise Exception("Camera not ready")
-                
             gain_value = int(gain_value, 16)
-            print(f"Setting gain to 0x{gain_value:02X}")
-            self.cam._write_reg(0x45, gain_value)
-            sleep(0.5)
-            
-            actual_gain = int.from_bytes(self.cam._read_reg(0x45), 'big')
-            print(f"Gain register value set to 0x{actual_gain:02X}")
-            
-            return True
-        except Exception as e:
-            print(f'Gain error: {e}')
+        except ValueError:
+            return False
+        if not await self._apply_setting('gain', gain_value):
             return False
+        actual_gain = self.cam._read_reg_value(self.cam.CAM_REG_GAIN)
+        print(f"Gain register value set to 0x{actual_gain:02X}")
+        return True
 
-    def set_exposure(self, exposure_value):
+    async def set_exposure(self, exposure_value):
         try:
-            if not self.verify_camera():
-                raise Exception("Camera not ready")
-                
             exposure_value = int(exposure_value, 16)
-            print(f"Setting exposure to 0x{exposure_value:02X}")
-            self.cam._write_reg(0x55, exposure_value)
-            sleep(0.5)
-            
-            actual_exposure = int.from_bytes(self.cam._read_reg(0x55), 'big')
-            print(f"Exposure register value set to 0x{actual_exposure:02X}")
-            
-            return True
-        except Exception as e:
-            print(f'Exposure error: {e}')
+        except ValueError:
             return False
+        if not await self._apply_setting('exposure', exposure_value):
+            return False
+        actual_exposure = self.cam._read_reg_value(self.cam.CAM_REG_EXPOSURE)
+        print(f"Exposure register value set to 0x{actual_exposure:02X}")
+        return True
+
+    def get_settings_stats(self):
+        return {
+            'settings': self.settings.desired,
+            'apply_latency': self.settings.stats()
+        }
 
     def save_settings(self, preset_name):
+        """Store the current desired settings under a name"""
         try:
-            settings = {
-                'resolution': self.cam.resolution,
-                'white_balance': self.cam._read_reg(0x42),
-                'brightness': self.cam._read_reg(0x43),
-                'contrast': self.cam._read_reg(0x44),
-                'gain': self.cam._read_reg(0x45),
-                'exposure': self.cam._read_reg(0x55)
-            }
-            
-            try:
-                uos.mkdir('presets')
-            except:
-                pass
-                
-            filename = f'presets/{preset_name}.txt'
-            with open(filename, 'w') as f:
-                for key, value in settings.items():
-                    if isinstance(value, bytes):
-                        value = int.from_bytes(value, 'big')
-                    f.write(f'{key}={value}\n')
+            self.presets.save(preset_name, self.settings.desired)
             return True
         except Exception as e:
             print(f'Save settings error: {e}')
             return False
             
-    def load_settings(self, preset_name):
+    async def load_settings(self, preset_name):
+        """Apply a preset as one register batch, writing only what differs"""
+        preset = self.presets.get(preset_name)
+        if preset is None:
+            print(f'Unknown preset: {preset_name}')
+            return False
+        desired = self.settings.desired
+        changes = {name: value for name, value in preset.items() if desired.get(name) != value}
         try:
-            filename = f'presets/{preset_name}.txt'
-            settings = {}
-            
-            with open(filename, 'r') as f:
-                for line in f:
-                    key, value = line.strip().split('=')
-                    settings[key] = value
-                    
-            if 'resolution' in settings:
-                self.set_resolution(settings['resolution'])
-            if 'brightness' in settings:
-                self.set_brightness(settings['brightness'])
-            if 'contrast' in settings:
-                self.set_contrast(settings['contrast'])
-            if 'gain' in settings:
-                self.set_gain(settings['gain'])
-            if 'exposure' in settings:
-                self.set_exposure(settings['exposure'])
-                
-            return True
-        except Exception as e:
+            return await self.apply_settings(changes) is not None
+        except ValueError as e:
             print(f'Load settings error: {e}')
             return False
             
     def get_saved_presets(self):
-        try:
-            try:
-                files = uos.listdir('presets')
-            except:
-                return []
-                
-            return [file[:-4] for file in files if file.endswith('.txt')]
-        except Exception as e:
-            print(f'Get presets error: {e}')
-            return []
+        return self.presets.names()
 
-def handle_request(client):
-    try:
-        request = client.recv(MAX_REQUEST_SIZE).decode()
-        request_line = request.split('\r\n')[0]
-        method, path = request_line.split(' ')[:2]
-        
-        print(f'Request: {method} {path}')
-        
-        if '?' in path:
-            path, param = path.split('?')
+class ClientTimeoutError(Exception):
+    """A client was too slow sending its request or taking the response"""
+
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+
+# Connections served and timeouts by kind, reported by /connection_stats
+connection_stats = {
+    'connections': 0,
+    'active': 0,
+    'requests': 0,
+    'timeouts': {'request': 0, 'idle': 0, 'recv': 0, 'header': 0, 'send': 0, 'slow': 0},
+}
+
+def count_timeout(kind):
+    connection_stats['timeouts'][kind] += 1
+
+_out_buffers = []
+
+class Connection:
+    """One client connection: the stream pair plus keep-alive state.
+
+    Passed to the send helpers in place of the stream writer. write()
+    queues small pieces, such as a response head, in one preallocated
+    buffer; drain() or the next body write sends them with as much of the
+    body as fits, so a short response leaves as a single segment.
+    keep_alive and chunked decide the framing of the response being sent;
+    sent and send_ms measure how fast the client takes it.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.s = getattr(writer, 's', None)  # raw socket on MicroPython, for write_view
+        self.parser = RequestParser()
+        self.out = _out_buffers.pop() if _out_buffers else bytearray(OUT_BUFFER_SIZE)
+        self.out_len = 0
+        self.requests = 0
+        self.http11 = True
+        self.keep_alive = False
+        self.chunked = False
+        self.sent = 0
+        self.send_ms = 0
+
+    def write(self, data):
+        """Queue data to go out with the next drain() or send_view()"""
+        count = len(data)
+        if self.out_len + count > len(self.out) and self.out_len:
+            # Full: hand what is queued to the stream (the slice is a copy)
+            self.writer.write(self.out[:self.out_len])
+            self.out_len = 0
+        if count > len(self.out):
+            self.writer.write(data)
         else:
-            param = ''
-        
-        if path == '/':
-            client.send('HTTP/1.1 200 OK\r\n')
-            client.send('Content-Type: text/html\r\n')
-            client.send('\r\n')
-            client.write(HTML_PAGE)
-        
-        elif path == '/capture':
-            should_save = param == 'save=true'
-            if camera_manager.capture_image(save=should_save):
-                send_file(client, 'temp.jpg')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
-        
-        elif path == '/saved_images':
-            send_json(client, camera_manager.get_saved_images())
-        
-        elif path == '/view':
-            if param:
-                send_file(client, param)
-            else:
-                client.send('HTTP/1.1 400 Bad Request\r\n\r\n')
-        
-        elif path == '/resolution':
-            if camera_manager.set_resolution(param):
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
-                
-        elif path == '/whitebalance':
-            if camera_manager.set_white_balance(param):
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
-                
-        elif path == '/brightness':
-            if camera_manager.set_brightness(param):
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
-                
-        elif path == '/contrast':
-            if camera_manager.set_contrast(param):
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
-                
-        elif path == '/saturation':
-            if camera_manager.set_saturation(param):
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
-                
-        elif path == '/autofocus':
-            if camera_manager.set_auto_focus(param):
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
-                
-        elif path == '/singlefocus':
-            if camera_manager.trigger_single_focus():
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
+            self.out[self.out_len:self.out_len + count] = data
+            self.out_len += count
 
-        elif path == '/fixedfocus':
-            if camera_manager.set_fixed_focus(param):
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
+    async def drain(self):
+        """Send everything queued"""
+        if self.out_len:
+            await self._flush()
+        else:
+            await self._drain_stream()
 
-        elif path == '/gain':
-            if camera_manager.set_gain(param):
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
+    async def send_view(self, mv):
+        """Send a memoryview, topping up the queued bytes with its start so they go out together"""
+        if self.out_len:
+            count = min(len(mv), len(self.out) - self.out_len)
+            self.out[self.out_len:self.out_len + count] = mv[:count]
+            self.out_len += count
+            mv = mv[count:]
+            await self._flush()
+        if len(mv):
+            await self._send(mv)
 
-        elif path == '/exposure':
-            if camera_manager.set_exposure(param):
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
-                
-        elif path == '/save_preset':
-            if camera_manager.save_settings(param):
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
-                
-        elif path == '/load_preset':
-            if camera_manager.load_settings(param):
-                client.send('HTTP/1.1 200 OK\r\n\r\n')
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
-                
-        elif path == '/list_presets':
-            presets = camera_manager.get_saved_presets()
-            send_json(client, presets)
-            
-        elif path == '/storage_info':
-            if 'refresh=true' in param:
-                info = camera_manager.get_storage_info()
-            else:
-                info = camera_manager.last_storage_info or camera_manager.get_storage_info()
-            
-            if info:
-                send_json(client, info)
-            else:
-                client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
+    async def _flush(self):
+        count = self.out_len
+        self.out_len = 0
+        await self._send(memoryview(self.out)[:count])
+
+    async def _send(self, mv):
+        if self.s is None:
+            # The stream may hold on to what it can't send yet, so give it a copy
+            start = ticks_ms()
+            self.writer.write(bytes(mv))
+            await self._drain_stream()
+            self.track_send(len(mv), ticks_diff(ticks_ms(), start))
         else:
-            client.send('HTTP/1.1 404 Not Found\r\n\r\n')
-            
+            await self._drain_stream()  # anything the stream still holds goes first
+            await write_raw(self.s, mv, self.track_send)
+
+    async def _drain_stream(self):
+        try:
+            await asyncio.wait_for(self.writer.drain(), config.SEND_TIMEOUT_MS / 1000)
+        except asyncio.TimeoutError:
+            raise ClientTimeoutError('send', f'No response bytes taken for {config.SEND_TIMEOUT_MS} ms')
+
+    def release(self):
+        """Return the output buffer for the next connection"""
+        if self.out is not None:
+            _out_buffers.append(self.out)
+            self.out = None
+
+    def track_send(self, count, ms):
+        """Account for a socket write; raises ClientTimeoutError below the send-rate floor"""
+        self.sent += count
+        self.send_ms += ms
+        if (self.send_ms > config.SEND_RATE_GRACE_MS
+                and self.sent * 1000 // self.send_ms < config.MIN_SEND_RATE):
+            raise ClientTimeoutError('slow', f'{self.sent} bytes in {self.send_ms} ms')
+
+    async def read_request(self, idle_ms):
+        """Read until the next request is complete; None once the client is done or idle.
+
+        Waits up to idle_ms for a request to start. Once it has, every read
+        must come within RECV_TIMEOUT_MS and the whole request within
+        REQUEST_HEADER_TIMEOUT_MS, otherwise ClientTimeoutError is raised.
+        """
+        parser = self.parser
+        request = parser.feed()  # a pipelined request may already be buffered
+        start = None
+        while request is None:
+            if start is None and parser.started():
+                start = ticks_ms()
+            if start is None:
+                timeout_ms = idle_ms
+            else:
+                left_ms = config.REQUEST_HEADER_TIMEOUT_MS - ticks_diff(ticks_ms(), start)
+                timeout_ms = max(0, min(config.RECV_TIMEOUT_MS, left_ms))
+            try:
+                chunk = await asyncio.wait_for(self.reader.read(CHUNK_SIZE), timeout_ms / 1000)
+            except asyncio.TimeoutError:
+                if start is None:
+                    count_timeout('idle' if self.requests else 'request')
+                    return None
+                if ticks_diff(ticks_ms(), start) >= config.REQUEST_HEADER_TIMEOUT_MS:
+                    raise ClientTimeoutError('header', f'Request not complete after {config.REQUEST_HEADER_TIMEOUT_MS} ms')
+                raise ClientTimeoutError('recv', f'No request data for {config.RECV_TIMEOUT_MS} ms')
+            if not chunk:
+                return None
+            request = parser.feed(chunk)
+        return request
+
+async def handle_client(reader, writer):
+    """Serve requests on one connection until it closes, idles out or hits the request cap"""
+    conn = Connection(reader, writer)
+    connection_stats['connections'] += 1
+    connection_stats['active'] += 1
+    try:
+        while True:
+            try:
+                request = await conn.read_request(
+                    config.KEEPALIVE_IDLE_MS if conn.requests else config.REQUEST_TIMEOUT_MS)
+            except ClientTimeoutError as e:
+                print(f'Request timeout: {e}')
+                count_timeout(e.kind)
+                conn.keep_alive = False
+                await send_status(conn, '408 Request Timeout')
+                break
+            except ValueError as e:
+                print(f'Bad request: {e}')
+                conn.keep_alive = False
+                await send_status(conn, '400 Bad Request')
+                break
+            if request is None:
+                break
+            conn.requests += 1
+            connection_stats['requests'] += 1
+            conn.http11 = request.version != 'HTTP/1.0'
+            conn.keep_alive = (request.keep_alive()
+                               and conn.requests < config.KEEPALIVE_MAX_REQUESTS)
+            conn.sent = conn.send_ms = 0
+            await handle_request(conn, request)
+            if not conn.keep_alive:
+                break
+    except ClientTimeoutError as e:
+        print(f'Send timeout: {e}')
+        count_timeout(e.kind)
     except Exception as e:
-        print(f'Request error: {e}')
+        print(f'Connection error: {e}')
+    finally:
+        connection_stats['active'] -= 1
+        conn.release()
         try:
-            client.send('HTTP/1.1 500 Internal Server Error\r\n\r\n')
+            writer.close()
+            await writer.wait_closed()
         except:
             pass
-    finally:
+        gc.collect()
+
+async def handle_request(writer, request):
+    """Dispatch a parsed request through ROUTES"""
+    print(f'Request: {request.method} {request.path}')
+    route = ROUTES.get(request.path)
+    try:
+        if route is None:
+            await send_status(writer, '404 Not Found')
+        elif request.method not in route[0]:
+            send_head(writer, '405 Method Not Allowed',
+                      f'Allow: {", ".join(route[0])}\r\n'.encode(), 0)
+            await writer.drain()
+        else:
+            await route[1](writer, request)
+    except ClientTimeoutError:
+        raise  # the client is not taking data, don't try to answer
+    except Exception as e:
+        print(f'Request error: {e}')
+        writer.keep_alive = False
         try:
-            client.close()
+            await send_status(writer, '500 Internal Server Error')
         except:
             pass
-        gc.collect()
 
-def send_file(client, filename):
+async def send_page(writer, request):
+    """Send the web page, gzipped with an ETag when the asset has been built"""
+    gzip_ok = 'gzip' in request.header('accept-encoding', '')
+    if PAGE_GZ is not None and gzip_ok:
+        if request.header('if-none-match') == PAGE_ETAG:
+            send_head(writer, '304 Not Modified', f'ETag: {PAGE_ETAG}\r\n'.encode())
+            await writer.drain()
+            return
+        send_head(writer, '200 OK',
+                  b'Content-Type: text/html\r\nContent-Encoding: gzip\r\n'
+                  b'Cache-Control: no-cache\r\nVary: Accept-Encoding\r\n'
+                  + f'ETag: {PAGE_ETAG}\r\n'.encode(), len(PAGE_GZ))
+        await write_view(writer, memoryview(PAGE_GZ))
+        return
+
+    from webtemplate import HTML_PAGE
+    page = HTML_PAGE.encode()
+    send_head(writer, '200 OK', b'Content-Type: text/html\r\n', len(page))
+    await write_view(writer, memoryview(page))
+
+def send_head(writer, status, headers=b'', length=None):
+    """Queue the status line and headers, adding the body framing and Connection.
+
+    length None means the length isn't known up front: HTTP/1.1 clients
+    get a chunked body (begin_chunk/end_chunk/end_chunks), HTTP/1.0 clients
+    an unframed one and the connection is closed after it. A 304 has no
+    body, so it gets no framing at all and the connection stays open.
+    """
+    if status in BODYLESS_STATUSES:
+        length = None
+        writer.chunked = False
+    else:
+        writer.chunked = length is None and writer.http11
+        if length is None and not writer.chunked:
+            writer.keep_alive = False
+    writer.write(STATUS_LINES.get(status) or f'HTTP/1.1 {status}\r\n'.encode())
+    if headers:
+        writer.write(headers)
+    if length is not None:
+        writer.write(CONTENT_LENGTH)
+        writer.write(f'{length}\r\n'.encode())
+    elif writer.chunked:
+        writer.write(CHUNKED)
+    writer.write(KEEP_ALIVE_END if writer.keep_alive else CLOSE_END)
+
+def begin_chunk(writer, size):
+    """Queue the size line of the next chunk when the body is chunked"""
+    if writer.chunked:
+        writer.write(f'{size:x}\r\n'.encode())
+
+def end_chunk(writer):
+    if writer.chunked:
+        writer.write(b'\r\n')
+
+async def end_chunks(writer):
+    """Finish a body sent with send_head(length=None)"""
+    if writer.chunked:
+        writer.write(b'0\r\n\r\n')
+    await writer.drain()
+
+async def send_status(writer, status):
+    """Send a response with no body"""
+    send_head(writer, status, length=0)
+    await writer.drain()
+
+async def send_result(writer, ok):
+    await send_status(writer, '200 OK' if ok else '500 Internal Server Error')
+
+async def send_capture(writer, capture):
+    """Send an image from CameraManager.hold_last_capture, releasing it"""
+    try:
+        if isinstance(capture, SpillFile):
+            await send_file(writer, capture.name)
+            return
+        send_jpeg_headers(writer, len(capture))
+        await write_view(writer, capture.data())
+        print(f'Sent image from frame buffer: {len(capture)} bytes')
+    finally:
+        capture.release()
+
+async def send_stream(writer, fps, resolution=None):
+    """Push frames as multipart/x-mixed-replace parts until the client disconnects.
+
+    Each frame is a normal capture through the owner task, so other
+    requests and streams interleave with it. The achieved frame rate is
+    measured over one-second windows into camera_manager.stream_stats.
+    A resolution override lasts until the last open stream ends.
+    """
+    manager = camera_manager
+    owner = manager.owner
+    stats = manager.stream_stats
+    desired = manager.settings.desired
+    frames = 0
+    start = ticks_ms()
+    try:
+        stats['active'] += 1
+        current = desired.get('resolution')
+        if resolution and resolution.lower() != current:
+            restore = manager.stream_restore
+            # Keep the resolution from before the first stream, unless the user
+            # has picked another one since
+            before = restore[0] if restore and restore[1] == current else current
+            try:
+                await owner.call(manager.apply_settings, {'resolution': resolution})
+            except ValueError as e:
+                await send_json(writer, {'error': str(e)}, '400 Bad Request')
+                return
+            manager.stream_restore = (before, desired.get('resolution'))
+        interval_ms = int(1000 / fps)
+
+        send_head(writer, '200 OK', b'Content-Type: multipart/x-mixed-replace; boundary='
+                  + STREAM_BOUNDARY + b'\r\nCache-Control: no-cache\r\n')
+        stats['streams'] += 1
+        window_frames = 0
+        window_start = ticks_ms()
+        while True:
+            frame_start = ticks_ms()
+            capture = await owner.call(manager.capture_for_send, writer,
+                                       lambda length: begin_stream_part(writer, length))
+            if capture is None:
+                break
+            if capture is True:
+                await end_stream_part(writer)
+            else:
+                await send_stream_part(writer, capture)
+            frames += 1
+            window_frames += 1
+            stats['frames'] += 1
+            elapsed = ticks_diff(ticks_ms(), window_start)
+            if elapsed >= 1000:
+                stats['fps'] = round(window_frames * 1000 / elapsed, 1)
+                window_frames = 0
+                window_start = ticks_ms()
+            wait = interval_ms - ticks_diff(ticks_ms(), frame_start)
+            if wait > 0:
+                await asyncio.sleep(wait / 1000)
+        await end_chunks(writer)
+    except OSError:
+        writer.keep_alive = False  # client went away
+    finally:
+        elapsed = ticks_diff(ticks_ms(), start)
+        print(f'Stream ended: {frames} frames in {elapsed} ms')
+        await end_stream(manager)
+
+async def end_stream(manager):
+    """Count a stream as ended; the last one restores the resolution from before.
+
+    Nothing is restored if the resolution was changed while streaming.
+    """
+    manager.stream_stats['active'] -= 1
+    if manager.stream_stats['active'] or manager.stream_restore is None:
+        return
+    before, streamed = manager.stream_restore
+    manager.stream_restore = None
+    if before and manager.settings.desired.get('resolution') == streamed:
+        await manager.owner.call(manager.apply_settings, {'resolution': before})
+
+async def send_stream_part(writer, capture):
+    """Send one image from hold_last_capture as a multipart part, in one chunk"""
+    try:
+        begin_stream_part(writer, len(capture))
+        if isinstance(capture, SpillFile):
+            await write_file(writer, capture.name)
+        else:
+            await write_view(writer, capture.data())
+    finally:
+        capture.release()
+    await end_stream_part(writer)
+
+def begin_stream_part(writer, length):
+    """Queue the chunk size and part head for a JPEG of length bytes"""
+    length_line = f'{length}\r\n\r\n'.encode()
+    begin_chunk(writer, len(STREAM_PART_HEAD) + len(length_line) + length + 2)
+    writer.write(STREAM_PART_HEAD)
+    writer.write(length_line)
+
+async def end_stream_part(writer):
+    writer.write(b'\r\n')
+    end_chunk(writer)
+    await writer.drain()
+
+async def send_file(writer, filename):
     try:
         file_size = uos.stat(filename)[6]
         print(f'Sending {filename}: {file_size} bytes')
         
-        client.send('HTTP/1.1 200 OK\r\n')
-        client.send('Content-Type: image/jpeg\r\n')
-        client.send(f'Content-Length: {file_size}\r\n')
-        client.send('Cache-Control: no-cache\r\n')
-        client.send('\r\n')
-        
-        with open(filename, 'rb') as f:
-            while True:
-                chunk = f.read(CHUNK_SIZE)
-                if not chunk:
-                    break
-                client.write(chunk)
-                gc.collect()
+        send_jpeg_headers(writer, file_size)
+        await write_file(writer, filename)
     except Exception as e:
         print(f'Send error: {e}')
         raise
 
-def send_json(client, data):
-    import json
-    json_str = json.dumps(data)
+_file_buffers = []
+_file_chunk_size = 0
+
+def file_chunk_size():
+    """Chunk size for file sends: fills the TCP send buffer without crowding the heap"""
+    global _file_chunk_size
+    if not _file_chunk_size:
+        gc.collect()
+        budget = min(config.TCP_SEND_BUFFER, gc.mem_free() // 32)
+        _file_chunk_size = max(CHUNK_SIZE, budget - budget % CHUNK_SIZE)
+    return _file_chunk_size
+
+def take_file_buffer():
+    """A send buffer from the free list; only allocates when more sends overlap than ever before"""
+    if _file_buffers:
+        return _file_buffers.pop()
+    return bytearray(file_chunk_size())
+
+async def write_view(writer, mv):
+    """Send a memoryview without copying it into the stream's buffer.
+
+    A Connection sends it together with its queued head. On MicroPython
+    the stream's socket is written directly: a partial write sends the
+    rest from where it stopped once the socket has room again. Other
+    streams (CPython) copy and flush on drain().
+    """
+    send_view = getattr(writer, 'send_view', None)
+    if send_view:
+        await send_view(mv)
+        return
+    sock = getattr(writer, 's', None)
+    if sock is None:
+        writer.write(mv)
+        await writer.drain()
+        return
+    await writer.drain()  # anything queued, e.g. headers, goes first
+    await write_raw(sock, mv)
+
+async def write_raw(sock, mv, track=None):
+    """Write all of mv to a non-blocking socket, waiting while its send buffer is full.
+
+    track(count, ms) is told of every write. A client that takes nothing
+    for SEND_TIMEOUT_MS raises ClientTimeoutError, as does track when the
+    connection falls below its send-rate floor.
+    """
+    last = progress = ticks_ms()
+    sent = 0
+    total = len(mv)
+    while sent < total:
+        count = sock.write(mv[sent:] if sent else mv)
+        now = ticks_ms()
+        if count:
+            sent += count
+            progress = now
+        elif ticks_diff(now, progress) > config.SEND_TIMEOUT_MS:
+            raise ClientTimeoutError('send', f'No response bytes taken for {config.SEND_TIMEOUT_MS} ms')
+        if track:
+            track(count or 0, ticks_diff(now, last))
+            last = now
+        if not count:
+            await asyncio.sleep(SEND_RETRY_MS / 1000)
+
+async def write_file(writer, filename):
+    """Send a file through one reused buffer; nothing is allocated per chunk"""
+    buf = take_file_buffer()
+    mv = memoryview(buf)
+    try:
+        with open(filename, 'rb') as f:
+            while True:
+                count = f.readinto(buf)
+                if not count:
+                    break
+                await write_view(writer, mv[:count] if count < len(buf) else mv)
+    finally:
+        _file_buffers.append(buf)
+
+def send_jpeg_headers(writer, length):
+    """Queue the headers of a JPEG response; the caller drains after the body"""
+    send_head(writer, '200 OK', JPEG_HEADERS, length)
+
+async def send_json(writer, data, status='200 OK', etag=None):
+    """Send data as JSON; a str is taken as already-encoded JSON"""
+    body = (data if isinstance(data, str) else json.dumps(data)).encode()
     
-    client.send('HTTP/1.1 200 OK\r\n')
-    client.send('Content-Type: application/json\r\n')
-    client.send(f'Content-Length: {len(json_str)}\r\n')
-    client.send('\r\n')
-    client.write(json_str)
+    headers = JSON_HEADERS
+    if etag:
+        headers += f'ETag: {etag}\r\nCache-Control: no-cache\r\n'.encode()
+    send_head(writer, status, headers, len(body))
+    await write_view(writer, memoryview(body))
+
+async def route_capture(writer, request):
+    if request.query.get('save') == 'true':
+        capture = await camera_manager.owner.call(camera_manager.save_for_send)
+    else:
+        capture = await camera_manager.owner.call(
+            camera_manager.capture_for_send, writer,
+            lambda length: send_jpeg_headers(writer, length))
+    if capture is None:
+        await send_status(writer, '500 Internal Server Error')
+    elif capture is not True:
+        await send_capture(writer, capture)
+
+async def route_stream(writer, request):
+    query = request.query
+    try:
+        fps = float(query.get('fps') or config.STREAM_FPS)
+    except ValueError:
+        fps = None
+    if fps is None or not math.isfinite(fps):
+        await send_json(writer, {'error': f"Invalid fps: {query.get('fps')}"}, '400 Bad Request')
+        return
+    fps = min(max(fps, 0.1), config.STREAM_MAX_FPS)
+    await send_stream(writer, fps, query.get('resolution') or config.STREAM_RESOLUTION)
+
+async def route_saved_images(writer, request):
+    catalog = camera_manager.catalog
+    etag = catalog.etag()
+    if request.header('if-none-match') == etag:
+        send_head(writer, '304 Not Modified', f'ETag: {etag}\r\n'.encode())
+        await writer.drain()
+    else:
+        await send_json(writer, catalog.to_json(), etag=etag)
+
+async def route_view(writer, request):
+    filename = request.arg()
+    if filename:
+        await send_file(writer, filename)
+    else:
+        await send_status(writer, '400 Bad Request')
+
+async def route_settings(writer, request):
+    try:
+        if request.method == 'POST':
+            changes = json.loads(request.body.decode() or '{}')
+        else:
+            changes = request.query
+        if not isinstance(changes, dict):
+            raise ValueError('Expected a JSON object')
+        result = await camera_manager.owner.call(camera_manager.apply_settings, changes)
+        if result is None:
+            await send_status(writer, '500 Internal Server Error')
+        else:
+            await send_json(writer, result)
+    except ValueError as e:
+        await send_json(writer, {'error': str(e)}, '400 Bad Request')
+
+async def route_save_preset(writer, request):
+    await send_result(writer, camera_manager.save_settings(request.arg()))
+
+async def route_storage_info(writer, request):
+    if request.query.get('refresh') == 'true':
+        info = camera_manager.get_storage_info()
+    else:
+        info = camera_manager.last_storage_info or camera_manager.get_storage_info()
+    if info:
+        await send_json(writer, info)
+    else:
+        await send_status(writer, '500 Internal Server Error')
+
+def camera_route(name, takes_arg=True):
+    """Route that runs CameraManager.<name> on the owner task and sends ok/500"""
+    async def route(writer, request):
+        method = getattr(camera_manager, name)
+        if takes_arg:
+            ok = await camera_manager.owner.call(method, request.arg())
+        else:
+            ok = await camera_manager.owner.call(method)
+        await send_result(writer, ok)
+    return route
+
+def json_route(getter):
+    """Route that sends getter() as JSON"""
+    async def route(writer, request):
+        await send_json(writer, getter())
+    return route
+
+GET = ('GET',)
+GET_POST = ('GET', 'POST')
+
+# path: (allowed methods, handler(writer, request))
+ROUTES = {
+    '/': (GET, send_page),
+    '/capture': (GET, route_capture),
+    '/stream': (GET, route_stream),
+    '/stream_stats': (GET, json_route(lambda: camera_manager.stream_stats)),
+    '/saved_images': (GET, route_saved_images),
+    '/view': (GET, route_view),
+    '/resolution': (GET, camera_route('set_resolution')),
+    '/whitebalance': (GET, camera_route('set_white_balance')),
+    '/brightness': (GET, camera_route('set_brightness')),
+    '/contrast': (GET, camera_route('set_contrast')),
+    '/saturation': (GET, camera_route('set_saturation')),
+    '/autofocus': (GET, camera_route('set_auto_focus')),
+    '/singlefocus': (GET, camera_route('trigger_single_focus', takes_arg=False)),
+    '/fixedfocus': (GET, camera_route('set_fixed_focus')),
+    '/gain': (GET, camera_route('set_gain')),
+    '/exposure': (GET, camera_route('set_exposure')),
+    '/settings': (GET_POST, route_settings),
+    '/save_preset': (GET, route_save_preset),
+    '/load_preset': (GET, camera_route('load_settings')),
+    '/list_presets': (GET, json_route(lambda: camera_manager.get_saved_presets())),
+    '/health': (GET, json_route(lambda: camera_manager.get_health())),
+    '/settings_stats': (GET, json_route(lambda: camera_manager.get_settings_stats())),
+    '/capture_stats': (GET, json_route(lambda: camera_manager.get_capture_stats())),
+    '/retention_stats': (GET, json_route(lambda: camera_manager.retention.stats())),
+    '/connection_stats': (GET, json_route(lambda: connection_stats)),
+    '/storage_info': (GET, route_storage_info),
+}
 
 def connect_wifi():
     print('Connecting to WiFi...')
@@ -625,25 +1270,29 @@ def connect_wifi():
     print(f'Connected: {wlan.ifconfig()[0]}')
     return wlan.ifconfig()[0]
 
-def start_server():
+async def retention_task():
+    """Delete images over the retention policy in the background"""
+    while True:
+        await asyncio.sleep(config.RETENTION_INTERVAL_MS / 1000)
+        camera_manager.run_retention()
+
+async def serve(port=None):
+    """Run the web server; camera work goes through camera_manager's owner task"""
     ip = connect_wifi()
-    s = socket.socket()
-    s.bind(('', 80))
-    s.listen(5)
-    print(f'Server running at http://{ip}')
-    
+    port = port or config.SERVER_PORT
+    owner = camera_manager.owner
+    asyncio.create_task(owner.run())
+    # Requests queue behind the camera start instead of waiting for the server
+    asyncio.create_task(owner.call(camera_manager.initialize_camera))
+    asyncio.create_task(retention_task())
+    await asyncio.start_server(handle_client, '0.0.0.0', port, backlog=5)
+    print(f'Server running at http://{ip}:{port}')
     while True:
-        try:
-            client, addr = s.accept()
-            handle_request(client)
-        except Exception as e:
-            print(f'Server error: {e}')
-            try:
-                client.close()
-            except:
-                pass
+        await asyncio.sleep(3600)
+
+def start_server():
+    asyncio.run(serve())
 
 if __name__ == '__main__':
     camera_manager = CameraManager()
     start_server()
-
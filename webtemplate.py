@@ -411,6 +411,8 @@ HTML_PAGE = """<!DOCTYPE html><html>
     <script>
         let busy = false;
         let retryTimeout = null;
+        let live = false;
+        let fpsTimer = null;
 
         function clearRetryTimeout() {
             if (retryTimeout) {
@@ -452,9 +454,58 @@ HTML_PAGE = """<!DOCTYPE html><html>
             });
         }
 
+        function startStream() {
+            const img = document.getElementById('photo');
+            live = true;
+            img.onload = null;
+            img.onerror = () => {
+                stopStream();
+                updateStatus('Live preview stopped', 'error');
+            };
+            img.src = '/stream?' + Date.now();
+            document.getElementById('live-button').textContent = 'Stop Live';
+            updateStatus('Live preview', 'success');
+            fpsTimer = setInterval(() => {
+                fetch('/stream_stats')
+                    .then(response => response.json())
+                    .then(stats => updateStatus('Live preview: ' + stats.fps + ' fps', 'success'))
+                    .catch(() => {});
+            }, 2000);
+        }
+
+        function stopStream() {
+            live = false;
+            clearInterval(fpsTimer);
+            fpsTimer = null;
+            const img = document.getElementById('photo');
+            img.onerror = null;
+            img.removeAttribute('src');
+            document.getElementById('live-button').textContent = 'Live';
+        }
+
+        function toggleStream() {
+            if (live) {
+                stopStream();
+                updateStatus('Live preview stopped', 'info');
+            } else {
+                startStream();
+            }
+        }
+
+        // After a settings change: the live stream already shows it, otherwise take a test capture
+        function refreshPreview() {
+            if (live) {
+                busy = false;
+                enableButtons(true);
+                return;
+            }
+            capture(true);
+        }
+
         function capture(forceRetry = false) {
             if(busy && !forceRetry) return;
             clearRetryTimeout();
+            if (live) stopStream();
             
             busy = true;
             enableButtons(false);
@@ -501,12 +552,8 @@ HTML_PAGE = """<!DOCTYPE html><html>
             fetch('/' + control + '?' + value)
                 .then(response => {
                     if(!response.ok) throw new Error('Failed to set ' + control);
-                    updateStatus(control + ' set to ' + value + ', waiting for camera...', 'warning');
-                    return new Promise(resolve => setTimeout(resolve, 3000));
-                })
-                .then(() => {
-                    updateStatus('Taking test capture...', 'warning');
-                    return capture(true);
+                    updateStatus(control + ' set to ' + value, 'success');
+                    return refreshPreview();
                 })
                 .catch(error => {
                     updateStatus('Error: ' + error.message, 'error');
@@ -531,8 +578,8 @@ HTML_PAGE = """<!DOCTYPE html><html>
             fetch('/singlefocus')
                 .then(response => {
                     if(!response.ok) throw new Error('Focus failed');
-                    updateStatus('Focus successful, taking test capture...', 'success');
-                    setTimeout(() => capture(true), 2000);
+                    updateStatus('Focus successful', 'success');
+                    setTimeout(refreshPreview, 2000);
                 })
                 .catch(error => {
                     updateStatus('Error: ' + error.message, 'error');
@@ -544,6 +591,7 @@ HTML_PAGE = """<!DOCTYPE html><html>
         function captureAndSave() {
             if(busy) return;
             clearRetryTimeout();
+            if (live) stopStream();
             
             busy = true;
             enableButtons(false);
@@ -667,7 +715,7 @@ HTML_PAGE = """<!DOCTYPE html><html>
                 .then(response => {
                     if (!response.ok) throw new Error('Failed to load preset');
                     updateStatus('Preset loaded: ' + name, 'success');
-                    setTimeout(() => capture(true), 1000);
+                    setTimeout(refreshPreview, 1000);
                 })
                 .catch(error => updateStatus('Error: ' + error.message, 'error'));
         }
@@ -694,26 +742,26 @@ HTML_PAGE = """<!DOCTYPE html><html>
         function applyPreset(type) {
             const presets = {
                 indoor: {
-                    wb: 'office',
+                    white_balance: 'office',
                     brightness: '0',
                     contrast: '0',
                     exposure: '0x30'
                 },
                 outdoor: {
-                    wb: 'sunny',
+                    white_balance: 'sunny',
                     brightness: '2',
                     contrast: '1',
                     exposure: '0x20'
                 },
                 lowlight: {
-                    wb: 'home',
+                    white_balance: 'home',
                     brightness: '1',
                     contrast: '2',
                     exposure: '0x50',
                     gain: '0x40'
                 },
                 bright: {
-                    wb: 'sunny',
+                    white_balance: 'sunny',
                     brightness: '2',
                     contrast: '3',
                     exposure: '0x20',
@@ -726,16 +774,18 @@ HTML_PAGE = """<!DOCTYPE html><html>
             
             updateStatus('Applying ' + type + ' preset...', 'warning');
             
-            Promise.all([
-                fetch('/whitebalance?' + preset.wb),
-                fetch('/brightness?' + preset.brightness),
-                fetch('/contrast?' + preset.contrast),
-                fetch('/exposure?' + preset.exposure),
-                preset.gain ? fetch('/gain?' + preset.gain) : Promise.resolve()
-            ])
-            .then(() => {
-                updateStatus(type + ' preset applied', 'success');
-                setTimeout(() => capture(true), 1000);
+            fetch('/settings', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify(preset)
+            })
+            .then(response => response.json().then(result => {
+                if (!response.ok) throw new Error(result.error || 'Failed to apply preset');
+                return result;
+            }))
+            .then(result => {
+                updateStatus(type + ' preset applied (' + result.registers_written + ' registers)', 'success');
+                setTimeout(refreshPreview, 1000);
             })
             .catch(error => updateStatus('Error applying preset: ' + error.message, 'error'));
         }
@@ -744,7 +794,7 @@ HTML_PAGE = """<!DOCTYPE html><html>
             updateSavedImages();
             updatePresetList();
             updateStorageInfo(true); // Initial load with force refresh
-            capture();
+            startStream();
 
             setInterval(() => {
                 if (!busy) {
@@ -876,6 +926,7 @@ HTML_PAGE = """<!DOCTYPE html><html>
         </div>
 
         <div class="button-group">
+            <button id="live-button" onclick="toggleStream()">Live</button>
             <button onclick="capture()">Capture</button>
             <button onclick="captureAndSave()">Capture & Save</button>
         </div>